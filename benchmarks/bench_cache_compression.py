@@ -0,0 +1,101 @@
+"""Cache size on disk and read throughput for Parquet write options.
+
+Builds a tract-level tidy ACS frame -- ``GEOID``, ``NAME``, ``variable``,
+``estimate`` and ``moe`` for every tract in the country and a set of
+variables, so each ``GEOID``/``NAME`` repeats once per variable -- stores
+it in a :class:`~pypums.cache.CensusCache` under each configuration and
+reads it back repeatedly:
+
+* ``snappy`` — pyarrow's defaults (the cache's previous behavior).
+* ``zstd`` — the cache default: zstd at its default level.
+* ``zstd-9`` — zstd level 9.
+* ``zstd-compact`` — zstd plus narrowed numbers and dictionary strings.
+* ``zstd-nodict`` — zstd without Parquet dictionary encoding.
+
+The in-memory tier is disabled so every read goes to disk.  Run with::
+
+    python benchmarks/bench_cache_compression.py
+    python benchmarks/bench_cache_compression.py --tracts 20000 --variables 25
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pypums.cache import CensusCache
+
+_KEY = "acs_2023_bench"
+
+_CONFIGS = {
+    "snappy": {"compression": "snappy"},
+    "zstd": {"compression": "zstd"},
+    "zstd-9": {"compression": "zstd", "compression_level": 9},
+    "zstd-compact": {"compression": "zstd", "compact": True},
+    "zstd-nodict": {"compression": "zstd", "dictionary": False},
+}
+
+
+def _frame(tracts: int, variables: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    geoids = [f"{1 + i // 1700:02d}{i % 58:03d}{i:06d}" for i in range(tracts)]
+    names = [
+        f"Census Tract {g[5:9]}.{g[9:]}; County {g[2:5]}; State {g[:2]}" for g in geoids
+    ]
+    codes = np.array([f"B{19000 + v:05d}_001" for v in range(variables)])
+    rows = tracts * variables
+    return pd.DataFrame(
+        {
+            "GEOID": np.repeat(geoids, variables),
+            "NAME": np.repeat(names, variables),
+            "variable": np.tile(codes, tracts),
+            "estimate": rng.integers(0, 250_000, rows).astype(float),
+            "moe": rng.integers(0, 20_000, rows).astype(float),
+        }
+    )
+
+
+def _time_reads(read, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracts", type=int, default=85_000)
+    parser.add_argument("--variables", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = _frame(args.tracts, args.variables)
+    in_memory = df.memory_usage(deep=True).sum()
+    print(
+        f"{len(df):,} rows ({args.tracts:,} tracts x {args.variables} variables), "
+        f"{in_memory / 1e6:,.0f} MB in memory"
+    )
+    for name, options in _CONFIGS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CensusCache(Path(tmp), memory=False, **options)
+            start = time.perf_counter()
+            cache.set(_KEY, df)
+            write = time.perf_counter() - start
+            size = cache.entries()[0]["size"]
+            read = statistics.median(
+                _time_reads(lambda c=cache: c.get(_KEY), args.repeat)
+            )
+        print(
+            f"{name:<13} {size / 1e6:8.1f} MB on disk   write {write:6.2f} s   "
+            f"read {read:6.3f} s ({in_memory / read / 1e6:,.0f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Cache read time and size on disk: Parquet vs. memory-mapped Arrow IPC.
+
+Builds a PUMS-shaped person frame -- ``SERIALNO``, a handful of person
+variables, ``PWGTP`` and its 80 replicate weights ``PWGTP1``..``PWGTP80``
+-- stores it in a :class:`~pypums.cache.CensusCache` of each format and
+reads it back repeatedly, as a job re-reading a large cached frame would:
+
+* ``full`` — the whole frame.
+* ``subset`` — ``SERIALNO``, ``PWGTP`` and the replicate weights only
+  (what a replicate-weight variance estimate needs).
+
+The in-memory tier is disabled so every read goes to disk; the files are
+in the OS page cache after the first read, as they would be within a job.
+Run with::
+
+    python benchmarks/bench_cache_format.py
+    python benchmarks/bench_cache_format.py --rows 500000 --repeat 3
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pypums.cache import CACHE_FORMATS, CensusCache
+
+_KEY = "pums_2022_bench"
+_REPLICATES = [f"PWGTP{i}" for i in range(1, 81)]
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    weights = rng.integers(1, 500, rows, dtype=np.int32)
+    df = pd.DataFrame(
+        {
+            "SERIALNO": [f"2022HU{i // 3:07d}" for i in range(rows)],
+            "SPORDER": (np.arange(rows) % 3 + 1).astype(np.int8),
+            "ST": rng.integers(1, 57, rows, dtype=np.int8),
+            "PUMA": rng.integers(100, 9999, rows, dtype=np.int32),
+            "AGEP": rng.integers(0, 95, rows, dtype=np.int8),
+            "SEX": rng.integers(1, 3, rows, dtype=np.int8),
+            "WAGP": rng.integers(0, 300_000, rows, dtype=np.int32),
+            "PWGTP": weights,
+        }
+    )
+    replicates = {
+        name: np.maximum(weights + rng.integers(-50, 50, rows, dtype=np.int32), 0)
+        for name in _REPLICATES
+    }
+    return pd.concat([df, pd.DataFrame(replicates)], axis=1)
+
+
+def _time_reads(read, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = _frame(args.rows)
+    print(
+        f"{args.rows:,} rows x {df.shape[1]} columns, "
+        f"{df.memory_usage(deep=True).sum() / 1e6:,.0f} MB in memory"
+    )
+    subset = ["SERIALNO", "PWGTP", *_REPLICATES]
+    results = {}
+    for format in CACHE_FORMATS:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CensusCache(Path(tmp), memory=False, format=format)
+            start = time.perf_counter()
+            cache.set(_KEY, df)
+            write = time.perf_counter() - start
+            size = cache.entries()[0]["size"]
+            cache.get(_KEY)  # warm the page cache
+            full = _time_reads(lambda c=cache: c.get(_KEY), args.repeat)
+            part = _time_reads(lambda c=cache: c.get(_KEY, columns=subset), args.repeat)
+        results[format] = statistics.median(full)
+        print(
+            f"{format:<8} {size / 1e6:8.1f} MB on disk   write {write:6.2f} s   "
+            f"full read {statistics.median(full):6.3f} s   "
+            f"subset read {statistics.median(part):6.3f} s"
+        )
+    print(f"full-read speedup: {results['parquet'] / results['arrow']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-request latency: a fresh connection per call vs. the pooled client.
+
+Starts a :class:`~pypums.api.stub.StubCensusServer` that answers with
+Census-shaped JSON, then issues the same sequence of requests twice:
+
+* ``httpx.get`` — what ``call_census_api`` used to do (new connection each
+  call).
+* ``call_census_api`` — the shared keep-alive client.
+
+Run with::
+
+    python benchmarks/bench_client.py --requests 500
+"""
+
+import argparse
+import statistics
+import time
+
+import httpx
+
+from pypums.api.client import (
+    CENSUS_API_BASE,
+    call_census_api,
+    configure_rate_limit,
+    session,
+)
+from pypums.api.stub import StubCensusServer
+
+
+def _time_calls(call, url: str, n: int) -> list[float]:
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        call(url)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    ms = sorted(t * 1000 for t in timings)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{label:<24} mean {statistics.mean(ms):7.3f} ms   "
+        f"p50 {statistics.median(ms):7.3f} ms   p95 {p95:7.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    params = {"get": "NAME,B01001_001E,B01001_001M", "for": "state:*"}
+    url = f"{CENSUS_API_BASE}/2023/acs/acs5"
+    # Measure connection reuse, not the client-side rate limit.
+    configure_rate_limit(rate=None, max_concurrency=None)
+
+    with StubCensusServer() as server:
+        stub_url = f"{server.url}/2023/acs/acs5"
+        fresh = _time_calls(
+            lambda u: httpx.get(u, params=params).raise_for_status().json(),
+            stub_url,
+            args.requests,
+        )
+        with session(api_base=server.url):
+            pooled = _time_calls(
+                lambda u: call_census_api(u, params), url, args.requests
+            )
+
+    print(f"{args.requests} requests against {stub_url}")
+    _report("new connection/request", fresh)
+    _report("shared pooled client", pooled)
+    speedup = statistics.mean(fresh) / statistics.mean(pooled)
+    print(f"speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
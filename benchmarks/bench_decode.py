@@ -0,0 +1,133 @@
+"""Decode time and peak memory: JSON rows vs. column-wise decoding.
+
+Builds a Census-shaped response body (one row per line, as the API sends
+it) and turns it into a typed DataFrame two ways:
+
+* ``rows`` — what ``get_*`` used to do: ``json.loads`` into a list of
+  lists, ``pd.DataFrame(data[1:], columns=data[0])``, then
+  ``pd.to_numeric`` per numeric column.
+* ``columnar`` — ``decode_census_json`` + ``census_table_to_frame``.
+
+Each method runs in a fresh subprocess so peak RSS is measured in
+isolation.  Run with::
+
+    python benchmarks/bench_decode.py --shape tracts
+    python benchmarks/bench_decode.py --shape pums --rows 2000000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from pypums.api.client import census_table_to_frame, decode_census_json
+
+_SHAPES = {
+    # ~70k tracts x 20 ACS variables (estimate + MOE).
+    "tracts": 74_000,
+    # Person records with weights and a handful of variables.
+    "pums": 1_000_000,
+}
+
+
+def _payload(shape: str, rows: int) -> tuple[bytes, list[str]]:
+    """Return a response body and the names of its numeric columns."""
+    if shape == "tracts":
+        variables = [f"B19001_{i:03d}{s}" for i in range(1, 21) for s in "EM"]
+        header = ["NAME", *variables, "state", "county", "tract"]
+
+        def row(i):
+            return [
+                f"Census Tract {i % 9999}.{i % 100:02d}; Some County; State",
+                *(str((i * 7 + j) % 5000) for j in range(len(variables))),
+                f"{i % 56:02d}",
+                f"{i % 999:03d}",
+                f"{i:06d}",
+            ]
+
+    else:
+        variables = ["SPORDER", "PWGTP", "AGEP", "SEX", "SCHL", "WAGP", "HINCP"]
+        header = ["SERIALNO", *variables, "ST", "PUMA"]
+
+        def row(i):
+            return [
+                f"2022HU{i // 3:07d}",
+                str(i % 3 + 1),
+                str(i % 250),
+                str(i % 95),
+                str(i % 2 + 1),
+                f"{i % 24 + 1:02d}",
+                str(i * 13 % 200000),
+                str(i * 17 % 300000),
+                f"{i % 56:02d}",
+                f"{i % 3000:05d}",
+            ]
+
+    # Compact rows, one per line, like the Census API.
+    compact = {"separators": (",", ":")}
+    lines = [json.dumps(header, **compact)]
+    lines += [json.dumps(row(i), **compact) for i in range(rows)]
+    body = "[" + ",\n".join(lines) + "]"
+    return body.encode(), variables
+
+
+def _decode_rows(content: bytes, numeric: set[str]) -> pd.DataFrame:
+    data = json.loads(content)
+    df = pd.DataFrame(data[1:], columns=data[0])
+    for col in df.columns:
+        if col in numeric:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def _decode_columnar(content: bytes, numeric: set[str]) -> pd.DataFrame:
+    return census_table_to_frame(decode_census_json(content), numeric.__contains__)
+
+
+def _child(method: str, shape: str, rows: int) -> None:
+    content, variables = _payload(shape, rows)
+    decode = _decode_rows if method == "rows" else _decode_columnar
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = decode(content, set(variables))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    print(json.dumps({"seconds": elapsed, "peak_mb": peak / 1024, "rows": len(df)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shape", choices=sorted(_SHAPES), default="tracts")
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--child", choices=["rows", "columnar"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    rows = args.rows or _SHAPES[args.shape]
+
+    if args.child:
+        _child(args.child, args.shape, rows)
+        return
+
+    content, _ = _payload(args.shape, rows)
+    print(f"{args.shape}: {rows:,} rows, {len(content) / 1e6:.1f} MB of JSON")
+    results = {}
+    for method in ("rows", "columnar"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--shape", args.shape, "--rows", str(rows)]
+            + ["--child", method],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results[method] = json.loads(out.stdout)
+        r = results[method]
+        print(f"{method:<10} {r['seconds']:7.3f} s   peak +{r['peak_mb']:7.1f} MB")
+    speedup = results["rows"]["seconds"] / results["columnar"]["seconds"]
+    print(f"speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
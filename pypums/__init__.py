@@ -4,20 +4,25 @@
 from pypums.surveys import ACS as ACS
 
 from .acs import get_acs as get_acs
+from .acs import get_acs_async as get_acs_async
 from .api.key import census_api_key as census_api_key
 from .census_helpers import get_pop_groups as get_pop_groups
 from .census_helpers import summary_files as summary_files
 from .constants import __app_name__ as __app_name__
 from .constants import __version__ as __version__
 from .decennial import get_decennial as get_decennial
+from .decennial import get_decennial_async as get_decennial_async
 from .estimates import get_estimates as get_estimates
+from .estimates import get_estimates_async as get_estimates_async
 from .flows import get_flows as get_flows
+from .flows import get_flows_async as get_flows_async
 from .moe import moe_product as moe_product
 from .moe import moe_prop as moe_prop
 from .moe import moe_ratio as moe_ratio
 from .moe import moe_sum as moe_sum
 from .moe import significance as significance
 from .pums import get_pums as get_pums
+from .pums import get_pums_async as get_pums_async
 from .survey import get_survey_metadata as get_survey_metadata
 from .survey import to_survey as to_survey
 from .variables import load_variables as load_variables
@@ -1,13 +1,22 @@
 """American Community Survey data retrieval via the Census API."""
 
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
-
-from pypums.api.client import CENSUS_API_BASE, call_census_api
-from pypums.api.geography import build_geography_query
+import pyarrow as pa
+
+from pypums.api.client import (
+    CENSUS_API_BASE,
+    call_census_api_table,
+    call_census_api_table_async,
+)
+from pypums.api.geography import expand_geography_query
 from pypums.api.key import census_api_key
-from pypums.cache import CensusCache
+from pypums.api.query import QueryPlan, fan_out, run_query, run_query_async
+from pypums.api.request import CensusRequest
+from pypums.cache import resolve_cache_policy
+from pypums.instrumentation import stage
 
 _DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache" / "api"
 
@@ -46,149 +55,59 @@ _GEO_COL_ORDER = [
 _GEO_COLUMNS = frozenset(_GEO_COL_ORDER)
 
 
-def _call_census_api(url: str, params: dict) -> list[list[str]]:
+def _call_census_api(url: str, params: dict) -> pa.Table:
     """Thin wrapper so tests can mock ``pypums.acs._call_census_api``."""
-    return call_census_api(url, params)
+    return call_census_api_table(url, params)
 
 
-def get_acs(
-    geography: str,
-    variables: str | list[str] | None = None,
-    table: str | None = None,
-    state: str | None = None,
-    county: str | None = None,
-    year: int = 2023,
-    survey: str = "acs5",
-    output: str = "tidy",
-    moe_level: int = 90,
-    summary_var: str | None = None,
-    geometry: bool = False,
-    keep_geo_vars: bool = False,
-    cache_table: bool = False,
-    key: str | None = None,
-) -> pd.DataFrame:
-    """Retrieve American Community Survey data from the Census API.
+async def _call_census_api_async(url: str, params: dict) -> pa.Table:
+    """Thin wrapper so tests can mock ``pypums.acs._call_census_api_async``."""
+    return await call_census_api_table_async(url, params)
 
-    Parameters
-    ----------
-    geography
-        Geography level (e.g. ``"state"``, ``"county"``, ``"tract"``).
-    variables
-        Variable ID or list of IDs (e.g. ``"B01001_001"``).
-    table
-        Census table ID (e.g. ``"B01001"``). Alternative to *variables*.
-    state
-        State FIPS code or abbreviation.
-    county
-        County FIPS code.
-    year
-        Data year (default 2023).
-    survey
-        ``"acs5"`` (default) or ``"acs1"``.
-    output
-        ``"tidy"`` (default) or ``"wide"``.
-    moe_level
-        Confidence level for MOE: 90, 95, or 99 (default 90).
-    summary_var
-        Variable ID to include as denominator columns.
-    geometry
-        If True, return a GeoDataFrame with shapes.
-    keep_geo_vars
-        If True, preserve the raw FIPS columns (state, county, tract,
-        etc.) in the output alongside GEOID.
-    cache_table
-        If True, cache the API response locally to avoid redundant calls.
-    key
-        Census API key. Falls back to ``census_api_key()``.
 
-    Returns
-    -------
-    pd.DataFrame
-        Census data in tidy or wide format.
-    """
-    if output not in ("tidy", "wide"):
-        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
-    if moe_level not in _Z_SCORES:
-        raise ValueError(
-            f"moe_level must be one of {sorted(_Z_SCORES)}, got {moe_level!r}"
-        )
-
-    api_key = census_api_key(key) if key else census_api_key()
-    for_clause, in_clause = build_geography_query(geography, state=state, county=county)
-
-    # Build the variable list for the API request.
-    if variables is not None:
-        if isinstance(variables, str):
-            variables = [variables]
-        # Census API needs E/M suffixes for ACS.
-        api_vars = []
-        for v in variables:
-            api_vars.append(f"{v}E")
-            api_vars.append(f"{v}M")
-    elif table is not None:
-        api_vars = [f"group({table})"]
-    else:
-        raise ValueError("Must provide either 'variables' or 'table'.")
-
-    # Add summary variable if requested.
-    if summary_var is not None:
-        api_vars.append(f"{summary_var}E")
-        api_vars.append(f"{summary_var}M")
-
-    # Build a cache key from request parameters.
-    cache_key = (
-        f"acs_{year}_{survey}_{geography}_{state}_{county}"
-        f"_{output}_{moe_level}_{summary_var}_{','.join(api_vars)}"
-    )
-
-    # Check cache before calling API.
-    disk_cache = CensusCache(_DEFAULT_CACHE_DIR) if cache_table else None
-    if disk_cache is not None:
-        cached = disk_cache.get(cache_key)
-        if cached is not None:
-            return cached
+def _numeric_column(name: str) -> bool:
+    """True for the estimate and MOE columns :func:`_format_acs` converts."""
+    return name != "NAME" and name.endswith(("E", "M"))
 
-    url = f"{CENSUS_API_BASE}/{year}/acs/{survey}"
-    params: dict[str, str] = {
-        "get": f"NAME,{','.join(api_vars)}",
-        "for": for_clause,
-        "key": api_key,
-    }
-    if in_clause is not None:
-        params["in"] = in_clause
-
-    data = _call_census_api(url, params)
-
-    # Convert JSON rows to DataFrame.
-    headers = data[0]
-    df = pd.DataFrame(data[1:], columns=headers)
 
+def _format_acs(
+    df: pd.DataFrame,
+    *,
+    output: str,
+    moe_level: int,
+    summary_var: str | None,
+    keep_geo_vars: bool,
+) -> pd.DataFrame:
+    """Turn a raw ACS API response frame into tidy or wide output."""
     # Build GEOID from FIPS columns in canonical order.
-    geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
-    if geo_cols:
-        df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
+    with stage("geoid", query="get_acs"):
+        geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
+        if geo_cols:
+            df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
 
     # Identify estimate and MOE columns.
     estimate_cols = [c for c in df.columns if c.endswith("E") and c != "NAME"]
     moe_cols = [c for c in df.columns if c.endswith("M")]
 
     # Convert to numeric.
-    for col in estimate_cols + moe_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    with stage("numeric", query="get_acs"):
+        for col in estimate_cols + moe_cols:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Scale MOE if needed.
-    if moe_level != 90:
-        scale_factor = _Z_SCORES[moe_level] / _Z_SCORES[90]
-        df[moe_cols] = df[moe_cols] * scale_factor
+        # Scale MOE if needed.
+        if moe_level != 90:
+            scale_factor = _Z_SCORES[moe_level] / _Z_SCORES[90]
+            df[moe_cols] = df[moe_cols] * scale_factor
 
-    # Determine which geo FIPS columns to keep.
-    geo_cols_present = [c for c in _GEO_COL_ORDER if c in df.columns]
-    extra_geo = geo_cols_present if keep_geo_vars else []
+    with stage("reshape", query="get_acs", output=output):
+        # Determine which geo FIPS columns to keep.
+        geo_cols_present = [c for c in _GEO_COL_ORDER if c in df.columns]
+        extra_geo = geo_cols_present if keep_geo_vars else []
+
+        if output == "wide":
+            keep_cols = ["GEOID", "NAME"] + extra_geo + estimate_cols + moe_cols
+            return df[[c for c in keep_cols if c in df.columns]]
 
-    if output == "wide":
-        keep_cols = ["GEOID", "NAME"] + extra_geo + estimate_cols + moe_cols
-        result = df[[c for c in keep_cols if c in df.columns]]
-    else:
         # Tidy format: melt estimate and MOE columns separately, then merge.
         id_cols = ["GEOID", "NAME"] if "GEOID" in df.columns else ["NAME"]
         id_cols = id_cols + extra_geo
@@ -230,12 +149,237 @@ def get_acs(
             )
             result = result.merge(summary_df, on=id_cols)
 
-    if geometry:
-        from pypums.spatial import attach_geometry
+        return result
 
-        result = attach_geometry(result, geography, state=state, year=year)
 
-    if disk_cache is not None:
-        disk_cache.set(cache_key, result, ttl_seconds=86400)
+def _plan_acs(
+    *,
+    geography: str,
+    variables: str | list[str] | None,
+    table: str | None,
+    state: str | list[str] | None,
+    county: str | list[str] | None,
+    year: int,
+    survey: str,
+    output: str,
+    moe_level: int,
+    summary_var: str | None,
+    geometry: bool,
+    keep_geo_vars: bool,
+    cache_table: bool,
+    cache: str | None,
+    key: str | None,
+) -> QueryPlan:
+    """Validate ``get_acs`` arguments and build its query plan."""
+    if output not in ("tidy", "wide"):
+        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
+    if moe_level not in _Z_SCORES:
+        raise ValueError(
+            f"moe_level must be one of {sorted(_Z_SCORES)}, got {moe_level!r}"
+        )
 
-    return result
+    api_key = census_api_key(key) if key else census_api_key()
+
+    # Build the variable list for the API request.
+    if variables is not None:
+        if isinstance(variables, str):
+            variables = [variables]
+        requested = list(dict.fromkeys(variables))
+    elif table is not None:
+        requested = [f"group({table})"]
+    else:
+        raise ValueError("Must provide either 'variables' or 'table'.")
+
+    request = CensusRequest.create(
+        "acs",
+        year,
+        geography=geography,
+        state=state,
+        county=county,
+        variables=requested,
+        survey=survey,
+        output=output,
+        moe_level=moe_level,
+        summary_var=summary_var,
+        keep_geo_vars=keep_geo_vars,
+        geometry=geometry,
+    )
+    geographies = expand_geography_query(
+        request.geography, state=request.state, county=request.county
+    )
+    for_clause, in_clause = geographies[0]
+
+    def api_variables(names) -> list[str]:
+        # Census API needs E/M suffixes for ACS; group(...) names have none.
+        if table is not None:
+            api_vars = list(names)
+        else:
+            api_vars = [f"{v}{suffix}" for v in names for suffix in ("E", "M")]
+        # Add summary variable if requested.
+        if summary_var is not None:
+            api_vars += [f"{summary_var}E", f"{summary_var}M"]
+        return api_vars
+
+    api_vars = api_variables(request.variables)
+    column_order = api_variables(requested)
+
+    url = f"{CENSUS_API_BASE}/{year}/acs/{survey}"
+    params: dict[str, str] = {
+        "get": f"NAME,{','.join(api_vars)}",
+        "for": for_clause,
+        "key": api_key,
+    }
+    if in_clause is not None:
+        params["in"] = in_clause
+
+    return QueryPlan(
+        requests=fan_out(url, params, geographies),
+        transform=partial(
+            _format_acs,
+            output=output,
+            moe_level=moe_level,
+            summary_var=summary_var,
+            keep_geo_vars=keep_geo_vars,
+        ),
+        cache_key=request.cache_key,
+        cache_params=request.params,
+        cache_table=cache_table,
+        cache_policy=resolve_cache_policy(cache),
+        cache_dir=_DEFAULT_CACHE_DIR,
+        geometry=(
+            {"geography": request.geography, "state": state, "year": year}
+            if geometry
+            else None
+        ),
+        numeric=_numeric_column,
+        name="get_acs",
+        request=request,
+        column_order=column_order if column_order != api_vars else None,
+    )
+
+
+def get_acs(
+    geography: str,
+    variables: str | list[str] | None = None,
+    table: str | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
+    year: int = 2023,
+    survey: str = "acs5",
+    output: str = "tidy",
+    moe_level: int = 90,
+    summary_var: str | None = None,
+    geometry: bool = False,
+    keep_geo_vars: bool = False,
+    cache_table: bool = False,
+    cache: str | None = None,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Retrieve American Community Survey data from the Census API.
+
+    Parameters
+    ----------
+    geography
+        Geography level (e.g. ``"state"``, ``"county"``, ``"tract"``).
+    variables
+        Variable ID or list of IDs (e.g. ``"B01001_001"``).
+    table
+        Census table ID (e.g. ``"B01001"``). Alternative to *variables*.
+    state
+        State FIPS code or abbreviation, a list of them, or ``"*"`` for
+        every state.  Multiple states are queried concurrently and the
+        results concatenated.
+    county
+        County FIPS code, a list of them, or ``"*"`` for every county in
+        the selected state(s).
+    year
+        Data year (default 2023).
+    survey
+        ``"acs5"`` (default) or ``"acs1"``.
+    output
+        ``"tidy"`` (default) or ``"wide"``.
+    moe_level
+        Confidence level for MOE: 90, 95, or 99 (default 90).
+    summary_var
+        Variable ID to include as denominator columns.
+    geometry
+        If True, return a GeoDataFrame with shapes.
+    keep_geo_vars
+        If True, preserve the raw FIPS columns (state, county, tract,
+        etc.) in the output alongside GEOID.
+    cache_table
+        If True, cache the API response locally to avoid redundant calls.
+    cache
+        Cache policy for this call: ``"default"``, ``"refresh"``,
+        ``"stale-ok"``, ``"offline"`` or ``"bypass"`` (see
+        :mod:`pypums.cache`).  ``None`` uses the global policy set with
+        :func:`~pypums.cache.configure_cache_policy`.
+    key
+        Census API key. Falls back to ``census_api_key()``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Census data in tidy or wide format.
+    """
+    plan = _plan_acs(
+        geography=geography,
+        variables=variables,
+        table=table,
+        state=state,
+        county=county,
+        year=year,
+        survey=survey,
+        output=output,
+        moe_level=moe_level,
+        summary_var=summary_var,
+        geometry=geometry,
+        keep_geo_vars=keep_geo_vars,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
+    )
+    return run_query(plan, _call_census_api)
+
+
+async def get_acs_async(
+    geography: str,
+    variables: str | list[str] | None = None,
+    table: str | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
+    year: int = 2023,
+    survey: str = "acs5",
+    output: str = "tidy",
+    moe_level: int = 90,
+    summary_var: str | None = None,
+    geometry: bool = False,
+    keep_geo_vars: bool = False,
+    cache_table: bool = False,
+    cache: str | None = None,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Asynchronous version of :func:`get_acs`.
+
+    Takes the same parameters and returns the same frame, but awaits the
+    Census API on the running event loop, so many queries can be gathered
+    concurrently (including from Jupyter, where a loop is already running).
+    """
+    plan = _plan_acs(
+        geography=geography,
+        variables=variables,
+        table=table,
+        state=state,
+        county=county,
+        year=year,
+        survey=survey,
+        output=output,
+        moe_level=moe_level,
+        summary_var=summary_var,
+        geometry=geometry,
+        keep_geo_vars=keep_geo_vars,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
+    )
+    return await run_query_async(plan, _call_census_api_async)
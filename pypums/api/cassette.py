@@ -0,0 +1,138 @@
+"""Record/replay of raw Census API responses.
+
+A :class:`Cassette` is a directory of recorded responses, one JSON file per
+request, keyed by a fingerprint of the URL and its parameters.  The API key
+is never part of the fingerprint nor written to disk, so cassettes can be
+shared and checked in.
+
+Modes:
+
+``"record"``
+    Always call the API and save every final response.
+``"replay"``
+    Serve recorded responses only; a request that was never recorded
+    raises :class:`CassetteMiss` instead of touching the network.
+``"auto"``
+    Replay when a recording exists, otherwise call the API and record.
+
+Enable one process-wide with :func:`pypums.api.client.configure_cassette`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import httpx
+
+# Query parameters that identify the caller rather than the data.
+REDACTED_PARAMS = frozenset({"key"})
+
+_MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request that has no recording."""
+
+
+def _canonical_params(params: dict | None) -> list[tuple[str, str]]:
+    return sorted(
+        (str(k), str(v)) for k, v in (params or {}).items() if k not in REDACTED_PARAMS
+    )
+
+
+def request_fingerprint(url: str, params: dict | None = None) -> str:
+    """Return a stable hex digest identifying a request.
+
+    Parameter order and the API key don't change the fingerprint.
+
+    Examples
+    --------
+    >>> a = request_fingerprint("https://x/data", {"get": "NAME", "key": "abc"})
+    >>> a == request_fingerprint("https://x/data", {"get": "NAME"})
+    True
+    """
+    canonical = json.dumps([url, _canonical_params(params)], separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Cassette:
+    """A directory of recorded Census API responses.
+
+    Parameters
+    ----------
+    path
+        Directory holding the recordings.  Created on first write.
+    mode
+        ``"record"``, ``"replay"`` (default) or ``"auto"``.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay") -> None:
+        if mode not in _MODES:
+            raise ValueError(f"mode must be one of {_MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._counts = {"replayed": 0, "recorded": 0, "missed": 0}
+
+    def _file(self, url: str, params: dict | None) -> Path:
+        return self.path / f"{request_fingerprint(url, params)}.json"
+
+    def load(self, url: str, params: dict | None = None) -> dict | None:
+        """Return the stored entry for a request, or ``None``."""
+        try:
+            return json.loads(self._file(url, params).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def play(self, url: str, params: dict | None = None) -> httpx.Response | None:
+        """Return the recorded response for a request.
+
+        Returns ``None`` when nothing is recorded and the mode allows going
+        to the network; raises :class:`CassetteMiss` in replay mode.
+        """
+        if self.mode == "record":
+            return None
+        entry = self.load(url, params)
+        with self._lock:
+            self._counts["replayed" if entry is not None else "missed"] += 1
+        if entry is None:
+            if self.mode == "replay":
+                raise CassetteMiss(
+                    f"No recorded response for {url} with params "
+                    f"{dict(_canonical_params(params))} in {self.path}."
+                )
+            return None
+        return httpx.Response(
+            entry["status"],
+            headers={"Content-Type": entry.get("content_type", "application/json")},
+            content=entry["body"].encode("utf-8"),
+            request=httpx.Request("GET", url, params=params),
+        )
+
+    def record(self, url: str, params: dict | None, response: httpx.Response) -> None:
+        """Save *response* for a request (no-op in replay mode)."""
+        if self.mode == "replay":
+            return
+        entry = {
+            "url": url,
+            "params": dict(_canonical_params(params)),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/json"),
+            "body": response.content.decode("utf-8"),
+        }
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._file(url, params)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, target)
+        with self._lock:
+            self._counts["recorded"] += 1
+
+    def stats(self) -> dict:
+        """Return replayed, recorded and missed request counts."""
+        with self._lock:
+            return dict(self._counts)
@@ -1,20 +1,817 @@
-"""Shared Census API HTTP client."""
+"""Shared Census API HTTP client.
+
+Every Census API call goes through one lazily created :class:`httpx.Client`
+so repeated requests reuse pooled keep-alive connections instead of paying a
+new TCP+TLS handshake each time.  Use :func:`configure_client` to tune the
+pool and :func:`session` to scope a client to a block of work.
+
+The ``*_async`` variants use an :class:`httpx.AsyncClient` with the same
+settings.  Async clients are bound to an event loop, so one is kept per loop.
+
+All requests, sync and async, pass through one shared
+:class:`~pypums.api.ratelimit.RateLimiter` (see :func:`configure_rate_limit`)
+and are retried on transient failures behind a per-host circuit breaker
+(see :func:`configure_retries` and :func:`configure_circuit_breaker`).
+
+Identical requests made concurrently are coalesced by a
+:class:`~pypums.api.singleflight.SingleFlight`: one HTTP call is sent and
+its parsed JSON is shared by every caller waiting on it.
+
+Raw responses can be recorded to and replayed from a
+:class:`~pypums.api.cassette.Cassette` (see :func:`configure_cassette`),
+and ``configure_client(api_base=...)`` points every request at another
+server such as :class:`pypums.api.stub.StubCensusServer`.
+
+Data responses can be decoded column-wise with :func:`decode_census_json`
+instead of into one Python string per cell; :func:`census_table_to_frame`
+then parses numeric columns straight into typed arrays.
+
+Each request emits ``on_request``/``on_response`` events and decoding is
+timed as the ``decode`` stage (see :mod:`pypums.instrumentation`).
+"""
+
+import asyncio
+import atexit
+import json
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
 
 import httpx
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from pypums.api.cassette import REDACTED_PARAMS, Cassette
+from pypums.api.ratelimit import RateLimiter
+from pypums.api.retry import RETRY_STATUSES, CircuitBreaker, RetryPolicy
+from pypums.api.singleflight import SingleFlight
+from pypums.constants import __version__
+from pypums.instrumentation import emit, metrics, stage
 
 CENSUS_API_BASE = "https://api.census.gov/data"
 CENSUS_TIMEOUT = 30
 
+# Defaults for the shared connection pool.
+_DEFAULT_CLIENT_OPTIONS: dict = {
+    "timeout": CENSUS_TIMEOUT,
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+    "transport": None,
+    "api_base": CENSUS_API_BASE,
+}
+
+_client_options: dict = dict(_DEFAULT_CLIENT_OPTIONS)
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+# One AsyncClient per running event loop.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Shared by every thread and event loop in the process.
+_rate_limiter = RateLimiter()
+_retry_policy = RetryPolicy()
+
+# One circuit breaker per API host.
+_breaker_options: dict = {"failure_threshold": 5, "reset_timeout": 30.0}
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Coalesces concurrent identical requests into one upstream call.
+_single_flight = SingleFlight()
+
+# Records or replays raw responses when set (see configure_cassette).
+_cassette: Cassette | None = None
+
+try:
+    import orjson
+
+    _loads: Callable[[bytes], object] = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
+
+def _client_kwargs(options: dict) -> dict:
+    """Translate resolved client options into ``httpx`` client kwargs."""
+    if options["http2"]:
+        try:
+            import h2  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(
+                "HTTP/2 support requires the 'h2' package. "
+                "Install with: pip install 'pypums[http2]'"
+            ) from exc
+
+    limits = httpx.Limits(
+        max_connections=options["max_connections"],
+        max_keepalive_connections=options["max_keepalive_connections"],
+        keepalive_expiry=options["keepalive_expiry"],
+    )
+    return {
+        "timeout": options["timeout"],
+        "limits": limits,
+        "http2": options["http2"],
+        "headers": {
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": f"pypums/{__version__}",
+        },
+    }
+
+
+def _build_client(options: dict) -> httpx.Client:
+    """Create an ``httpx.Client`` from a resolved options dict."""
+    return httpx.Client(transport=options["transport"], **_client_kwargs(options))
+
+
+def _build_async_client(options: dict) -> httpx.AsyncClient:
+    """Create an ``httpx.AsyncClient`` from a resolved options dict."""
+    transport = options["transport"]
+    if not isinstance(transport, httpx.AsyncBaseTransport):
+        transport = None
+    return httpx.AsyncClient(transport=transport, **_client_kwargs(options))
+
+
+def configure_client(
+    *,
+    timeout: float | None = None,
+    max_connections: int | None = None,
+    max_keepalive_connections: int | None = None,
+    keepalive_expiry: float | None = None,
+    http2: bool | None = None,
+    transport: httpx.BaseTransport | None = None,
+    api_base: str | None = None,
+) -> None:
+    """Configure the shared HTTP client used for all Census API calls.
+
+    Options left as ``None`` keep their current value.  The active client
+    is closed so the next request picks up the new settings.
+
+    Parameters
+    ----------
+    timeout
+        Request timeout in seconds (default 30).
+    max_connections
+        Maximum number of concurrent connections in the pool (default 20).
+    max_keepalive_connections
+        Maximum number of idle keep-alive connections (default 10).
+    keepalive_expiry
+        Seconds an idle connection is kept open (default 30).
+    http2
+        If True, negotiate HTTP/2.  Requires the ``http2`` extra.
+    transport
+        Custom ``httpx`` transport, mainly for testing.
+    api_base
+        Send requests for ``https://api.census.gov/data/...`` to this base
+        URL instead, e.g. a local stub server.  Pass :data:`CENSUS_API_BASE`
+        to restore the real API.
+    """
+    global _client
+    updates = {
+        "timeout": timeout,
+        "max_connections": max_connections,
+        "max_keepalive_connections": max_keepalive_connections,
+        "keepalive_expiry": keepalive_expiry,
+        "http2": http2,
+        "transport": transport,
+        "api_base": api_base.rstrip("/") if api_base else None,
+    }
+    with _client_lock:
+        _client_options.update({k: v for k, v in updates.items() if v is not None})
+        if _client is not None:
+            _client.close()
+            _client = None
+        # Async clients cannot be closed from here; drop them so the next
+        # call on each loop builds a fresh one with the new settings.
+        _async_clients.clear()
+
+
+def get_client() -> httpx.Client:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = _build_client(_client_options)
+        return _client
+
+
+def close_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+@contextmanager
+def session(**options) -> Iterator[httpx.Client]:
+    """Scope a dedicated shared client to a block of work.
+
+    Inside the block every Census API call reuses one connection pool; on
+    exit the pool is closed and the previous client settings are restored.
+    Accepts the same keyword arguments as :func:`configure_client`.
+
+    Examples
+    --------
+    >>> from pypums.api.client import session
+    >>> with session(max_connections=4):  # doctest: +SKIP
+    ...     frames = [get_acs("county", "B01001_001", state=s) for s in states]
+    """
+    global _client, _client_options
+    unknown = set(options) - set(_DEFAULT_CLIENT_OPTIONS)
+    if unknown:
+        raise TypeError(f"Unknown client options: {sorted(unknown)}")
+
+    with _client_lock:
+        saved = (_client, _client_options)
+        _client_options = {
+            **saved[1],
+            **{k: v for k, v in options.items() if v is not None},
+        }
+        _client = _build_client(_client_options)
+        scoped = _client
+    try:
+        yield scoped
+    finally:
+        with _client_lock:
+            scoped.close()
+            _client, _client_options = saved
+
+
+atexit.register(close_client)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        async_client = _async_clients.get(loop)
+        if async_client is None or async_client.is_closed:
+            async_client = _build_async_client(_client_options)
+            _async_clients[loop] = async_client
+        return async_client
+
+
+async def aclose_client() -> None:
+    """Close the async HTTP client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        async_client = _async_clients.pop(loop, None)
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def configure_rate_limit(
+    *,
+    rate: float | None = 10.0,
+    burst: int | None = None,
+    max_concurrency: int | None = 8,
+    adaptive: bool = True,
+    min_rate: float = 0.5,
+) -> RateLimiter:
+    """Replace the process-wide rate limiter for Census API requests.
+
+    Parameters
+    ----------
+    rate
+        Requests per second (default 10).  ``None`` disables the limit.
+    burst
+        Requests allowed back-to-back after an idle period.  Defaults to
+        ``rate`` rounded up.
+    max_concurrency
+        Maximum requests in flight across all threads and tasks
+        (default 8).  ``None`` means unlimited.
+    adaptive
+        If True (default), halve the rate and concurrency on 429/503
+        responses or latency spikes, and recover gradually afterwards.
+    min_rate
+        Floor for the adaptive request rate.
+
+    Returns
+    -------
+    RateLimiter
+        The newly installed limiter.
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(
+        rate=rate,
+        burst=burst,
+        max_concurrency=max_concurrency,
+        adaptive=adaptive,
+        min_rate=min_rate,
+    )
+    return _rate_limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    return _rate_limiter
+
+
+def configure_retries(
+    *,
+    max_attempts: int = 4,
+    backoff_base: float = 0.5,
+    backoff_max: float = 30.0,
+    deadline: float | None = 120.0,
+    retry_statuses: frozenset[int] = RETRY_STATUSES,
+    respect_retry_after: bool = True,
+) -> RetryPolicy:
+    """Replace the retry policy for Census API requests.
+
+    Parameters
+    ----------
+    max_attempts
+        Total attempts per call, including the first (default 4).  Pass
+        ``1`` to disable retries.
+    backoff_base
+        Backoff ceiling for the first retry in seconds (default 0.5),
+        doubled on each later retry and fully jittered.
+    backoff_max
+        Upper bound on a single wait in seconds (default 30).
+    deadline
+        Total seconds one call may spend across attempts and waits
+        (default 120).  ``None`` means no budget.
+    retry_statuses
+        HTTP statuses to retry (default 429, 500, 502, 503, 504).
+    respect_retry_after
+        If True (default), honor ``Retry-After`` response headers.
+
+    Returns
+    -------
+    RetryPolicy
+        The newly installed policy.
+    """
+    global _retry_policy
+    _retry_policy = RetryPolicy(
+        max_attempts=max_attempts,
+        backoff_base=backoff_base,
+        backoff_max=backoff_max,
+        deadline=deadline,
+        retry_statuses=retry_statuses,
+        respect_retry_after=respect_retry_after,
+    )
+    return _retry_policy
+
+
+def configure_circuit_breaker(
+    *,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+) -> None:
+    """Set circuit-breaker options and reset all breakers to closed.
+
+    Parameters
+    ----------
+    failure_threshold
+        Consecutive server errors or connection failures that open the
+        circuit for a host (default 5).
+    reset_timeout
+        Seconds the circuit stays open before one probe request is
+        allowed through (default 30).
+    """
+    with _breakers_lock:
+        _breaker_options.update(
+            failure_threshold=failure_threshold, reset_timeout=reset_timeout
+        )
+        _breakers.clear()
+
+
+def configure_cassette(
+    path: str | Path | None, *, mode: str = "replay"
+) -> Cassette | None:
+    """Record Census API responses to, or replay them from, a directory.
+
+    Parameters
+    ----------
+    path
+        Cassette directory, or ``None`` to turn recording/replay off.
+    mode
+        ``"record"`` saves every response, ``"replay"`` (default) serves
+        recorded responses only and never touches the network, ``"auto"``
+        replays what is recorded and records the rest.
+
+    Returns
+    -------
+    Cassette | None
+        The active cassette; its ``stats()`` counts replayed, recorded and
+        missed requests.
+
+    Examples
+    --------
+    >>> from pypums.api.client import configure_cassette
+    >>> configure_cassette("fixtures/acs", mode="record")  # doctest: +SKIP
+    >>> get_acs("state", "B01001_001")  # doctest: +SKIP
+    >>> configure_cassette("fixtures/acs")  # replay, no network  # doctest: +SKIP
+    """
+    global _cassette
+    _cassette = Cassette(path, mode=mode) if path is not None else None
+    return _cassette
+
+
+def _breaker_for(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(**_breaker_options)
+        return breaker
+
+
+def retry_stats() -> dict:
+    """Return retry counters and the circuit-breaker state for each host.
+
+    Examples
+    --------
+    >>> from pypums.api.client import retry_stats
+    >>> sorted(retry_stats())
+    ['breakers', 'retries']
+    """
+    with _breakers_lock:
+        breakers = {host: b.stats() for host, b in _breakers.items()}
+    return {"retries": _retry_policy.stats(), "breakers": breakers}
+
+
+def _rebase(url: str) -> str:
+    """Point a Census API URL at the configured ``api_base``."""
+    base = _client_options["api_base"]
+    if base != CENSUS_API_BASE and url.startswith(CENSUS_API_BASE):
+        return base + url[len(CENSUS_API_BASE) :]
+    return url
+
+
+def _record(url: str, params: dict | None, response: httpx.Response) -> None:
+    """Save a final (non-transient) response to the active cassette."""
+    cassette = _cassette
+    if cassette is not None and response.status_code not in RETRY_STATUSES:
+        cassette.record(url, params, response)
+
+
+def _emit_request(url: str, params: dict | None) -> None:
+    safe = {k: v for k, v in (params or {}).items() if k not in REDACTED_PARAMS}
+    emit("on_request", url=url, params=safe)
+
+
+def _emit_response(url: str, response: httpx.Response, start: float) -> None:
+    emit(
+        "on_response",
+        url=url,
+        status=response.status_code,
+        seconds=time.perf_counter() - start,
+        bytes=len(response.content),
+    )
+
+
+def _get(url: str, params: dict | None = None) -> httpx.Response:
+    """Send a rate-limited GET request and read the full response."""
+    cassette = _cassette
+    replayed = cassette.play(url, params) if cassette is not None else None
+    if replayed is not None:
+        return replayed
+    limiter = _rate_limiter
+    limiter.acquire()
+    _emit_request(url, params)
+    status = None
+    start = time.perf_counter()
+    latency = None
+    try:
+        http = get_client()
+        request = http.build_request("GET", _rebase(url), params=params)
+        response = http.send(request, stream=True)
+        latency = time.perf_counter() - start
+        status = response.status_code
+        try:
+            response.read()
+        finally:
+            response.close()
+    finally:
+        if latency is None:
+            latency = time.perf_counter() - start
+        limiter.release(latency, status)
+    _emit_response(url, response, start)
+    _record(url, params, response)
+    return response
+
+
+async def _get_async(url: str, params: dict | None = None) -> httpx.Response:
+    """Async version of :func:`_get`."""
+    cassette = _cassette
+    replayed = cassette.play(url, params) if cassette is not None else None
+    if replayed is not None:
+        return replayed
+    limiter = _rate_limiter
+    await limiter.acquire_async()
+    _emit_request(url, params)
+    status = None
+    start = time.perf_counter()
+    latency = None
+    try:
+        http = get_async_client()
+        request = http.build_request("GET", _rebase(url), params=params)
+        response = await http.send(request, stream=True)
+        latency = time.perf_counter() - start
+        status = response.status_code
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+    finally:
+        if latency is None:
+            latency = time.perf_counter() - start
+        limiter.release(latency, status)
+    _emit_response(url, response, start)
+    _record(url, params, response)
+    return response
+
+
+def _after_failure(
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    attempt: int,
+    exc: Exception,
+    started: float,
+) -> float | None:
+    """Record a failed attempt; return the wait before retrying, or None."""
+    outage = isinstance(exc, httpx.TransportError) or (
+        isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+    )
+    if outage:
+        breaker.record_failure()
+    else:
+        # The endpoint answered; only the request was rejected.
+        breaker.record_success()
+
+    delay = policy.next_delay(attempt, exc, time.monotonic() - started)
+    if delay is not None:
+        policy.record("retries")
+    elif policy.is_retryable(exc):
+        policy.record("exhausted")
+    return delay
+
+
+def _request(url: str, params: dict | None = None) -> httpx.Response:
+    """GET *url*, retrying transient failures; raise on error statuses."""
+    policy = _retry_policy
+    breaker = _breaker_for(url)
+    policy.record("calls")
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        policy.record("attempts")
+        try:
+            response = _get(url, params)
+            response.raise_for_status()
+        except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+            delay = _after_failure(policy, breaker, attempt, exc, started)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # Cassette misses, hook errors, cancellation: free a half-open
+            # probe slot so the breaker doesn't reject every later call.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return response
+
+
+async def _request_async(url: str, params: dict | None = None) -> httpx.Response:
+    """Async version of :func:`_request`."""
+    policy = _retry_policy
+    breaker = _breaker_for(url)
+    policy.record("calls")
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        policy.record("attempts")
+        try:
+            response = await _get_async(url, params)
+            response.raise_for_status()
+        except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+            delay = _after_failure(policy, breaker, attempt, exc, started)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Cassette misses, hook errors, cancellation: free a half-open
+            # probe slot so the breaker doesn't reject every later call.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return response
+
+
+def _request_key(url: str, params: dict | None) -> tuple:
+    """Normalize a request so parameter order doesn't split a flight."""
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def single_flight_stats() -> dict:
+    """Return how many API calls were made and how many shared a request.
+
+    Examples
+    --------
+    >>> from pypums.api.client import single_flight_stats
+    >>> sorted(single_flight_stats())
+    ['calls', 'shared']
+    """
+    return _single_flight.stats()
+
+
+def _rows_to_table(rows: list[list]) -> pa.Table:
+    """Build an all-string Arrow table from parsed JSON rows."""
+    header, body = rows[0], rows[1:]
+    columns = zip(*body, strict=True) if body else [() for _ in header]
+    arrays = [
+        pa.array(
+            [None if v is None else str(v) for v in column],
+            type=pa.string(),
+        )
+        for column in columns
+    ]
+    return pa.Table.from_arrays(arrays, names=[str(h) for h in header])
+
+
+def decode_census_json(content: bytes) -> pa.Table:
+    """Decode a Census API JSON array-of-arrays into an Arrow table.
+
+    The Census API writes one compact row per line, so when the payload
+    contains no escape sequences its JSON string quoting is also CSV quoting and
+    the rows are handed straight to Arrow's CSV reader; no Python object is
+    created per cell.  Anything else is parsed with ``orjson`` (if installed)
+    or :mod:`json`.  Every column is returned as strings (``null`` becomes
+    a missing value); see :func:`census_table_to_frame` for typing.
+
+    Parameters
+    ----------
+    content
+        Raw response body.
+
+    Returns
+    -------
+    pa.Table
+        One string column per header entry.
+
+    Examples
+    --------
+    >>> table = decode_census_json(b'[["NAME","P1_001N","state"],\\n'
+    ...                            b'["Alaska","733391","02"]]')
+    >>> table.column("state").to_pylist()
+    ['02']
+    """
+    body = content.strip()
+    if body.startswith(b"[[") and body.endswith(b"]]") and b"\\" not in body:
+        lines = body[2:-2].split(b"],\n[")
+        # Every newline must be a row break, or this isn't the line layout.
+        if len(lines) > 1 and body.count(b"\n") == len(lines) - 1:
+            header = json.loads(b"[" + lines[0] + b"]")
+            # Rows share the header's layout; CSV needs it compact.
+            compact = json.dumps(header, separators=(",", ":"), ensure_ascii=False)
+            if compact.encode() == b"[" + lines[0] + b"]":
+                try:
+                    return pa_csv.read_csv(
+                        pa.py_buffer(b"\n".join(lines[1:]) + b"\n"),
+                        read_options=pa_csv.ReadOptions(
+                            column_names=header, use_threads=True
+                        ),
+                        convert_options=pa_csv.ConvertOptions(
+                            column_types={h: pa.string() for h in header},
+                            null_values=["null"],
+                            strings_can_be_null=True,
+                            quoted_strings_can_be_null=False,
+                        ),
+                    )
+                except pa.ArrowInvalid:
+                    pass
+    return _rows_to_table(_loads(body))
+
+
+def _cast_numeric(column: pa.ChunkedArray) -> pa.ChunkedArray | None:
+    """Cast a string column to int64, else float64; None if neither parses."""
+    for target in (pa.int64(), pa.float64()):
+        try:
+            return pc.cast(column, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+    return None
+
+
+def census_table_to_frame(
+    table: pa.Table, numeric: Callable[[str], bool] | None = None
+) -> pd.DataFrame:
+    """Convert a decoded Census table to a DataFrame, typing numeric columns.
+
+    Columns for which *numeric* returns True are cast to ``int64`` (or
+    ``float64`` if they hold decimals or missing values) in Arrow; columns
+    with unparseable cells fall back to ``pd.to_numeric(errors="coerce")``.
+    All other columns, such as ``NAME`` and FIPS codes, stay strings.
+
+    Parameters
+    ----------
+    table
+        Table from :func:`decode_census_json`.
+    numeric
+        Predicate on column names.  ``None`` keeps every column as strings.
+
+    Returns
+    -------
+    pd.DataFrame
+        One column per table column, in order.
+    """
+    columns = table.columns
+    coerce = []
+    if numeric is not None:
+        for position, name in enumerate(table.column_names):
+            if not numeric(name):
+                continue
+            cast = _cast_numeric(columns[position])
+            if cast is None:
+                coerce.append(position)
+            else:
+                columns[position] = cast
+    df = pa.Table.from_arrays(columns, names=table.column_names).to_pandas()
+    for position in coerce:
+        df.isetitem(position, pd.to_numeric(df.iloc[:, position], errors="coerce"))
+    return df
+
+
+def _decode(content: bytes) -> pa.Table:
+    """Run :func:`decode_census_json` as the ``decode`` stage."""
+    with stage("decode") as extra:
+        table = decode_census_json(content)
+        extra["rows"] = table.num_rows
+    return table
+
 
 def call_census_api(url: str, params: dict) -> list[list[str]]:
-    """Make an HTTP request to the Census API and return JSON rows."""
-    response = httpx.get(url, params=params, timeout=CENSUS_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    """Make an HTTP request to the Census API and return JSON rows.
+
+    Concurrent calls with the same *url* and *params* share one request
+    and the same (read-only) result.
+    """
+    return _single_flight.do(
+        _request_key(url, params), lambda: _loads(_request(url, params).content)
+    )
+
+
+def call_census_api_table(url: str, params: dict) -> pa.Table:
+    """Like :func:`call_census_api`, but decode the rows column-wise.
+
+    See :func:`decode_census_json`.
+    """
+    return _single_flight.do(
+        ("table", *_request_key(url, params)),
+        lambda: _decode(_request(url, params).content),
+    )
 
 
 def fetch_json(url: str) -> dict:
     """Fetch JSON from a Census API endpoint."""
-    response = httpx.get(url, timeout=CENSUS_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    return _single_flight.do(
+        _request_key(url, None), lambda: _loads(_request(url).content)
+    )
+
+
+async def call_census_api_async(url: str, params: dict) -> list[list[str]]:
+    """Async version of :func:`call_census_api`."""
+
+    async def fetch() -> list[list[str]]:
+        return _loads((await _request_async(url, params)).content)
+
+    return await _single_flight.do_async(_request_key(url, params), fetch)
+
+
+async def call_census_api_table_async(url: str, params: dict) -> pa.Table:
+    """Async version of :func:`call_census_api_table`."""
+
+    async def fetch() -> pa.Table:
+        return _decode((await _request_async(url, params)).content)
+
+    return await _single_flight.do_async(("table", *_request_key(url, params)), fetch)
+
+
+async def fetch_json_async(url: str) -> dict:
+    """Async version of :func:`fetch_json`."""
+
+    async def fetch() -> dict:
+        return _loads((await _request_async(url)).content)
+
+    return await _single_flight.do_async(_request_key(url, None), fetch)
+
+
+metrics.add_collector("retries", retry_stats)
+metrics.add_collector("rate_limit", lambda: _rate_limiter.stats())
+metrics.add_collector("single_flight", single_flight_stats)
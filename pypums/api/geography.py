@@ -57,6 +57,11 @@ GEOGRAPHY_HIERARCHY: dict[str, dict] = {
 }
 
 
+# Island areas are not covered by the ACS or decennial summary endpoints,
+# so a ``state="*"`` wildcard skips them.
+_ISLAND_AREA_FIPS = frozenset({"60", "66", "69", "78"})
+
+
 def _resolve_state_fips(state: str) -> str:
     """Convert a state name or abbreviation to a 2-digit FIPS code."""
     # Already a numeric FIPS code — normalize to 2 digits.
@@ -135,3 +140,84 @@ def build_geography_query(
     in_clause = " ".join(in_parts) if in_parts else None
 
     return for_clause, in_clause
+
+
+def _is_multi(value: str | list[str] | None) -> bool:
+    return value == "*" or isinstance(value, (list, tuple))
+
+
+def _expand_states(state: str | list[str]) -> list[str]:
+    """Resolve a state wildcard or list into 2-digit FIPS codes."""
+    from pypums.datasets.fips import fips_codes
+
+    if state == "*":
+        codes = fips_codes["state_code"].drop_duplicates()
+        return [c for c in codes if c not in _ISLAND_AREA_FIPS]
+    return list(dict.fromkeys(_resolve_state_fips(s) for s in state))
+
+
+def _expand_counties(state_fips: str, county: str | list[str]) -> list[str]:
+    """Resolve a county wildcard or list into 3-digit FIPS codes for a state."""
+    from pypums.datasets.fips import fips_codes
+
+    if county == "*":
+        rows = fips_codes[fips_codes["state_code"] == state_fips]
+        return list(rows["county_code"])
+    return list(county)
+
+
+def expand_geography_query(
+    geography: str,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
+) -> list[tuple[str, str | None]]:
+    """Plan the Census API ``for``/``in`` pairs for one or many parents.
+
+    Like :func:`build_geography_query`, but *state* and *county* may also be
+    ``"*"`` (every state or every county in each state) or a list.  One
+    ``(for_clause, in_clause)`` pair is returned per parent geography the
+    Census API needs to be queried for, with duplicates removed.
+
+    Parameters
+    ----------
+    geography
+        Geography level name (e.g. ``"tract"``).
+    state
+        State FIPS code, name or abbreviation, a list of them, or ``"*"``.
+    county
+        County FIPS code, a list of them, or ``"*"``.
+
+    Returns
+    -------
+    list[tuple[str, str | None]]
+        ``(for_clause, in_clause)`` pairs, one per sub-request.
+
+    Examples
+    --------
+    >>> expand_geography_query("tract", state=["CA", "TX"], county="001")
+    [('tract:*', 'state:06 county:001'), ('tract:*', 'state:48 county:001')]
+    """
+    if not _is_multi(state) and not _is_multi(county):
+        return [build_geography_query(geography, state=state, county=county)]
+
+    if _is_multi(county) and state is None:
+        raise ValueError(
+            "county='*' or a list of counties requires a state. "
+            "Pass state='XX', a list of states, or state='*'."
+        )
+
+    # Only parents the geography is nested in change the query.
+    spec = GEOGRAPHY_HIERARCHY.get(geography.lower(), {"requires": []})
+    states = _expand_states(state) if _is_multi(state) else [state]
+    queries: list[tuple[str, str | None]] = []
+    for state_code in states:
+        if _is_multi(county) and "county" in spec["requires"]:
+            state_fips = _resolve_state_fips(state_code)
+            counties = _expand_counties(state_fips, county)
+        else:
+            counties = [None if _is_multi(county) else county]
+        for county_code in counties:
+            queries.append(
+                build_geography_query(geography, state=state_code, county=county_code)
+            )
+    return list(dict.fromkeys(queries))
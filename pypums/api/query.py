@@ -0,0 +1,708 @@
+"""Execution of planned Census API queries.
+
+Every ``get_*`` function validates its arguments into a :class:`QueryPlan`
+and hands it to :func:`run_query` (sync) or :func:`run_query_async`
+(asyncio).  Both executors share the same cache lookup, response parsing,
+formatting and geometry steps, so the two paths return identical frames.
+Each step is timed as an instrumentation stage labelled with the plan's
+``name`` (see :mod:`pypums.instrumentation`).  Cached plans go through
+:meth:`pypums.cache.CensusCache.get_or_fetch`, so threads or processes
+sharing a cache directory fetch each missing result only once.
+
+Cached plans use two layers in the same cache directory: the formatted
+result, keyed on every ``get_*`` argument, and beneath it the raw decoded
+response, keyed only on the upstream requests (see :func:`raw_cache_key`).
+Arguments that merely reshape the response -- ``output``, ``moe_level``,
+``keep_geo_vars``, ``geometry`` -- share one raw entry, so switching
+between them re-runs the transform locally instead of calling the API.
+A request for a subset of a cached raw entry's variables, or for
+geographies nested inside it (one county's tracts out of a statewide pull),
+is served by reading just the needed columns from it and filtering rows on
+their FIPS columns.
+
+A plan's ``cache_policy`` (the ``cache=`` argument of every ``get_*``)
+applies to both layers, except that ``"stale-ok"`` only serves stale
+formatted results: the raw layer underneath is refreshed normally.
+
+Plans may hold several requests, e.g. one per state when a ``get_*`` call
+asks for ``state="*"``; their responses are concatenated row-wise.  The
+Census API accepts at most 50 variables per request.  Requests asking
+for more are split into chunks that are fetched concurrently and joined
+back together on the columns they share (geography and key columns).
+"""
+
+import asyncio
+import hashlib
+import re
+import warnings
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import reduce
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from pypums import warehouse
+from pypums.api.cassette import REDACTED_PARAMS, request_fingerprint
+from pypums.api.client import census_table_to_frame
+from pypums.api.request import CensusRequest
+from pypums.cache import CensusCache
+from pypums.instrumentation import stage
+
+_DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache" / "api"
+
+# TTL for cached get_* results (24 hours).
+_RESULT_TTL_SECONDS = 86400
+
+# The dataset and year at the start of a result cache key, e.g. ``acs_2023``.
+_KEY_PREFIX = re.compile(r"^[A-Za-z]+_\d+")
+
+# Geography constraints in a ``for`` or ``in`` clause, e.g.
+# "state:06 county:037".
+_CLAUSE_GEOGRAPHY = re.compile(r"([^:]+):(\S+)")
+
+# Request parameters that don't restrict which rows a response covers
+# within its dataset: the variables, the geography clauses and the key.
+_NON_PREDICATE_PARAMS = frozenset({"get", "for", "in", *REDACTED_PARAMS})
+
+# Queries whose fetched responses go to the warehouse when it is enabled.
+_WAREHOUSED_QUERIES = frozenset(
+    {"get_acs", "get_decennial", "get_pums", "get_estimates"}
+)
+
+# The dataset path after the year in a request URL, e.g. ``acs/acs5``.
+_URL_DATASET = re.compile(r"/\d{4}/([^?]+?)/?$")
+
+# Maximum number of variables the Census API accepts in ``get``.
+MAX_API_VARIABLES = 50
+
+# Variables requested only in the first chunk of a split request.
+_FIRST_CHUNK_ONLY = ("NAME",)
+
+# Worker threads for concurrent sync requests.  The shared rate limiter
+# still decides how many are actually in flight.
+_MAX_WORKERS = 16
+
+# A fetcher returns either parsed JSON rows or a column-wise decoded table
+# (see :func:`pypums.api.client.call_census_api_table`).
+Response = list[list[str]] | pa.Table
+Fetcher = Callable[[str, dict], Response]
+AsyncFetcher = Callable[[str, dict], Awaitable[Response]]
+
+
+@dataclass
+class QueryPlan:
+    """A fully validated ``get_*`` call, ready to execute.
+
+    Parameters
+    ----------
+    requests
+        ``(url, params)`` pairs to send.  Their responses are concatenated
+        row-wise before formatting.
+    transform
+        Turns the raw response frame into the final output frame.
+    cache_key
+        Key identifying the formatted result in the disk cache.
+    cache_params
+        The ``get_*`` arguments behind the result, recorded in the cache
+        index so entries can be queried (see
+        :meth:`pypums.cache.CensusCache.find`).
+    cache_table
+        If True, read and write the disk cache.
+    cache_policy
+        One of :data:`pypums.cache.CACHE_POLICIES`.  Policies other than
+        ``"default"`` and ``"bypass"`` use the cache even when
+        *cache_table* is False.
+    cache_dir
+        Directory backing the disk cache.
+    geometry
+        Keyword arguments for :func:`pypums.spatial.attach_geometry`, or
+        ``None`` to skip geometry.
+    show_call
+        If True, print each API URL and its parameters before calling.
+    chunk_keys
+        Variables repeated in every chunk when a request has more than
+        :data:`MAX_API_VARIABLES` variables, so rows can be joined back
+        together.  Geography columns are always shared.  ``None`` disables
+        chunking.
+    numeric
+        Predicate naming the response columns to parse as numbers while
+        decoding; every other column (``NAME``, FIPS codes) stays a string.
+    name
+        Label attached to the plan's instrumentation stages, e.g.
+        ``"get_acs"``.
+    request
+        The canonical form of the call, printed by ``show_call``.
+    column_order
+        Variables in the order the caller listed them, when that differs
+        from the canonical (sorted) order the requests use.  The raw frame's
+        columns are rearranged to match before the transform, and the
+        formatted result is cached separately from the canonical order's.
+    """
+
+    requests: list[tuple[str, dict[str, str]]]
+    transform: Callable[[pd.DataFrame], pd.DataFrame]
+    cache_key: str
+    cache_params: dict | None = None
+    cache_table: bool = False
+    cache_policy: str = "default"
+    cache_dir: Path = _DEFAULT_CACHE_DIR
+    geometry: dict | None = None
+    show_call: bool = False
+    chunk_keys: tuple[str, ...] | None = ()
+    numeric: Callable[[str], bool] | None = None
+    name: str = "query"
+    request: CensusRequest | None = None
+    column_order: list[str] | None = None
+
+
+def rows_to_frame(
+    data: Response, numeric: Callable[[str], bool] | None = None
+) -> pd.DataFrame:
+    """Convert a Census API response to a DataFrame.
+
+    JSON rows (header row first) become string columns; decoded tables
+    have the columns matching *numeric* parsed as numbers.
+    """
+    if isinstance(data, pa.Table):
+        return census_table_to_frame(data, numeric)
+    return pd.DataFrame(data[1:], columns=data[0])
+
+
+def fan_out(
+    url: str,
+    params: dict[str, str],
+    geographies: list[tuple[str, str | None]],
+) -> list[tuple[str, dict[str, str]]]:
+    """Build one request per ``(for_clause, in_clause)`` pair.
+
+    *params* is used as a template: its ``for`` and ``in`` entries are
+    replaced for each pair from
+    :func:`pypums.api.geography.expand_geography_query`.
+    """
+    requests = []
+    for for_clause, in_clause in geographies:
+        request = {**params, "for": for_clause}
+        if in_clause is None:
+            request.pop("in", None)
+        else:
+            request["in"] = in_clause
+        requests.append((url, request))
+    return requests
+
+
+def split_params(
+    params: dict[str, str],
+    keys: tuple[str, ...] = (),
+    limit: int = MAX_API_VARIABLES,
+) -> list[dict[str, str]]:
+    """Split a request's ``get`` list into chunks the Census API accepts.
+
+    ``NAME`` is only requested in the first chunk; *keys* are repeated in
+    every chunk.  Requests within the limit are returned unchanged.
+
+    Examples
+    --------
+    >>> params = {"get": "NAME," + ",".join(f"V{i}" for i in range(60))}
+    >>> [len(p["get"].split(",")) for p in split_params(params)]
+    [50, 11]
+    """
+    variables = params["get"].split(",")
+    if len(variables) <= limit:
+        return [params]
+
+    first_only = [v for v in variables if v in _FIRST_CHUNK_ONLY]
+    repeated = [v for v in variables if v in keys]
+    rest = [v for v in variables if v not in first_only and v not in repeated]
+    if len(repeated) >= limit:
+        raise ValueError(
+            f"Cannot split request: {len(repeated)} key variables leave no room "
+            f"for data variables within the {limit}-variable limit."
+        )
+
+    chunks = []
+    head = first_only + repeated
+    while rest:
+        room = limit - len(head)
+        chunks.append({**params, "get": ",".join(head + rest[:room])})
+        rest = rest[room:]
+        head = list(repeated)
+    return chunks
+
+
+def _join_chunks(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Join chunk responses column-wise on the columns they share."""
+
+    def join(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        shared = [c for c in left.columns if c in right.columns]
+        if not shared:
+            return pd.concat([left, right], axis=1)
+        return left.merge(right, on=shared, how="left")
+
+    return reduce(join, frames)
+
+
+def _expand(plan: QueryPlan) -> list[list[tuple[str, dict[str, str]]]]:
+    """Expand each planned request into its list of chunk requests."""
+    if plan.chunk_keys is None:
+        return [[(url, params)] for url, params in plan.requests]
+    return [
+        [(url, chunk) for chunk in split_params(params, plan.chunk_keys)]
+        for url, params in plan.requests
+    ]
+
+
+def _assemble(
+    plan: QueryPlan,
+    groups: list[list[tuple[str, dict[str, str]]]],
+    responses: list[Response],
+) -> pd.DataFrame:
+    """Rebuild one raw frame from flat responses in ``groups`` order."""
+    frames = []
+    position = 0
+    for group in groups:
+        chunk_frames = [
+            rows_to_frame(data, plan.numeric)
+            for data in responses[position : position + len(group)]
+        ]
+        position += len(group)
+        frames.append(_join_chunks(chunk_frames))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def raw_cache_key(plan: QueryPlan) -> str:
+    """Return the cache key of the raw response behind *plan*.
+
+    The key depends only on the planned requests (URLs and parameters,
+    API key excluded), prefixed with the dataset and year of the plan's
+    ``cache_key`` so cache statistics group raw entries with results.
+
+    Examples
+    --------
+    >>> plan = QueryPlan(
+    ...     requests=[("https://x/data/2023/acs/acs5", {"get": "NAME", "key": "k"})],
+    ...     transform=lambda df: df,
+    ...     cache_key="acs_2023_acs5_state_None_None_wide_90",
+    ... )
+    >>> raw_cache_key(plan)[:13]
+    'acs_2023_raw_'
+    """
+    match = _KEY_PREFIX.match(plan.cache_key)
+    prefix = match.group(0) if match else plan.name
+    digest = hashlib.sha256(
+        ",".join(
+            request_fingerprint(url, params) for url, params in plan.requests
+        ).encode()
+    ).hexdigest()
+    return f"{prefix}_raw_{digest}"
+
+
+def _base(plan: QueryPlan) -> str | None:
+    """Fingerprint the dataset and predicates *plan* queries.
+
+    Raw entries with the same base differ only in their variables and
+    geographies, so one may be served from another.  ``None`` if the
+    plan's requests don't share one (they always do for ``get_*`` plans).
+    """
+    bases = {
+        request_fingerprint(
+            url, {k: v for k, v in params.items() if k not in _NON_PREDICATE_PARAMS}
+        )
+        for url, params in plan.requests
+    }
+    return bases.pop() if len(bases) == 1 else None
+
+
+def _raw_cache_params(plan: QueryPlan) -> dict:
+    """Index parameters for a raw entry: its requests, API key removed.
+
+    The year and geography of the plan's request are recorded too, so raw
+    entries can be selected like results (e.g. by ``pypums cache export``).
+    """
+    params = {
+        "layer": "raw",
+        "base": _base(plan),
+        "requests": [
+            [url, {k: v for k, v in params.items() if k not in REDACTED_PARAMS}]
+            for url, params in plan.requests
+        ],
+    }
+    if plan.request is not None:
+        params["year"] = plan.request.year
+        if plan.request.geography is not None:
+            params["geography"] = plan.request.geography
+    return params
+
+
+def _response_columns(params: dict[str, str]) -> list[str] | None:
+    """Columns a response to *params* has, or ``None`` if ``get`` has a group.
+
+    Besides the ``get`` variables, the API returns a column per ``for`` /
+    ``in`` geography and per predicate parameter.
+
+    Examples
+    --------
+    >>> _response_columns(
+    ...     {"get": "NAME,B01001_001E", "for": "tract:*", "in": "state:06 county:037"}
+    ... )
+    ['NAME', 'B01001_001E', 'tract', 'state', 'county']
+    """
+    columns = params["get"].split(",")
+    if any(c.startswith("group(") for c in columns):
+        return None
+    for name, value in params.items():
+        if name in ("for", "in"):
+            columns += [g.strip() for g, _ in _CLAUSE_GEOGRAPHY.findall(value)]
+        elif name not in ("get", *REDACTED_PARAMS):
+            columns.append(name)
+    return list(dict.fromkeys(columns))
+
+
+def _constraints(params: dict[str, str]) -> dict[str, str]:
+    """Map each geography in a request's ``for``/``in`` clauses to its codes.
+
+    Examples
+    --------
+    >>> _constraints({"for": "tract:*", "in": "state:06 county:037"})
+    {'tract': '*', 'state': '06', 'county': '037'}
+    """
+    found = {}
+    for clause in (params.get("for", ""), params.get("in", "")):
+        for name, codes in _CLAUSE_GEOGRAPHY.findall(clause):
+            found[name.strip()] = codes
+    return found
+
+
+def _contains(broad: dict[str, str], narrow: dict[str, str]) -> bool:
+    """True if every row *narrow* returns is also returned by *broad*.
+
+    Both must ask for the same geography level (the ``for`` clause); each
+    of *broad*'s constraints must be a wildcard or include *narrow*'s codes.
+    This follows :data:`pypums.api.geography.GEOGRAPHY_HIERARCHY`: a
+    request for one state's counties is contained in a request for every
+    state's counties, tracts in one county in tracts across the state.
+
+    Examples
+    --------
+    >>> statewide = {"for": "tract:*", "in": "state:06"}
+    >>> _contains(statewide, {"for": "tract:*", "in": "state:06 county:037"})
+    True
+    >>> _contains(statewide, {"for": "tract:*", "in": "state:48 county:001"})
+    False
+    """
+    if broad.get("for", "").split(":")[0] != narrow.get("for", "").split(":")[0]:
+        return False
+    wide, tight = _constraints(broad), _constraints(narrow)
+    for name, codes in wide.items():
+        if codes == "*":
+            continue
+        if tight.get(name, "*") == "*":
+            return False
+        if not set(tight[name].split(",")) <= set(codes.split(",")):
+            return False
+    return True
+
+
+def _select_rows(df: pd.DataFrame, params: dict[str, str]) -> pd.DataFrame | None:
+    """Rows of a broader response that a request for *params* would return."""
+    mask = pd.Series(True, index=df.index)
+    for name, codes in _constraints(params).items():
+        if codes == "*":
+            continue
+        if name not in df.columns:
+            return None
+        mask &= df[name].astype(str).isin(codes.split(","))
+    return df[mask]
+
+
+def _read_covering(cache: CensusCache, plan: QueryPlan) -> pd.DataFrame | None:
+    """Serve *plan*'s raw frame from a broader cached raw entry.
+
+    A raw entry for the same dataset and predicates covers the plan when
+    its columns include every variable the plan requests and each planned
+    request is geographically contained in one of its requests (see
+    :func:`_contains`).  Only the needed columns are read, and rows are
+    filtered on the FIPS columns.  Returns ``None`` when the plan's own
+    raw entry exists or nothing covers it.
+    """
+    columns = _response_columns(plan.requests[0][1])
+    base = _base(plan)
+    if columns is None or base is None:
+        return None
+    own = raw_cache_key(plan)
+    entries = cache.find(layer="raw", base=base)
+    if any(e["key"] == own and not e["expired"] for e in entries):
+        return None
+    for entry in sorted(entries, key=lambda e: e["size"]):
+        if entry["expired"] or not set(columns) <= set(entry["columns"] or ()):
+            continue
+        cached = [params for _, params in entry["params"]["requests"]]
+        if not all(
+            any(_contains(broad, params) for broad in cached)
+            for _, params in plan.requests
+        ):
+            continue
+        df = cache.get(entry["key"], columns=columns)
+        if df is None:
+            continue
+        parts = [_select_rows(df, params) for _, params in plan.requests]
+        if any(part is None for part in parts):
+            continue
+        if len(parts) == 1 and len(parts[0]) == len(df):
+            return df
+        return pd.concat(parts, ignore_index=True)
+    return None
+
+
+def _result_key(plan: QueryPlan) -> str:
+    """Return the cache key of the plan's formatted result."""
+    if plan.column_order is None:
+        return plan.cache_key
+    return f"{plan.cache_key}_columns={','.join(plan.column_order)}"
+
+
+def _reorder(df: pd.DataFrame, order: list[str]) -> pd.DataFrame:
+    """Rearrange the columns named in *order* among the slots they occupy.
+
+    Examples
+    --------
+    >>> df = pd.DataFrame(columns=["NAME", "A", "B", "state"])
+    >>> list(_reorder(df, ["B", "A"]).columns)
+    ['NAME', 'B', 'A', 'state']
+    """
+    wanted = set(order)
+    present = iter([c for c in order if c in df.columns])
+    return df[[next(present) if c in wanted else c for c in df.columns]]
+
+
+def _show_calls(plan: QueryPlan, calls: list[tuple[str, dict[str, str]]]) -> None:
+    if plan.request is not None:
+        print(f"Census request: {plan.request}")
+    for url, params in calls:
+        print(f"Census API call: {url}")
+        print(f"  Parameters: {params}")
+
+
+def _finish(plan: QueryPlan, df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the plan's transform and optional geometry to a raw frame."""
+    if plan.column_order is not None:
+        df = _reorder(df, plan.column_order)
+    with stage("transform", query=plan.name):
+        result = plan.transform(df)
+    if plan.geometry is not None:
+        from pypums.spatial import attach_geometry
+
+        with stage("geometry", query=plan.name):
+            result = attach_geometry(result, **plan.geometry)
+    return result
+
+
+def fetch_concurrently(
+    fetch: Fetcher, calls: list[tuple[str, dict[str, str]]]
+) -> list[Response]:
+    """Call *fetch* for each ``(url, params)`` pair using worker threads.
+
+    Results are returned in the order of *calls*.
+    """
+    if len(calls) == 1:
+        return [fetch(*calls[0])]
+    with ThreadPoolExecutor(max_workers=min(len(calls), _MAX_WORKERS)) as pool:
+        return list(pool.map(lambda call: fetch(*call), calls))
+
+
+def _frame(
+    plan: QueryPlan,
+    groups: list[list[tuple[str, dict[str, str]]]],
+    responses: list[Response],
+) -> pd.DataFrame:
+    with stage("frame", query=plan.name) as extra:
+        raw = _assemble(plan, groups, responses)
+        extra["rows"] = len(raw)
+    return raw
+
+
+def _store(plan: QueryPlan, raw: pd.DataFrame) -> None:
+    """Merge a fetched raw frame into the warehouse, if it is enabled.
+
+    Rows are matched on the geography columns of the requests' ``for`` and
+    ``in`` clauses, their predicate parameters (``AGEGROUP``, ``YEAR``,
+    ...) and the plan's chunk keys.  A failed write only warns: the
+    warehouse never fails a ``get_*`` call.
+    """
+    if (
+        warehouse.warehouse_root() is None
+        or plan.name not in _WAREHOUSED_QUERIES
+        or plan.request is None
+    ):
+        return
+    match = _URL_DATASET.search(plan.requests[0][0])
+    if match is None:
+        return
+    keys = set(plan.chunk_keys or ())
+    for _, params in plan.requests:
+        keys.update(_constraints(params))
+        keys.update(name for name in params if name not in _NON_PREDICATE_PARAMS)
+    try:
+        with stage("warehouse_write", query=plan.name):
+            warehouse.write(
+                raw,
+                match.group(1),
+                plan.request.year,
+                plan.request.geography,
+                sorted(keys),
+            )
+    except Exception as exc:  # the result itself is still valid
+        warnings.warn(
+            f"Could not write {plan.name} results to the warehouse: {exc}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+
+def run_query(plan: QueryPlan, fetch: Fetcher) -> pd.DataFrame:
+    """Execute *plan* synchronously using *fetch* for each API request."""
+    with stage("total", query=plan.name):
+        return _run_query(plan, fetch)
+
+
+def _uses_cache(plan: QueryPlan) -> bool:
+    if plan.cache_policy == "default":
+        return plan.cache_table
+    return plan.cache_policy != "bypass"
+
+
+def _raw_policy(policy: str) -> str:
+    """Policy for the raw layer when the result layer uses *policy*.
+
+    Stale results are revalidated from the API, so only the result layer
+    serves stale data under ``"stale-ok"``.
+    """
+    return "default" if policy == "stale-ok" else policy
+
+
+def _run_query(plan: QueryPlan, fetch: Fetcher) -> pd.DataFrame:
+    if not _uses_cache(plan):
+        return _finish(plan, _fetch_raw(plan, fetch))
+    cache = CensusCache(plan.cache_dir)
+    # A read-only cache can't be filled, so answer from it as if offline.
+    policy = "offline" if cache.read_only else plan.cache_policy
+    raw_policy = _raw_policy(policy)
+
+    def compute() -> pd.DataFrame:
+        raw = None if raw_policy == "refresh" else _read_covering(cache, plan)
+        if raw is None:
+            raw = cache.get_or_fetch(
+                raw_cache_key(plan),
+                lambda: _fetch_raw(plan, fetch),
+                ttl_seconds=_RESULT_TTL_SECONDS,
+                params=_raw_cache_params(plan),
+                policy=raw_policy,
+            )
+        return _finish(plan, raw)
+
+    if policy == "offline":
+        # Results can still be derived from cached raw responses.
+        df = cache.get(_result_key(plan), stale=True)
+        if df is None:
+            df = compute()
+            cache.set(
+                _result_key(plan),
+                df,
+                ttl_seconds=_RESULT_TTL_SECONDS,
+                params=plan.cache_params,
+            )
+        return df
+    return cache.get_or_fetch(
+        _result_key(plan),
+        compute,
+        ttl_seconds=_RESULT_TTL_SECONDS,
+        params=plan.cache_params,
+        policy=policy,
+    )
+
+
+def _fetch_raw(plan: QueryPlan, fetch: Fetcher) -> pd.DataFrame:
+    groups = _expand(plan)
+    calls = [call for group in groups for call in group]
+    if plan.show_call:
+        _show_calls(plan, calls)
+
+    with stage("fetch", query=plan.name, requests=len(calls)):
+        responses = fetch_concurrently(fetch, calls)
+    raw = _frame(plan, groups, responses)
+    _store(plan, raw)
+    return raw
+
+
+async def run_query_async(plan: QueryPlan, fetch: AsyncFetcher) -> pd.DataFrame:
+    """Execute *plan* on the running event loop.
+
+    API requests are issued concurrently; blocking work (disk cache I/O and
+    geometry) runs in a worker thread so the loop stays responsive.
+    """
+    with stage("total", query=plan.name):
+        return await _run_query_async(plan, fetch)
+
+
+async def _run_query_async(plan: QueryPlan, fetch: AsyncFetcher) -> pd.DataFrame:
+    if not _uses_cache(plan):
+        return await _finish_async(plan, await _fetch_raw_async(plan, fetch))
+    cache = CensusCache(plan.cache_dir)
+    # A read-only cache can't be filled, so answer from it as if offline.
+    policy = "offline" if cache.read_only else plan.cache_policy
+    raw_policy = _raw_policy(policy)
+
+    async def compute() -> pd.DataFrame:
+        raw = None
+        if raw_policy != "refresh":
+            raw = await asyncio.to_thread(_read_covering, cache, plan)
+        if raw is None:
+            raw = await cache.get_or_fetch_async(
+                raw_cache_key(plan),
+                lambda: _fetch_raw_async(plan, fetch),
+                ttl_seconds=_RESULT_TTL_SECONDS,
+                params=_raw_cache_params(plan),
+                policy=raw_policy,
+            )
+        return await _finish_async(plan, raw)
+
+    if policy == "offline":
+        df = await asyncio.to_thread(cache.get, _result_key(plan), stale=True)
+        if df is None:
+            df = await compute()
+            await asyncio.to_thread(
+                cache.set,
+                _result_key(plan),
+                df,
+                ttl_seconds=_RESULT_TTL_SECONDS,
+                params=plan.cache_params,
+            )
+        return df
+    return await cache.get_or_fetch_async(
+        _result_key(plan),
+        compute,
+        ttl_seconds=_RESULT_TTL_SECONDS,
+        params=plan.cache_params,
+        policy=policy,
+    )
+
+
+async def _fetch_raw_async(plan: QueryPlan, fetch: AsyncFetcher) -> pd.DataFrame:
+    groups = _expand(plan)
+    calls = [call for group in groups for call in group]
+    if plan.show_call:
+        _show_calls(plan, calls)
+    with stage("fetch", query=plan.name, requests=len(calls)):
+        responses = await asyncio.gather(*(fetch(url, params) for url, params in calls))
+    raw = _frame(plan, groups, list(responses))
+    if warehouse.warehouse_root() is not None:
+        await asyncio.to_thread(_store, plan, raw)
+    return raw
+
+
+async def _finish_async(plan: QueryPlan, raw: pd.DataFrame) -> pd.DataFrame:
+    if plan.geometry is not None:
+        return await asyncio.to_thread(_finish, plan, raw)
+    return _finish(plan, raw)
@@ -0,0 +1,206 @@
+"""Client-side rate limiting for Census API requests.
+
+:class:`RateLimiter` combines a token bucket (requests per second with a
+burst allowance) and a cap on requests in flight.  One instance is shared
+by threads and asyncio tasks alike.
+
+When adaptive, the limiter follows AIMD (additive increase, multiplicative
+decrease): a throttling response (429/503), a transport failure or a
+latency spike halves the request rate and the concurrency cap; each
+healthy response nudges them back up toward the configured ceilings.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+# HTTP status codes that signal the server wants us to slow down.
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# A response whose time-to-first-byte exceeds this multiple of the latency
+# baseline counts as congestion.
+_LATENCY_SPIKE_FACTOR = 3.0
+
+# Weight of a new sample in the latency baseline EWMA.
+_LATENCY_EWMA_ALPHA = 0.1
+
+# Minimum seconds between two multiplicative decreases, so one burst of
+# 429s only backs off once.
+_DECREASE_COOLDOWN = 1.0
+
+
+class RateLimiter:
+    """Token-bucket rate limiter with a max-in-flight cap and AIMD tuning.
+
+    Parameters
+    ----------
+    rate
+        Steady-state requests per second.  ``None`` disables the token
+        bucket.
+    burst
+        Bucket size: how many requests may go out back-to-back after an
+        idle period.  Defaults to ``rate`` rounded up.
+    max_concurrency
+        Maximum requests in flight at once.  ``None`` means unlimited.
+    adaptive
+        If True (default), adjust the rate and concurrency cap from
+        response feedback.
+    min_rate
+        Floor for the adaptive request rate.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = 10.0,
+        burst: int | None = None,
+        max_concurrency: int | None = 8,
+        *,
+        adaptive: bool = True,
+        min_rate: float = 0.5,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency!r}"
+            )
+
+        self.max_rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate or 1))
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.min_rate = min(min_rate, rate) if rate is not None else min_rate
+
+        self._rate = rate
+        self._limit = float(max_concurrency) if max_concurrency is not None else None
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._latency_baseline: float | None = None
+        self._last_decrease = 0.0
+        self._throttled = 0
+        self._decreases = 0
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    # -- acquisition -------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        if self._rate is None:
+            return
+        elapsed = now - self._last_refill
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def _try_acquire(self) -> float:
+        """Take a slot and a token if both are free.
+
+        Returns 0 on success, otherwise the number of seconds to wait
+        before trying again.  Must be called with the lock held.
+        """
+        if self._limit is not None and self._in_flight >= int(self._limit):
+            # Woken by release(); the timeout is only a safety net.
+            return 0.05
+
+        now = time.monotonic()
+        self._refill(now)
+        if self._rate is not None and self._tokens < 1.0:
+            return (1.0 - self._tokens) / self._rate
+
+        if self._rate is not None:
+            self._tokens -= 1.0
+        self._in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        with self._cond:
+            while (wait := self._try_acquire()) > 0:
+                self._cond.wait(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a request may be sent."""
+        while True:
+            with self._lock:
+                wait = self._try_acquire()
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    # -- feedback ----------------------------------------------------------
+
+    def release(self, latency: float, status: int | None) -> None:
+        """Return the in-flight slot and feed back the response outcome.
+
+        Parameters
+        ----------
+        latency
+            Seconds until the response headers arrived.
+        status
+            HTTP status code, or ``None`` if the request failed without
+            a response (timeout, connection error).
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            congested = status is None or status in THROTTLE_STATUSES
+            if status in THROTTLE_STATUSES:
+                self._throttled += 1
+
+            baseline = self._latency_baseline
+            if not congested and baseline is not None:
+                congested = latency > baseline * _LATENCY_SPIKE_FACTOR
+            if status is not None and status not in THROTTLE_STATUSES:
+                # Spikes still feed the baseline so it can drift to a new
+                # normal if the server stays slower.
+                self._latency_baseline = (
+                    latency
+                    if baseline is None
+                    else baseline + _LATENCY_EWMA_ALPHA * (latency - baseline)
+                )
+
+            if self.adaptive:
+                if congested:
+                    self._decrease()
+                else:
+                    self._increase()
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < _DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self._decreases += 1
+        if self._rate is not None:
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate / 2)
+        if self._limit is not None:
+            self._limit = max(1.0, self._limit / 2)
+
+    def _increase(self) -> None:
+        if self._rate is not None and self.max_rate is not None:
+            # Regain the full rate after about ten healthy responses.
+            self._refill(time.monotonic())
+            self._rate = min(self.max_rate, self._rate + self.max_rate / 10)
+        if self._limit is not None and self.max_concurrency is not None:
+            # Additive increase: about one extra slot per window of responses.
+            self._limit = min(
+                float(self.max_concurrency), self._limit + 1.0 / self._limit
+            )
+
+    def stats(self) -> dict:
+        """Return the current rate, concurrency cap and feedback counters."""
+        with self._lock:
+            return {
+                "rate": self._rate,
+                "max_rate": self.max_rate,
+                "concurrency_limit": (
+                    int(self._limit) if self._limit is not None else None
+                ),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "throttled": self._throttled,
+                "decreases": self._decreases,
+            }
@@ -0,0 +1,253 @@
+"""Canonical descriptions of ``get_*`` calls.
+
+The same data can be asked for in many spellings: ``state="CA"``,
+``"ca"``, ``"California"`` and ``"06"`` name one state, ``"County"`` and
+``"county"`` one geography, and a variable list means the same thing in
+any order or with repeats.  :class:`CensusRequest` normalizes all of them
+so that equivalent calls share one cache key, send byte-identical API
+requests (which the client's single-flight layer coalesces) and print the
+same description.
+
+Normalization rules:
+
+* geography names are lowercased with whitespace collapsed;
+* states are resolved to 2-digit FIPS codes and counties zero-padded to 3
+  digits; lists are deduplicated and sorted, one-element lists collapse to
+  the bare code, and ``"*"`` is kept as is;
+* variables are deduplicated and sorted;
+* filter values (``{var: value_or_list}``) become sorted lists of strings.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from pypums.api.geography import _resolve_state_fips
+
+
+def normalize_geography(geography: str | None) -> str | None:
+    """Lowercase a geography name and collapse its whitespace.
+
+    Examples
+    --------
+    >>> normalize_geography("  Block  Group ")
+    'block group'
+    """
+    if geography is None:
+        return None
+    return " ".join(geography.lower().split())
+
+
+def _collapse(codes: list[str]) -> str | tuple[str, ...]:
+    unique = sorted(set(codes))
+    return unique[0] if len(unique) == 1 else tuple(unique)
+
+
+def normalize_states(
+    state: str | list[str] | None,
+) -> str | tuple[str, ...] | None:
+    """Resolve states to sorted, deduplicated 2-digit FIPS codes.
+
+    Examples
+    --------
+    >>> normalize_states("California")
+    '06'
+    >>> normalize_states(["tx", "CA", "06"])
+    ('06', '48')
+    """
+    if state is None or state == "*":
+        return state
+    if isinstance(state, str):
+        return _resolve_state_fips(state)
+    return _collapse([_resolve_state_fips(s) for s in state])
+
+
+def normalize_counties(
+    county: str | list[str] | None,
+) -> str | tuple[str, ...] | None:
+    """Zero-pad numeric county codes to 3 digits, sorted and deduplicated.
+
+    Examples
+    --------
+    >>> normalize_counties(["59", "037", "037"])
+    ('037', '059')
+    """
+    if county is None or county == "*":
+        return county
+
+    def pad(code: str) -> str:
+        return code.zfill(3) if code.isdigit() else code
+
+    if isinstance(county, str):
+        return pad(county)
+    return _collapse([pad(c) for c in county])
+
+
+def normalize_variables(variables: str | list[str] | None) -> tuple[str, ...]:
+    """Return variable names deduplicated and sorted.
+
+    Examples
+    --------
+    >>> normalize_variables(["B19013_001", "B01001_001", "B19013_001"])
+    ('B01001_001', 'B19013_001')
+    """
+    if variables is None:
+        return ()
+    if isinstance(variables, str):
+        return (variables,)
+    return tuple(sorted(set(variables)))
+
+
+def normalize_filters(
+    filters: dict[str, list | int | str] | None,
+) -> dict[str, list[str]] | None:
+    """Normalize server-side filters to sorted lists of string values.
+
+    Examples
+    --------
+    >>> normalize_filters({"SEX": 2, "AGEP": [65, 18, 18]})
+    {'AGEP': ['18', '65'], 'SEX': ['2']}
+    """
+    if not filters:
+        return None
+    normalized = {}
+    for var, value in sorted(filters.items()):
+        values = value if isinstance(value, list | tuple | set) else [value]
+        normalized[var] = sorted({str(v) for v in values})
+    return normalized
+
+
+def _listed(value: str | tuple[str, ...] | None) -> str | list[str] | None:
+    return list(value) if isinstance(value, tuple) else value
+
+
+def _encode_option(value: Any) -> str:
+    if isinstance(value, dict):
+        value = normalize_filters(value)
+    return json.dumps(value)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, dict):
+        return ";".join(f"{k}:{_text(v)}" for k, v in value.items())
+    if isinstance(value, list):
+        return ",".join(_text(v) for v in value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class CensusRequest:
+    """The canonical, hashable form of one ``get_*`` call.
+
+    Build instances with :meth:`create`, which applies the normalization
+    rules in the module docstring.  Two calls that return the same data
+    compare equal and share a :attr:`cache_key`.
+
+    Parameters
+    ----------
+    program
+        Census program the request belongs to and the cache-key prefix:
+        ``"acs"``, ``"dec"``, ``"est"``, ``"flows"`` or ``"pums"``.
+    year
+        Year in the API path (the vintage, for population estimates).
+    geography
+        Normalized geography level, or ``None`` (PUMS).
+    state, county
+        Normalized FIPS codes, a tuple of them, ``"*"`` or ``None``.
+    variables
+        Sorted, deduplicated variable names.
+    options
+        Every other argument that changes the result, as sorted
+        ``(name, JSON-encoded value)`` pairs.
+
+    Examples
+    --------
+    >>> a = CensusRequest.create(
+    ...     "acs", 2023, geography="County", state="ca",
+    ...     variables=["B19013_001", "B01001_001"], output="tidy",
+    ... )
+    >>> b = CensusRequest.create(
+    ...     "acs", 2023, geography="county", state=["06"],
+    ...     variables=["B01001_001", "B19013_001"], output="tidy",
+    ... )
+    >>> a == b
+    True
+    >>> print(a)
+    acs 2023 county state=06 variables=B01001_001,B19013_001 output=tidy
+    """
+
+    program: str
+    year: int
+    geography: str | None = None
+    state: str | tuple[str, ...] | None = None
+    county: str | tuple[str, ...] | None = None
+    variables: tuple[str, ...] = ()
+    options: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def create(
+        cls,
+        program: str,
+        year: int,
+        /,
+        *,
+        geography: str | None = None,
+        state: str | list[str] | None = None,
+        county: str | list[str] | None = None,
+        variables: str | list[str] | None = None,
+        **options: Any,
+    ) -> "CensusRequest":
+        """Normalize a ``get_*`` call's arguments into a request.
+
+        Keyword arguments beyond the named ones are kept as options;
+        dict-valued options are treated as filters (see
+        :func:`normalize_filters`).
+        """
+        return cls(
+            program=program,
+            year=int(year),
+            geography=normalize_geography(geography),
+            state=normalize_states(state),
+            county=normalize_counties(county),
+            variables=normalize_variables(variables),
+            options=tuple(
+                (name, _encode_option(value)) for name, value in sorted(options.items())
+            ),
+        )
+
+    @property
+    def params(self) -> dict:
+        """JSON-serializable parameters, as recorded in the cache index."""
+        params = {
+            "year": self.year,
+            "geography": self.geography,
+            "state": _listed(self.state),
+            "county": _listed(self.county),
+            "variables": list(self.variables),
+        }
+        if self.geography is None:
+            del params["geography"]
+        params.update((name, json.loads(value)) for name, value in self.options)
+        return params
+
+    @property
+    def cache_key(self) -> str:
+        """Cache key shared by every call equivalent to this one."""
+        parts = [self.program, str(self.year)]
+        parts += [
+            f"{name}={_text(value)}"
+            for name, value in self.params.items()
+            if name != "year"
+        ]
+        return "_".join(parts)
+
+    def __str__(self) -> str:
+        parts = [self.program, str(self.year)]
+        if self.geography is not None:
+            parts.append(self.geography)
+        parts += [
+            f"{name}={_text(value)}"
+            for name, value in self.params.items()
+            if name not in ("year", "geography") and value not in (None, [])
+        ]
+        return " ".join(parts)
@@ -0,0 +1,211 @@
+"""Retry and circuit-breaker policies for Census API requests.
+
+:class:`RetryPolicy` decides whether a failed GET should be retried and how
+long to wait: jittered exponential backoff, honoring ``Retry-After``, within
+a per-call deadline.  :class:`CircuitBreaker` stops sending requests to an
+endpoint that keeps failing and lets a single probe through once a cool-down
+has passed.
+
+Both keep counters (see their ``stats()`` methods) that
+:func:`pypums.api.client.retry_stats` reports.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Statuses worth retrying: throttling and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """Retry idempotent GETs with jittered exponential backoff.
+
+    Parameters
+    ----------
+    max_attempts
+        Total attempts per call, including the first (default 4).  ``1``
+        disables retries.
+    backoff_base
+        Backoff ceiling for the first retry, in seconds (default 0.5).
+        Each later retry doubles it.
+    backoff_max
+        Upper bound on a single wait, in seconds (default 30).
+    deadline
+        Total seconds a call may spend across attempts and waits
+        (default 120).  ``None`` means no budget.
+    retry_statuses
+        HTTP statuses that are retried.  Transport errors (timeouts,
+        dropped connections) are always retried.
+    respect_retry_after
+        If True (default), wait at least as long as a ``Retry-After``
+        header asks.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        deadline: float | None = 120.0,
+        retry_statuses: frozenset[int] = RETRY_STATUSES,
+        respect_retry_after: bool = True,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts!r}")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+
+        self._lock = threading.Lock()
+        self._counts = {"calls": 0, "attempts": 0, "retries": 0, "exhausted": 0}
+
+    def is_retryable(self, exc: Exception) -> bool:
+        """Return True if *exc* is a transient failure worth retrying."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, httpx.TransportError)
+
+    def backoff(self, attempt: int, exc: Exception) -> float:
+        """Seconds to wait before retry number *attempt* (1-based).
+
+        Uses "full jitter": a uniform draw between zero and the
+        exponential ceiling, so concurrent clients don't retry in step.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if self.respect_retry_after and isinstance(exc, httpx.HTTPStatusError):
+            retry_after = _retry_after_seconds(exc.response)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def next_delay(self, attempt: int, exc: Exception, elapsed: float) -> float | None:
+        """Decide whether to retry after failed attempt number *attempt*.
+
+        Returns the seconds to wait, or ``None`` to give up and re-raise.
+        """
+        if not self.is_retryable(exc) or attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, exc)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    def record(self, name: str) -> None:
+        """Increment the *name* counter (``calls``, ``attempts``, ...)."""
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> dict:
+        """Return call, attempt, retry and exhausted-budget counts."""
+        with self._lock:
+            return dict(self._counts)
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls raise :class:`CircuitOpenError` without touching the network.
+    Once ``reset_timeout`` seconds pass, one probe request is let through
+    ("half-open"): success closes the circuit, failure re-opens it.
+
+    Parameters
+    ----------
+    failure_threshold
+        Consecutive failures that open the circuit (default 5).
+    reset_timeout
+        Seconds to stay open before probing again (default 30).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        if failure_threshold < 1:
+            raise ValueError(
+                f"failure_threshold must be at least 1, got {failure_threshold!r}"
+            )
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._counts = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half-open"``."""
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` if the call must not be sent."""
+        with self._lock:
+            if self._state == "closed":
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == "open" and remaining <= 0:
+                self._state = "half-open"
+            if self._state == "half-open" and not self._probing:
+                self._probing = True
+                return
+            self._counts["rejected"] += 1
+        raise CircuitOpenError(
+            f"Census API circuit is open after {self.failure_threshold} "
+            f"consecutive failures; retrying in {max(remaining, 0):.0f}s."
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Let another call probe after one that ended without an answer."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._state == "half-open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self._counts["opened"] += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def stats(self) -> dict:
+        """Return the state and open/rejected counts."""
+        with self._lock:
+            return {"state": self._state, **self._counts}
@@ -0,0 +1,108 @@
+"""Coalescing of identical in-flight Census API requests.
+
+When several threads (or asyncio tasks) ask for the same request at the
+same moment, :class:`SingleFlight` lets the first one make the call and
+hands its result, or its exception, to everyone who arrived while it was
+in flight.  Once the call finishes the key is forgotten, so later requests
+go upstream again — this is deduplication, not caching.
+
+Callers receive the same result object, so it must be treated as
+read-only.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    """One in-flight synchronous call and its outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Share one execution among concurrent callers with the same key.
+
+    Synchronous callers (threads) and asynchronous callers (tasks on one
+    event loop) are coalesced separately, since an awaitable can't be
+    shared across threads or loops.
+
+    Examples
+    --------
+    >>> flight = SingleFlight()
+    >>> flight.do(("GET", "https://example.com"), lambda: 42)
+    42
+    >>> flight.stats()
+    {'calls': 1, 'shared': 0}
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self._counts = {"calls": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, sharing it with concurrent callers of *key*."""
+        with self._lock:
+            self._counts["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._counts["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()``, sharing it with concurrent tasks awaiting *key*.
+
+        The call runs in its own task, so cancelling one waiter does not
+        cancel the request for the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            self._counts["calls"] += 1
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda t: self._forget(task_key, t))
+            else:
+                self._counts["shared"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: tuple, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        # Mark the exception retrieved in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Return how many calls were made and how many were shared."""
+        with self._lock:
+            return dict(self._counts)
@@ -0,0 +1,403 @@
+"""A local stand-in for the Census Data API.
+
+:class:`StubCensusServer` answers the endpoints pypums calls — ACS and
+decennial tables, ``/pums``, ``/pep/*``, ``/acs/flows``,
+``variables.json`` and ``geography.json`` — from a recorded
+:class:`~pypums.api.cassette.Cassette` when one matches, and otherwise
+from deterministic synthetic data shaped like the real responses.
+Latency and error injection make it useful for exercising retries, rate
+limiting and throughput work without network access::
+
+    from pypums.api.client import configure_client
+    from pypums.api.stub import StubCensusServer
+
+    with StubCensusServer(latency=0.05, error_rate=0.01) as server:
+        configure_client(api_base=server.url)
+        df = get_acs("tract", "B19013_001", state="CA", county="*")
+
+It can also run standalone::
+
+    python -m pypums.api.stub --port 8000 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from pypums.api.cassette import Cassette
+from pypums.api.client import CENSUS_API_BASE
+from pypums.api.geography import GEOGRAPHY_HIERARCHY, _expand_states
+
+# Query parameters that are not predicates on the data.
+_RESERVED_PARAMS = frozenset({"get", "for", "in", "key", "ucgid"})
+
+# Code width of each geography level in synthetic responses.
+_CODE_WIDTHS = {
+    "us": 1,
+    "region": 1,
+    "division": 1,
+    "state": 2,
+    "county": 3,
+    "tract": 6,
+    "block group": 1,
+    "block": 4,
+    "congressional district": 2,
+    "combined statistical area": 3,
+}
+
+# Summary level codes reported by the synthetic ``geography.json``.
+_SUMMARY_LEVELS = {
+    "us": "010",
+    "region": "020",
+    "division": "030",
+    "state": "040",
+    "county": "050",
+    "county subdivision": "060",
+    "tract": "140",
+    "block group": "150",
+    "place": "160",
+    "congressional district": "500",
+    "zcta": "860",
+    "puma": "795",
+    "cbsa": "310",
+    "csa": "330",
+}
+
+# Synthetic values for wildcard predicates such as ``DATE_CODE=*``.
+_PREDICATE_VALUES = ("1", "2", "3")
+
+
+def _census_json(rows: list[list[str]]) -> bytes:
+    """Serialize rows the way the Census API does: compact, one per line."""
+    lines = [json.dumps(row, separators=(",", ":"), ensure_ascii=False) for row in rows]
+    return ("[" + ",\n".join(lines) + "]").encode("utf-8")
+
+
+def _number(*parts: object) -> str:
+    """A deterministic pseudo-random count for a cell."""
+    return str(zlib.crc32("|".join(map(str, parts)).encode()) % 100_000)
+
+
+class StubCensusServer:
+    """Serve Census-API-shaped responses from a local HTTP server.
+
+    Parameters
+    ----------
+    cassette
+        Recorded responses (a :class:`~pypums.api.cassette.Cassette` or its
+        directory) served in preference to synthetic data.
+    latency
+        Seconds to wait before answering each request.
+    error_rate
+        Fraction of requests (0-1) answered with *error_status* instead.
+    error_status
+        HTTP status used for injected errors (default 503).
+    retry_after
+        If set, injected errors carry this ``Retry-After`` header (seconds).
+    rows_per_geography
+        Synthetic sub-geographies returned for each wildcard level that
+        isn't a state or county (tracts, places, ...).
+    pums_records
+        Synthetic person records returned per state by ``/pums``.
+    seed
+        Seed for error injection, so runs are reproducible.
+    host, port
+        Address to bind.  Port 0 (default) picks a free port.
+    """
+
+    def __init__(
+        self,
+        *,
+        cassette: Cassette | str | Path | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        rows_per_geography: int = 25,
+        pums_records: int = 1000,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate!r}")
+        if cassette is not None and not isinstance(cassette, Cassette):
+            cassette = Cassette(cassette, mode="replay")
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.rows_per_geography = rows_per_geography
+        self.pums_records = pums_records
+        self.host = host
+        self.port = port
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "errors": 0, "replayed": 0}
+        self._server: ThreadingHTTPServer | None = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as ``configure_client(api_base=...)``."""
+        if self._server is None:
+            raise RuntimeError("StubCensusServer is not running; call start().")
+        return f"http://{self.host}:{self._server.server_address[1]}/data"
+
+    def start(self) -> "StubCensusServer":
+        """Start serving on a background thread."""
+        if self._server is None:
+            self._server = ThreadingHTTPServer((self.host, self.port), _handler(self))
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubCensusServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """Return request, injected-error and replayed counts."""
+        with self._lock:
+            return dict(self._counts)
+
+    # -- responses ---------------------------------------------------------
+
+    def respond(self, path: str, params: dict[str, str]) -> tuple[int, dict, bytes]:
+        """Build the ``(status, headers, body)`` answer for one request.
+
+        *path* is the URL path (``/data/2023/acs/acs5``); *params* the
+        decoded query string.  Injected latency and errors are applied by
+        the HTTP handler, not here.
+        """
+        if self.cassette is not None:
+            entry = self.cassette.load(
+                CENSUS_API_BASE + path.removeprefix("/data"), params
+            )
+            if entry is not None:
+                with self._lock:
+                    self._counts["replayed"] += 1
+                headers = {
+                    "Content-Type": entry.get("content_type", "application/json")
+                }
+                return entry["status"], headers, entry["body"].encode("utf-8")
+
+        json_headers = {"Content-Type": "application/json;charset=utf-8"}
+        if not path.startswith("/data/"):
+            return 404, {}, b"Not found"
+        if path.endswith("/variables.json"):
+            return 200, json_headers, json.dumps(self._variables()).encode()
+        if path.endswith("/geography.json"):
+            return 200, json_headers, json.dumps(self._geography()).encode()
+        if "for" not in params:
+            return 400, {}, b"error: missing 'for' clause"
+        try:
+            rows = self._rows(path, params)
+        except ValueError as exc:
+            return 400, {}, f"error: {exc}".encode()
+        return 200, json_headers, _census_json(rows)
+
+    def _variables(self) -> dict:
+        variables = {
+            "NAME": {"label": "Geographic Area Name", "concept": "", "group": "N/A"},
+        }
+        for i in range(1, 11):
+            for suffix, kind in (("E", "Estimate"), ("M", "Margin of Error")):
+                variables[f"B01001_{i:03d}{suffix}"] = {
+                    "label": f"{kind}!!Total:!!Group {i}",
+                    "concept": "Sex by Age",
+                    "predicateType": "int",
+                    "group": "B01001",
+                }
+        return {"variables": variables}
+
+    def _geography(self) -> dict:
+        fips = []
+        for name, spec in GEOGRAPHY_HIERARCHY.items():
+            fips.append(
+                {
+                    "name": name,
+                    "geoLevelDisplay": _SUMMARY_LEVELS.get(name, ""),
+                    "requires": [{"name": parent} for parent in spec["requires"]],
+                }
+            )
+        return {"fips": fips}
+
+    def _level_codes(self, level: str, wanted: str, parents: dict[str, str]) -> list:
+        """Codes for the ``for`` level; each is a dict of geography columns."""
+        if wanted != "*":
+            return [{level: code} for code in wanted.split(",")]
+        if level == "us":
+            return [{"us": "1"}]
+        if level == "state":
+            return [{"state": code} for code in _expand_states("*")]
+        if level == "county":
+            from pypums.datasets.fips import fips_codes
+
+            states = [parents["state"]] if "state" in parents else _expand_states("*")
+            rows = fips_codes[fips_codes["state_code"].isin(states)]
+            return [
+                {"state": s, "county": c}
+                for s, c in zip(rows["state_code"], rows["county_code"], strict=True)
+            ]
+        width = _CODE_WIDTHS.get(level, 5)
+        count = min(self.rows_per_geography, 10**width - 1)
+        return [
+            {level: f"{i * (10**width // (count + 1)):0{width}d}"}
+            for i in range(1, count + 1)
+        ]
+
+    def _rows(self, path: str, params: dict[str, str]) -> list[list[str]]:
+        year = path.split("/")[2]
+        level, _, wanted = params["for"].partition(":")
+        parents = dict(part.split(":", 1) for part in params.get("in", "").split())
+        get = []
+        for var in params.get("get", "").split(","):
+            if var.startswith("group(") and var.endswith(")"):
+                table = var[6:-1]
+                get += [f"{table}_{i:03d}{s}" for i in range(1, 4) for s in "EM"]
+            elif var:
+                get.append(var)
+
+        predicates = {
+            k: (_PREDICATE_VALUES if v == "*" else tuple(v.split(",")))
+            for k, v in params.items()
+            if k not in _RESERVED_PARAMS
+        }
+        extra = [k for k in predicates if k not in get]
+
+        codes = self._level_codes(level, wanted or "*", parents)
+        geos = [{**parents, **code} for code in codes]
+        # A national county pull also reports each county's state.
+        geo_cols = list(geos[0]) if geos else [*parents, level]
+        header = get + extra + geo_cols
+        if path.endswith("/pums"):
+            geos = [
+                {**geo, "_record": str(i)}
+                for geo in geos
+                for i in range(self.pums_records)
+            ]
+        for name, values in predicates.items():
+            geos = [{**geo, name: value} for geo in geos for value in values]
+
+        rows = [header]
+        for geo in geos:
+            geoid = "".join(geo[c] for c in geo_cols)
+            record = int(geo.get("_record", 0))
+            row = []
+            for var in get:
+                if var in predicates:
+                    row.append(geo[var])
+                elif var == "SERIALNO":
+                    row.append(f"{year}HU{geoid}{record // 3:07d}")
+                elif var == "SPORDER":
+                    row.append(str(record % 3 + 1))
+                elif var == "ST":
+                    row.append(geo.get("state", "06"))
+                elif var == "PUMA":
+                    row.append(f"{record % 50 * 100 + 100:05d}")
+                elif var == "GEO_ID":
+                    row.append(f"{_SUMMARY_LEVELS.get(level, '000')}0000US{geoid}")
+                elif "NAME" in var:
+                    row.append(f"{level.title()} {geoid}")
+                else:
+                    row.append(_number(var, geoid, record, *geo.values()))
+            row += [geo[name] for name in extra]
+            row += [geo[name] for name in geo_cols]
+            rows.append(row)
+        return rows
+
+    # -- fault injection ---------------------------------------------------
+
+    def _inject(self) -> tuple[int, dict, bytes] | None:
+        with self._lock:
+            self._counts["requests"] += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self._counts["errors"] += 1
+        if not failed:
+            return None
+        headers = {}
+        if self.retry_after is not None:
+            headers["Retry-After"] = str(int(self.retry_after))
+        return self.error_status, headers, b"error: injected failure"
+
+
+def _handler(stub: StubCensusServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Avoid Nagle/delayed-ACK stalls between the header and body writes.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):  # noqa: N802
+            if stub.latency:
+                time.sleep(stub.latency)
+            split = urlsplit(self.path)
+            answer = stub._inject() or stub.respond(
+                split.path, dict(parse_qsl(split.query, keep_blank_values=True))
+            )
+            status, headers, body = answer
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a stub server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local stub of the Census Data API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cassette", help="directory of recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args(argv)
+
+    server = StubCensusServer(
+        cassette=args.cassette,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        host=args.host,
+        port=args.port,
+    ).start()
+    print(f"Serving a stub Census API at {server.url} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
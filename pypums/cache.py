@@ -1,48 +1,1151 @@
-"""File-based caching for Census API responses and variable tables."""
+"""File-based caching for Census API responses and variable tables.
 
+Every :class:`CensusCache` reads through a process-wide, byte-bounded
+in-memory LRU tier (:class:`MemoryCache`) before touching disk, so frames
+loaded repeatedly by a long-lived process skip the file stat, metadata
+parse and Parquet decode.  Tune it with :func:`configure_memory_cache`.
+
+Entries are Parquet files by default, zstd-compressed and
+dictionary-encoded; ``compact=True`` additionally narrows integer and float
+columns and stores repeated strings as Arrow dictionaries, both undone on
+read.  ``format="arrow"`` stores entries as uncompressed Arrow IPC files
+that are memory-mapped on read.
+
+Each directory's entries are tracked in a SQLite index recording the key,
+request parameters, size, TTL, hit count and last access.  Writes go to a
+temporary file that is atomically renamed into place, and
+:meth:`CensusCache.get_or_fetch` takes a per-key file lock so that when
+several processes share a directory each cold key is fetched only once
+while the others wait for it.
+
+How the ``get_*`` functions use the cache is set per call with ``cache=``
+or process-wide with :func:`configure_cache_policy`: ``"refresh"``
+re-fetches and overwrites, ``"stale-ok"`` serves expired entries at once
+and refreshes them on a background thread pool, ``"offline"`` never calls
+the API (raising :class:`CacheMiss` when nothing is cached) and
+``"bypass"`` ignores the cache entirely.
+
+The disk tier can be held to a byte budget (see
+:func:`configure_disk_cache`): writes past the budget evict entries by
+least recent use (``"lru"``) or fewest hits (``"lfu"``), and
+:meth:`CensusCache.sweep` removes expired entries in bulk.  Lookup hits
+and misses are tallied per dataset for :meth:`CensusCache.stats`.
+
+:func:`export_cache` packs selected entries into one compressed bundle
+with a manifest and :func:`import_cache` unpacks it into another machine's
+cache.  A cache opened ``read_only`` (see :func:`configure_disk_cache`)
+never writes to its directory and never calls the API, so a fleet of
+machines can share one prebuilt cache.
+"""
+
+import asyncio
+import atexit
+import base64
+import contextlib
 import hashlib
+import io
 import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import threading
 import time
-from pathlib import Path
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from pypums.api.client import aclose_client
+from pypums.instrumentation import emit, metrics, stage
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 _CACHE_DATA_SUFFIX = ".parquet"
 _CACHE_META_SUFFIX = ".meta.json"
 
+# On-disk formats of cached frames and their file suffixes.
+CACHE_FORMATS = {"parquet": _CACHE_DATA_SUFFIX, "arrow": ".arrow"}
+
+_CACHE_INDEX_FILE = "index.db"
+_CACHE_LOCK_DIR = "locks"
+
+# Hit counts and access times are batched in memory and written to the
+# index at most this often (and on writes, queries and exit), keeping
+# SQLite write transactions off the read path.
+_INDEX_FLUSH_SECONDS = 5.0
+
+# How long a process waits for another one to fill a key before fetching it
+# itself.
+_LOCK_TIMEOUT_SECONDS = 600.0
+
+# Layout version of the bundles written by :func:`export_cache`.
+_BUNDLE_FORMAT = 1
+_BUNDLE_MANIFEST = "manifest.json"
+
+# Per-directory lookup counts kept before the SQLite index existed.
+_LEGACY_STATS_FILE = "stats.json"
+
+# Root of every pypums cache directory.
+CACHE_ROOT = Path.home() / ".pypums" / "cache"
+
+# Default byte budget of the shared in-memory tier (256 MiB).
+_DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+
+# Disk eviction policies: index ``ORDER BY`` clause, evicted first.
+_EVICTION_ORDER = {
+    "lru": "last_access",
+    "lfu": "hits, last_access",
+}
+
+# Byte budget and eviction policy applied to every disk cache by default.
+_disk_options: dict = {
+    "max_bytes": None,
+    "policy": "lru",
+    "read_only": False,
+    "format": "parquet",
+    "compression": "zstd",
+    "compression_level": None,
+    "dictionary": True,
+    "compact": False,
+}
+
+# Parquet compression codecs accepted for cache entries.
+PARQUET_CODECS = ("zstd", "snappy", "gzip", "brotli", "lz4", "none")
+
+# Parquet schema metadata holding what ``compact`` writes changed, so reads
+# can restore the frame exactly.
+_COMPACT_METADATA = b"pypums.compact"
+
+# Parquet schema metadata holding the categories of categorical columns.
+_CATEGORIES_METADATA = b"pypums.categories"
+
+# String columns with at most this share of distinct values are stored as
+# dictionaries by ``compact`` writes.
+_COMPACT_DISTINCT_RATIO = 0.5
+
+# Narrowest lossless integer type for a ``compact`` write, tried in order.
+_COMPACT_INT_TYPES = (pa.int8(), pa.int16(), pa.int32())
+
+# How ``get_*`` calls use the cache; see :func:`configure_cache_policy`.
+CACHE_POLICIES = ("default", "refresh", "stale-ok", "offline", "bypass")
+
+# The policy used when a ``get_*`` call passes ``cache=None``.
+_policy_options: dict = {"policy": "default"}
+
+# Worker threads refreshing stale entries under the "stale-ok" policy.
+_REVALIDATION_WORKERS = 4
+
+_revalidation_pool: ThreadPoolExecutor | None = None
+_revalidating: dict[tuple[str, str], Future] = {}
+_revalidation_lock = threading.Lock()
+
+# Cache keys start with a dataset prefix followed by the year, e.g.
+# ``acs_2023_...`` or ``pums_vars_2023_...``.
+_DATASET_PREFIX = re.compile(r"^([A-Za-z][A-Za-z0-9]*(?:_[A-Za-z][A-Za-z0-9]*)*)_\d")
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    """Approximate in-memory size of a frame, including string payloads."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class MemoryCache:
+    """Thread-safe LRU of DataFrames bounded by their total size in bytes.
+
+    Entries are keyed like the disk tier (cache directory plus the hashed
+    key) and honor the same TTL.  Frames are copied on the way in and out
+    so callers can't mutate a cached entry.
+
+    Parameters
+    ----------
+    max_bytes
+        Byte budget; least recently used entries are evicted to stay under
+        it.  Frames larger than the budget are not kept.  ``0`` disables
+        the tier.
+
+    Examples
+    --------
+    >>> memory = MemoryCache(max_bytes=1_000_000)
+    >>> memory.put(("dir", "k"), pd.DataFrame({"a": [1, 2]}))
+    >>> memory.get(("dir", "k"))["a"].tolist()
+    [1, 2]
+    >>> memory.stats()["hits"]
+    1
+    """
+
+    def __init__(self, max_bytes: int = _DEFAULT_MEMORY_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes!r}")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (frame, expires_at, nbytes), least recently used first.
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._bytes = 0
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        """Return a copy of the cached frame, or ``None`` if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and time.time() > entry[1]:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+            df = entry[0]
+        return df.copy()
+
+    def put(
+        self, key: tuple, df: pd.DataFrame, expires_at: float | None = None
+    ) -> None:
+        """Store a copy of *df*, evicting least recently used entries."""
+        nbytes = _frame_nbytes(df)
+        with self._lock:
+            self._drop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (df.copy(), expires_at, nbytes)
+            self._bytes += nbytes
+            self._evict()
+
+    def discard(self, predicate: Callable[[tuple], bool]) -> None:
+        """Remove every entry whose key satisfies *predicate*."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._drop(key)
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting entries as needed."""
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes!r}")
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit, miss and eviction counts plus current size."""
+        with self._lock:
+            return {
+                **self._counts,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._bytes -= nbytes
+            self._counts["evictions"] += 1
+
+
+_memory_cache = MemoryCache()
+
+
+def configure_memory_cache(max_bytes: int = _DEFAULT_MEMORY_BYTES) -> MemoryCache:
+    """Set the byte budget of the shared in-memory tier.
+
+    Parameters
+    ----------
+    max_bytes
+        Total size of cached frames kept in memory (default 256 MiB).
+        ``0`` disables the tier.
+
+    Returns
+    -------
+    MemoryCache
+        The shared in-memory tier.
+    """
+    _memory_cache.resize(max_bytes)
+    return _memory_cache
+
+
+def memory_cache_stats() -> dict:
+    """Return statistics of the shared in-memory tier.
+
+    Examples
+    --------
+    >>> from pypums.cache import memory_cache_stats
+    >>> sorted(memory_cache_stats())
+    ['bytes', 'entries', 'evictions', 'hits', 'max_bytes', 'misses']
+    """
+    return _memory_cache.stats()
+
+
+def _check_policy(policy: str) -> None:
+    if policy not in _EVICTION_ORDER:
+        raise ValueError(
+            f"policy must be one of {sorted(_EVICTION_ORDER)}, got {policy!r}"
+        )
+
+
+def _check_format(format: str) -> None:
+    if format not in CACHE_FORMATS:
+        raise ValueError(
+            f"format must be one of {sorted(CACHE_FORMATS)}, got {format!r}"
+        )
+
+
+def _check_compression(compression: str, compression_level: int | None) -> None:
+    if compression not in PARQUET_CODECS:
+        raise ValueError(
+            f"compression must be one of {PARQUET_CODECS}, got {compression!r}"
+        )
+    if compression_level is not None and compression in ("snappy", "lz4", "none"):
+        raise ValueError(f"{compression} compression does not take a level")
+
+
+def _compact_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Return *column* in a smaller type it can be cast back from exactly."""
+    if len(column) == 0 or column.null_count == len(column):
+        return column
+    kind = column.type
+    if pa.types.is_signed_integer(kind):
+        bounds = pc.min_max(column)
+        low, high = bounds["min"].as_py(), bounds["max"].as_py()
+        for narrow in _COMPACT_INT_TYPES:
+            if narrow.bit_width >= kind.bit_width:
+                break
+            if _fits(low, high, narrow):
+                return column.cast(narrow)
+        return column
+    if pa.types.is_float64(kind):
+        narrow = column.cast(pa.float32(), safe=False)
+        # Only when every value survives the round trip.
+        if pc.all(pc.equal(narrow.cast(pa.float64()), column)).as_py():
+            return narrow
+        return column
+    is_string = pa.types.is_string(kind) or pa.types.is_large_string(kind)
+    if (
+        is_string
+        and pc.count_distinct(column).as_py() <= len(column) * _COMPACT_DISTINCT_RATIO
+    ):
+        return pc.dictionary_encode(column)
+    return column
+
+
+def _fits(low: int, high: int, kind: pa.DataType) -> bool:
+    limit = 2 ** (kind.bit_width - 1)
+    return -limit <= low and high < limit
+
+
+def _compact_table(table: pa.Table) -> pa.Table:
+    """Narrow *table*'s columns, recording their types in its metadata."""
+    columns = [_compact_column(column) for column in table.columns]
+    changed = [
+        field
+        for field, column in zip(table.schema, columns, strict=True)
+        if column.type != field.type
+    ]
+    if not changed:
+        return table
+    original = pa.schema(changed).serialize().to_pybytes()
+    metadata = {
+        **(table.schema.metadata or {}),
+        _COMPACT_METADATA: base64.b64encode(original),
+    }
+    return pa.table(columns, names=table.column_names).replace_schema_metadata(metadata)
+
+
+def _restore_table(table: pa.Table) -> pa.Table:
+    """Cast the columns narrowed by :func:`_compact_table` back."""
+    raw = (table.schema.metadata or {}).get(_COMPACT_METADATA)
+    if raw is None:
+        return table
+    original = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(raw)))
+    fields = [
+        original.field(field.name) if field.name in original.names else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _categories(df: pd.DataFrame) -> dict:
+    """Categories of *df*'s categorical columns, where JSON keeps them exact."""
+    recorded = {}
+    for name, column in df.items():
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            continue
+        categories = column.cat.categories
+        if categories.dtype.kind in "iu" or all(
+            isinstance(value, str) for value in categories
+        ):
+            recorded[str(name)] = {
+                "values": categories.tolist(),
+                "dtype": str(categories.dtype),
+                "ordered": bool(column.cat.ordered),
+            }
+    return recorded
+
+
+def _write_frame(
+    df: pd.DataFrame,
+    path: str | Path,
+    format: str,
+    compression: str = "zstd",
+    compression_level: int | None = None,
+    dictionary: bool = True,
+    compact: bool = False,
+) -> None:
+    geopandas = sys.modules.get("geopandas")
+    if geopandas is not None and isinstance(df, geopandas.GeoDataFrame):
+        if format != "parquet":
+            raise ValueError("GeoDataFrames can only be cached as Parquet")
+        # GeoParquet: geometries as WKB plus the CRS in the file metadata.
+        # Plain reads return the WKB bytes.
+        df.to_parquet(
+            path,
+            compression=compression,
+            compression_level=compression_level,
+            use_dictionary=dictionary,
+        )
+        return
+    table = pa.Table.from_pandas(df)
+    if format == "arrow":
+        # Uncompressed, so readers can map the buffers straight from disk.
+        with (
+            pa.OSFile(str(path), "wb") as sink,
+            pa.ipc.new_file(sink, table.schema) as writer,
+        ):
+            writer.write_table(table)
+        return
+    if compact:
+        table = _compact_table(table)
+    categories = _categories(df)
+    if categories:
+        # Parquet keeps only the categories in use, in order of appearance.
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                _CATEGORIES_METADATA: json.dumps(categories),
+            }
+        )
+    pq.write_table(
+        table,
+        path,
+        compression=compression,
+        compression_level=compression_level,
+        use_dictionary=dictionary,
+    )
+
+
+def _read_frame(
+    path: Path, format: str, columns: list[str] | None = None
+) -> pd.DataFrame:
+    if format != "arrow":
+        table = pq.read_table(path, columns=columns, use_pandas_metadata=True)
+        df = _restore_table(table).to_pandas()
+        raw = (table.schema.metadata or {}).get(_CATEGORIES_METADATA)
+        for name, category in json.loads(raw or "{}").items():
+            if name in df.columns:
+                # Integer categories may come back as plain integers.
+                df[name] = df[name].astype(
+                    pd.CategoricalDtype(
+                        pd.Index(category["values"], dtype=category["dtype"]),
+                        ordered=category["ordered"],
+                    )
+                )
+        return df
+    # The memory map is shared with every process reading the same file
+    # through the page cache; only the selected columns' pages are touched.
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        index = (table.schema.pandas_metadata or {}).get("index_columns", [])
+        table = table.select([*columns, *(c for c in index if isinstance(c, str))])
+    return table.to_pandas()
+
+
+def configure_disk_cache(
+    max_bytes: int | None = None,
+    policy: str = "lru",
+    read_only: bool = False,
+    format: str = "parquet",
+    compression: str = "zstd",
+    compression_level: int | None = None,
+    dictionary: bool = True,
+    compact: bool = False,
+) -> None:
+    """Set the default byte budget, eviction policy and mode of disk caches.
+
+    Applies to every :class:`CensusCache` created afterwards without its
+    own ``max_bytes``/``policy``/``read_only``/``format`` or Parquet
+    options, including the ones behind the ``get_*`` functions.
+
+    Parameters
+    ----------
+    max_bytes
+        Maximum total size of a cache directory's data files.  ``None``
+        (default) means unbounded.
+    policy
+        ``"lru"`` evicts the least recently used entries first, ``"lfu"``
+        the least frequently used.
+    read_only
+        If True, open cache directories read-only (see :class:`CensusCache`):
+        nothing is written to them and cached ``get_*`` calls never call
+        the API, so many machines can share one prebuilt cache.
+    format
+        File format of newly written entries: ``"parquet"`` (compact) or
+        ``"arrow"`` (uncompressed Arrow IPC, memory-mapped on read; see
+        :class:`CensusCache`).
+    compression
+        Parquet codec, one of :data:`PARQUET_CODECS` (default ``"zstd"``).
+    compression_level
+        Codec level, e.g. 1-22 for zstd; ``None`` uses the codec's default.
+    dictionary
+        If True (default), dictionary-encode Parquet columns, so repeated
+        values such as ``GEOID``, ``NAME`` and ``variable`` are stored once
+        per row group.
+    compact
+        If True, also narrow integer and float columns to the smallest type
+        holding their values exactly and store repeated strings as Arrow
+        dictionaries.  Reads cast them back, so cached frames come back
+        with their original dtypes.
+    """
+    if max_bytes is not None and max_bytes < 0:
+        raise ValueError(f"max_bytes must be >= 0, got {max_bytes!r}")
+    _check_policy(policy)
+    _check_format(format)
+    _check_compression(compression, compression_level)
+    _disk_options.update(
+        max_bytes=max_bytes,
+        policy=policy,
+        read_only=read_only,
+        format=format,
+        compression=compression,
+        compression_level=compression_level,
+        dictionary=dictionary,
+        compact=compact,
+    )
+
+
+class CacheMiss(LookupError):
+    """Raised under the ``"offline"`` cache policy when nothing is cached."""
+
+
+def resolve_cache_policy(policy: str | None = None) -> str:
+    """Validate a ``cache=`` argument; ``None`` means the configured policy."""
+    if policy is None:
+        return _policy_options["policy"]
+    if policy not in CACHE_POLICIES:
+        raise ValueError(f"cache must be one of {CACHE_POLICIES}, got {policy!r}")
+    return policy
+
+
+def configure_cache_policy(policy: str = "default") -> None:
+    """Set the cache policy of ``get_*`` calls that don't pass ``cache=``.
+
+    Parameters
+    ----------
+    policy
+        ``"default"``
+            Read and write the cache when ``cache_table=True``.
+        ``"refresh"``
+            Always call the API and overwrite the cached entry.
+        ``"stale-ok"``
+            Return cached entries even after their TTL, refreshing expired
+            ones on a background thread pool.  Misses are fetched as usual.
+        ``"offline"``
+            Only read the cache (expired entries included); never call the
+            API, and raise :class:`CacheMiss` when nothing is cached.
+        ``"bypass"``
+            Neither read nor write the cache.
+
+        Every policy except ``"default"`` and ``"bypass"`` uses the cache
+        even when ``cache_table=False``, so pinning a job to ``"offline"``
+        covers every call it makes.
+
+    Examples
+    --------
+    >>> from pypums.cache import configure_cache_policy
+    >>> configure_cache_policy("offline")  # doctest: +SKIP
+    """
+    _policy_options["policy"] = resolve_cache_policy(policy)
+
+
+def _finish_revalidation(token: tuple[str, str], future: Future) -> None:
+    with _revalidation_lock:
+        _revalidating.pop(token, None)
+    result = "error" if future.exception() is not None else "ok"
+    metrics.increment("cache_revalidations_total", result=result)
+
+
+def _revalidate(directory: Path, key: str, refresh: Callable[[], object]) -> None:
+    """Run *refresh* on the background pool unless *key* is already queued."""
+    global _revalidation_pool
+    token = (str(directory), key)
+    with _revalidation_lock:
+        if token in _revalidating:
+            return
+        if _revalidation_pool is None:
+            _revalidation_pool = ThreadPoolExecutor(
+                max_workers=_REVALIDATION_WORKERS,
+                thread_name_prefix="pypums-revalidate",
+            )
+        future = _revalidation_pool.submit(refresh)
+        _revalidating[token] = future
+    future.add_done_callback(partial(_finish_revalidation, token))
+
+
+def wait_for_revalidation(timeout: float | None = None) -> bool:
+    """Wait for background refreshes started by the ``"stale-ok"`` policy.
+
+    Returns True if all of them finished within *timeout* seconds.  The
+    interpreter also waits for them at exit.
+    """
+    with _revalidation_lock:
+        pending = list(_revalidating.values())
+    _, not_done = wait_futures(pending, timeout)
+    return not not_done
+
+
+def parse_size(size: str | int) -> int:
+    """Parse a byte count such as ``"500MB"`` or ``"2 GiB"``.
+
+    Examples
+    --------
+    >>> parse_size("500MB"), parse_size("1.5 GiB"), parse_size(1024)
+    (500000000, 1610612736, 1024)
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)(I?)B?\s*", size.upper())
+    if match is None:
+        raise ValueError(f"Invalid size {size!r}; expected e.g. '500MB' or '2GiB'.")
+    number, unit, binary = match.groups()
+    base = 1024 if binary else 1000
+    return int(float(number) * base ** " KMGT".index(unit or " "))
+
+
+def cache_directories(root: Path = CACHE_ROOT) -> list[Path]:
+    """Return *root* and its subdirectories that hold cache entries."""
+    root = Path(root)
+    found = {path.parent for path in root.rglob(_CACHE_INDEX_FILE)}
+    found |= {path.parent for path in root.rglob(f"*{_CACHE_META_SUFFIX}")}
+    return sorted(found)
+
+
+def _dataset_of(key: str, directory: Path) -> str:
+    """Name the dataset a key belongs to, falling back to its directory."""
+    match = _DATASET_PREFIX.match(key)
+    return match.group(1) if match else directory.name
+
+
+def _expires_at(created_at: float, ttl_seconds: float | None) -> float | None:
+    return None if ttl_seconds is None else created_at + ttl_seconds
+
+
+class _KeyLock:
+    """An exclusive lock on a file, shared by threads and processes.
+
+    ``flock`` (or ``msvcrt.locking`` on Windows) locks belong to the open
+    file, so two threads of one process exclude each other as well, and a
+    crashed holder's lock is released by the OS.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def acquire(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds for the lock; return whether it's held."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")  # noqa: SIM115 - held until release()
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    params TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    ttl_seconds REAL,
+    expires_at REAL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    columns TEXT,
+    format TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_dataset ON entries (dataset);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE TABLE IF NOT EXISTS lookups (
+    dataset TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_ENTRY_COLUMNS = (
+    "name, key, dataset, params, size, created_at, ttl_seconds, expires_at, "
+    "last_access, hits, columns, format"
+)
+_ENTRY_VALUES = ", ".join("?" * len(_ENTRY_COLUMNS.split(",")))
+
+
+class _CacheIndex:
+    """SQLite index of one cache directory's entries and lookup counts.
+
+    Each thread gets its own connection; SQLite serializes writers across
+    threads and processes.  Lookups and entry hits are tallied in memory
+    and written by :meth:`flush`, so reads don't take the write lock.  A
+    *read_only* index opens the database read-only (as immutable unless a
+    writer left rows in its ``-wal`` file) and ignores every write (hit
+    counts, access times, entries).
+    """
+
+    def __init__(self, directory: Path, read_only: bool = False) -> None:
+        self.directory = directory
+        self.path = directory / _CACHE_INDEX_FILE
+        self.read_only = read_only
+        self._local = threading.local()
+        self._pending: dict[str, list[int]] = {}
+        self._touched: dict[str, list[float]] = {}
+        self._pending_lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        if read_only:
+            return
+        with self.connect() as db:
+            db.executescript(_SCHEMA)
+            existing = {row["name"] for row in db.execute("PRAGMA table_info(entries)")}
+            for column in ("columns", "format"):
+                if column not in existing:
+                    db.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+        self._import_legacy()
+
+    def connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            if self.read_only:
+                db = self._connect_read_only()
+            else:
+                db = sqlite3.connect(self.path, timeout=30)
+                db.row_factory = sqlite3.Row
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _connect_read_only(self) -> sqlite3.Connection:
+        if self.path.exists():
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            wal = self.path.with_name(f"{self.path.name}-wal")
+            if not (wal.exists() and wal.stat().st_size):
+                # immutable: no locks, -wal or -shm files, so the directory
+                # may sit on a read-only mount.  Rows still in a -wal file
+                # would be invisible, so it is only used without one.
+                uri += "&immutable=1"
+            db = sqlite3.connect(uri, uri=True)
+        else:
+            db = sqlite3.connect(":memory:")
+        db.row_factory = sqlite3.Row
+        tables = {
+            row["name"]
+            for row in db.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        if "entries" not in tables:
+            # No index yet: read as empty.
+            db.executescript(_SCHEMA.replace("CREATE TABLE", "CREATE TEMP TABLE"))
+            return db
+        if "lookups" not in tables:
+            db.execute(
+                "CREATE TEMP TABLE lookups (dataset TEXT PRIMARY KEY, "
+                "hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0)"
+            )
+        existing = {row["name"] for row in db.execute("PRAGMA table_info(entries)")}
+        missing = [c for c in ("columns", "format") if c not in existing]
+        if missing:
+            # An index written by an older version can't be migrated in
+            # place; a temporary view adds the missing columns instead.
+            added = ", ".join(f"NULL AS {column}" for column in missing)
+            db.execute(
+                f"CREATE TEMP VIEW entries AS SELECT *, {added} FROM main.entries"
+            )
+        return db
+
+    def _import_legacy(self) -> None:
+        """Move ``*.meta.json`` sidecars and ``stats.json`` into the index."""
+        rows = []
+        for meta_path in self.directory.glob(f"*{_CACHE_META_SUFFIX}"):
+            name = meta_path.name[: -len(_CACHE_META_SUFFIX)]
+            try:
+                meta = json.loads(meta_path.read_text())
+                stat = (self.directory / f"{name}{_CACHE_DATA_SUFFIX}").stat()
+            except (FileNotFoundError, ValueError):
+                meta_path.unlink(missing_ok=True)
+                continue
+            key = meta.get("key")
+            created_at = meta.get("created_at", stat.st_mtime)
+            ttl = meta.get("ttl_seconds")
+            rows.append(
+                (
+                    name,
+                    key or name,
+                    meta.get("dataset")
+                    or (
+                        _dataset_of(key, self.directory) if key else self.directory.name
+                    ),
+                    None,
+                    stat.st_size,
+                    created_at,
+                    ttl,
+                    _expires_at(created_at, ttl),
+                    meta.get("last_access", stat.st_mtime),
+                    meta.get("hits", 0),
+                    None,
+                    None,
+                )
+            )
+        stats_path = self.directory / _LEGACY_STATS_FILE
+        try:
+            legacy_lookups = json.loads(stats_path.read_text())
+        except (FileNotFoundError, ValueError):
+            legacy_lookups = {}
+        if not rows and not legacy_lookups:
+            return
+        with self.connect() as db:
+            db.executemany(
+                f"INSERT OR IGNORE INTO entries ({_ENTRY_COLUMNS}) "
+                f"VALUES ({_ENTRY_VALUES})",
+                rows,
+            )
+        for dataset, counts in legacy_lookups.items():
+            self.count(dataset, counts.get("hits", 0), counts.get("misses", 0))
+        self.flush()
+        for row in rows:
+            (self.directory / f"{row[0]}{_CACHE_META_SUFFIX}").unlink(missing_ok=True)
+        stats_path.unlink(missing_ok=True)
+
+    def lookup(self, name: str) -> sqlite3.Row | None:
+        return (
+            self.connect()
+            .execute(f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE name = ?", (name,))
+            .fetchone()
+        )
+
+    def touch(self, name: str) -> None:
+        """Tally a hit on entry *name* in memory; :meth:`flush` writes it."""
+        if self.read_only:
+            return
+        with self._pending_lock:
+            touched = self._touched.setdefault(name, [0, 0.0])
+            touched[0] += 1
+            touched[1] = time.time()
+        self._flush_if_due()
+
+    def upsert(self, row: tuple) -> None:
+        if self.read_only:
+            return
+        self.flush()
+        with self.connect() as db:
+            db.execute(
+                f"INSERT OR REPLACE INTO entries ({_ENTRY_COLUMNS}) "
+                f"VALUES ({_ENTRY_VALUES})",
+                row,
+            )
+
+    def delete(self, names: list[str]) -> None:
+        if self.read_only:
+            return
+        self.flush()
+        with self.connect() as db:
+            db.executemany("DELETE FROM entries WHERE name = ?", [(n,) for n in names])
+
+    def select(self, where: str = "", args: tuple = (), order: str = "") -> list:
+        self.flush()
+        sql = f"SELECT {_ENTRY_COLUMNS} FROM entries"
+        if where:
+            sql += f" WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        return self.connect().execute(sql, args).fetchall()
+
+    def count(self, dataset: str, hits: int = 0, misses: int = 0) -> None:
+        """Tally lookups in memory; :meth:`flush` writes them."""
+        if self.read_only:
+            return
+        with self._pending_lock:
+            counts = self._pending.setdefault(dataset, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+        self._flush_if_due()
+
+    def _flush_if_due(self) -> None:
+        if time.monotonic() - self._flushed_at >= _INDEX_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the lookups and entry hits tallied since the last flush."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+            self._flushed_at = time.monotonic()
+        if not (pending or touched):
+            return
+        with self.connect() as db:
+            db.executemany(
+                "INSERT INTO lookups (dataset, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT (dataset) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(dataset, h, m) for dataset, (h, m) in pending.items()],
+            )
+            db.executemany(
+                "UPDATE entries SET hits = hits + ?, "
+                "last_access = MAX(last_access, ?) WHERE name = ?",
+                [(hits, at, name) for name, (hits, at) in touched.items()],
+            )
+
+    def checkpoint(self) -> None:
+        """Write lookups and move the ``-wal`` file's rows into the index.
+
+        Read-only openers then see every entry without the ``-wal`` file.
+        """
+        if self.read_only:
+            return
+        self.flush()
+        self.connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def lookups(self) -> dict[str, tuple[int, int]]:
+        self.flush()
+        rows = self.connect().execute("SELECT dataset, hits, misses FROM lookups")
+        return {row["dataset"]: (row["hits"], row["misses"]) for row in rows}
+
+
+_indexes: dict[tuple[str, bool], _CacheIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_for(directory: Path, read_only: bool = False) -> _CacheIndex:
+    """Return the shared index of *directory*, opening it on first use."""
+    resolved = directory.resolve()
+    token = (str(resolved), read_only)
+    with _indexes_lock:
+        index = _indexes.get(token)
+        if index is None or not (read_only or index.path.exists()):
+            index = _indexes[token] = _CacheIndex(resolved, read_only)
+        return index
+
+
+@atexit.register
+def _flush_all_lookups() -> None:
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        # The directory may have been removed since the lookups.
+        with contextlib.suppress(sqlite3.Error):
+            index.checkpoint()
+
+
+def _entry(row: sqlite3.Row, now: float) -> dict:
+    return {
+        "name": row["name"],
+        "key": row["key"],
+        "dataset": row["dataset"],
+        "params": json.loads(row["params"]) if row["params"] else None,
+        "size": row["size"],
+        "created_at": row["created_at"],
+        "last_access": row["last_access"],
+        "hits": row["hits"],
+        "columns": json.loads(row["columns"]) if row["columns"] else None,
+        "format": row["format"] or "parquet",
+        "expired": row["expires_at"] is not None and now > row["expires_at"],
+    }
+
+
+def _json_value(value: object) -> object:
+    """Match a Python value against ``json_extract`` output."""
+    if isinstance(value, list | tuple | dict):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
 
 class CensusCache:
     """Cache Census API responses with optional TTL.
 
-    Uses Parquet for DataFrame serialization (safe to deserialize from
-    untrusted sources, unlike pickle).
+    Uses Parquet for DataFrame serialization by default (safe to
+    deserialize from untrusted sources, unlike pickle).  With
+    ``format="arrow"`` entries are written as uncompressed Arrow IPC
+    (Feather v2) files instead, which are larger on disk but memory-mapped
+    on read: loading skips decompression and decoding, pages are shared
+    across processes through the OS page cache, and a column-pruned read
+    only touches the requested columns.  Entry metadata -- key, request
+    parameters, size, TTL, hit count and last access -- lives in one
+    SQLite index per directory (``index.db``), so lookups are a single
+    primary-key read and listing or pruning never scans the directory.
 
     Parameters
     ----------
     cache_dir
         Directory to store cached files.
+    memory
+        If True (default), read through the shared in-memory LRU tier.
+    max_bytes
+        Byte budget of this directory, enforced after each write.
+        Defaults to the value set with :func:`configure_disk_cache`.
+    policy
+        ``"lru"`` or ``"lfu"`` eviction.  Defaults to the value set with
+        :func:`configure_disk_cache`.
+    read_only
+        If True, never write to *cache_dir*: :meth:`set` and removals are
+        skipped, hit counts are not recorded, expired entries are still
+        served, and :meth:`get_or_fetch` behaves as under the ``"offline"``
+        policy (except for ``"bypass"``).  The directory may sit on a
+        read-only mount.  Defaults to the value set with
+        :func:`configure_disk_cache`.
+    format
+        ``"parquet"`` or ``"arrow"``: the file format of entries written by
+        this instance.  Entries in either format are read regardless.
+        Defaults to the value set with :func:`configure_disk_cache`.
+    compression, compression_level, dictionary, compact
+        Parquet write options (see :func:`configure_disk_cache`); each
+        defaults to the configured value.  Entries written with any options
+        are read back the same way.
     """
 
-    def __init__(self, cache_dir: Path) -> None:
+    def __init__(
+        self,
+        cache_dir: Path,
+        memory: bool = True,
+        max_bytes: int | None = None,
+        policy: str | None = None,
+        read_only: bool | None = None,
+        format: str | None = None,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        dictionary: bool | None = None,
+        compact: bool | None = None,
+    ) -> None:
         self._dir = Path(cache_dir)
-        self._dir.mkdir(parents=True, exist_ok=True)
+        self.read_only = _disk_options["read_only"] if read_only is None else read_only
+        if not self.read_only:
+            self._dir.mkdir(parents=True, exist_ok=True)
+        self._index = _index_for(self._dir, self.read_only)
+        self._memory = _memory_cache if memory else None
+        self.max_bytes = _disk_options["max_bytes"] if max_bytes is None else max_bytes
+        self.policy = _disk_options["policy"] if policy is None else policy
+        _check_policy(self.policy)
+        self.format = _disk_options["format"] if format is None else format
+        _check_format(self.format)
+        given = {
+            "compression": compression,
+            "compression_level": compression_level,
+            "dictionary": dictionary,
+            "compact": compact,
+        }
+        self._parquet = {
+            name: _disk_options[name] if value is None else value
+            for name, value in given.items()
+        }
+        if compression is not None and compression_level is None:
+            # The configured level belongs to the configured codec.
+            self._parquet["compression_level"] = None
+        _check_compression(
+            self._parquet["compression"], self._parquet["compression_level"]
+        )
 
     @staticmethod
     def _safe_name(key: str) -> str:
         """Hash the key to produce a safe, fixed-length filename."""
         return hashlib.sha256(key.encode()).hexdigest()
 
-    def _data_path(self, key: str) -> Path:
-        return self._dir / f"{self._safe_name(key)}{_CACHE_DATA_SUFFIX}"
+    def _data_path(self, key: str, format: str | None = None) -> Path:
+        suffix = CACHE_FORMATS[format or self.format]
+        return self._dir / f"{self._safe_name(key)}{suffix}"
+
+    def _replace_file(self, key: str, format: str, write: Callable[[str], None]) -> int:
+        """Write an entry's file with *write* atomically; return its size."""
+        data_path = self._data_path(key, format)
+        # Write beside the target and rename, so readers in other processes
+        # see the old file or the new one, never a torn one.
+        fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, data_path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        # Drop a copy of the entry left behind in another format.
+        for other in CACHE_FORMATS:
+            if other != format:
+                self._data_path(key, other).unlink(missing_ok=True)
+        size = data_path.stat().st_size
+        metrics.increment("cache_bytes_written_total", size)
+        return size
 
-    def _meta_path(self, key: str) -> Path:
-        return self._dir / f"{self._safe_name(key)}{_CACHE_META_SUFFIX}"
+    def _memory_key(self, key: str) -> tuple[str, str]:
+        return (str(self._index.directory), self._safe_name(key))
 
     def set(
         self,
         key: str,
         df: pd.DataFrame,
         ttl_seconds: int | float | None = None,
+        params: dict | None = None,
     ) -> None:
         """Store a DataFrame in the cache.
 
@@ -54,34 +1157,689 @@ class CensusCache:
             DataFrame to cache.
         ttl_seconds
             Time-to-live in seconds. ``None`` means no expiration.
+        params
+            Request parameters that produced *df* (year, geography, ...),
+            recorded in the index for :meth:`find`.  Ignored when the cache
+            is read-only.
+        """
+        if self.read_only:
+            return
+        with stage("cache_write", cache_dir=str(self._dir)):
+            size = self._replace_file(
+                key,
+                self.format,
+                partial(_write_frame, df, format=self.format, **self._parquet),
+            )
+        now = time.time()
+        expires_at = _expires_at(now, ttl_seconds)
+        self._index.upsert(
+            (
+                self._safe_name(key),
+                key,
+                _dataset_of(key, self._dir),
+                json.dumps(params, sort_keys=True, default=str) if params else None,
+                size,
+                now,
+                ttl_seconds,
+                expires_at,
+                now,
+                0,
+                json.dumps([str(c) for c in df.columns]),
+                self.format,
+            )
+        )
+        if self._memory is not None:
+            self._memory.put(self._memory_key(key), df, expires_at)
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes)
+
+    def get(
+        self, key: str, columns: list[str] | None = None, stale: bool = False
+    ) -> pd.DataFrame | None:
+        """Retrieve a cached DataFrame, or ``None`` if missing/expired.
+
+        The in-memory tier is checked before disk, and disk hits are
+        promoted into it.  Emits ``on_cache_hit`` (with ``tier``) or
+        ``on_cache_miss`` (see :mod:`pypums.instrumentation`).
+
+        Parameters
+        ----------
+        key
+            Cache key identifier.
+        columns
+            Read only these columns, in this order.  Disk reads skip the
+            other columns entirely; such partial reads are not promoted
+            into memory.
+        stale
+            If True, return an expired entry instead of deleting it.
         """
-        df.to_parquet(self._data_path(key))
-        meta = {"created_at": time.time(), "ttl_seconds": ttl_seconds}
-        self._meta_path(key).write_text(json.dumps(meta))
+        return self._lookup(key, columns, stale)[0]
 
-    def get(self, key: str) -> pd.DataFrame | None:
-        """Retrieve a cached DataFrame, or ``None`` if missing/expired."""
-        data_path = self._data_path(key)
-        meta_path = self._meta_path(key)
+    def _lookup(
+        self, key: str, columns: list[str] | None = None, stale: bool = False
+    ) -> tuple[pd.DataFrame | None, bool]:
+        """Implement :meth:`get`; also report whether the frame is expired."""
+        dataset = _dataset_of(key, self._dir)
+        if self._memory is not None:
+            df = self._memory.get(self._memory_key(key))
+            if df is not None:
+                self._index.count(dataset, hits=1)
+                emit("on_cache_hit", key=key, cache_dir=str(self._dir), tier="memory")
+                return (df if columns is None else df[columns]), False
 
-        if not data_path.exists() or not meta_path.exists():
-            return None
+        with stage("cache_read", cache_dir=str(self._dir)):
+            df, expires_at, reason = self._load(key, columns, stale)
+        self._index.count(dataset, hits=int(df is not None), misses=int(df is None))
+        if df is None:
+            emit("on_cache_miss", key=key, cache_dir=str(self._dir), reason=reason)
+            return None, False
+        expired = reason == "expired"
+        emit(
+            "on_cache_hit",
+            key=key,
+            cache_dir=str(self._dir),
+            tier="disk",
+            **({"stale": True} if expired else {}),
+        )
+        if self._memory is not None and columns is None and not expired:
+            self._memory.put(self._memory_key(key), df, expires_at)
+        return df, expired
 
-        meta = json.loads(meta_path.read_text())
-        ttl = meta.get("ttl_seconds")
+    def _load(
+        self, key: str, columns: list[str] | None = None, stale: bool = False
+    ) -> tuple[pd.DataFrame | None, float | None, str | None]:
+        """Read an entry from disk: the frame, its expiry and a reason.
 
-        if ttl is not None:
-            age = time.time() - meta["created_at"]
-            if age > ttl:
-                data_path.unlink(missing_ok=True)
-                meta_path.unlink(missing_ok=True)
-                return None
+        The reason is ``"missing"`` or ``"expired"`` when no frame is
+        returned, ``"expired"`` for a *stale* read of an expired entry and
+        ``None`` otherwise.
+        """
+        name = self._safe_name(key)
+        row = self._index.lookup(name)
+        if row is None:
+            return None, None, "missing"
+        expired = row["expires_at"] is not None and time.time() > row["expires_at"]
+        if expired and not (stale or self.read_only):
+            self._remove([name])
+            return None, None, "expired"
+        format = row["format"] or "parquet"
+        try:
+            df = _read_frame(self._data_path(key, format), format, columns)
+        except FileNotFoundError:
+            self._index.delete([name])
+            return None, None, "missing"
+        metrics.increment("cache_bytes_read_total", row["size"])
+        self._index.touch(name)
+        return df, row["expires_at"], "expired" if expired else None
+
+    def _key_lock(self, key: str) -> _KeyLock:
+        return _KeyLock(self._dir / _CACHE_LOCK_DIR / f"{self._safe_name(key)}.lock")
+
+    @contextlib.contextmanager
+    def lock(self, key: str, timeout: float = _LOCK_TIMEOUT_SECONDS) -> Iterator[bool]:
+        """Hold the per-key lock shared by every process using this directory.
+
+        Yields whether the lock was acquired; after *timeout* seconds the
+        block runs without it rather than waiting forever.
+        """
+        lock = self._key_lock(key)
+        acquired = lock.acquire(timeout)
+        try:
+            yield acquired
+        finally:
+            lock.release()
+
+    def _recheck(self, key: str) -> pd.DataFrame | None:
+        """Look *key* up again after waiting for its lock (not counted)."""
+        df, expires_at, _ = self._load(key)
+        if df is not None:
+            self._index.count(_dataset_of(key, self._dir), hits=1, misses=-1)
+            if self._memory is not None:
+                self._memory.put(self._memory_key(key), df, expires_at)
+        return df
+
+    def _effective_policy(self, policy: str) -> str:
+        policy = resolve_cache_policy(policy)
+        if self.read_only and policy != "bypass":
+            return "offline"
+        return policy
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], pd.DataFrame],
+        ttl_seconds: int | float | None = None,
+        params: dict | None = None,
+        timeout: float = _LOCK_TIMEOUT_SECONDS,
+        policy: str = "default",
+    ) -> pd.DataFrame:
+        """Return the cached frame for *key*, calling *fetch* on a miss.
+
+        Concurrent callers -- threads or processes sharing the directory --
+        that miss the same key wait on its lock while the first one fetches,
+        then read its result, so each cold key is fetched once.
+
+        Parameters
+        ----------
+        key
+            Cache key identifier.
+        fetch
+            Called with no arguments to produce the frame on a miss.
+        ttl_seconds, params
+            Passed to :meth:`set`.
+        timeout
+            Seconds to wait for another caller's fetch before fetching
+            anyway.
+        policy
+            One of :data:`CACHE_POLICIES` (see
+            :func:`configure_cache_policy`).  ``"stale-ok"`` refreshes
+            expired entries by calling *fetch* on a background thread.
+            Read-only caches treat every policy but ``"bypass"`` as
+            ``"offline"``.
+
+        Raises
+        ------
+        CacheMiss
+            Under the ``"offline"`` policy, if *key* is not cached.
+        """
+        policy = self._effective_policy(policy)
+        if policy == "bypass":
+            return fetch()
+        if policy == "refresh":
+            return self._refresh(key, fetch, ttl_seconds, params, timeout)
+        df, expired = self._lookup(key, stale=policy in ("stale-ok", "offline"))
+        if df is not None:
+            if expired and policy == "stale-ok":
+                _revalidate(
+                    self._dir,
+                    key,
+                    partial(self._refresh, key, fetch, ttl_seconds, params, timeout),
+                )
+            return df
+        if policy == "offline":
+            raise CacheMiss(f"No cached entry for {key!r} in {self._dir} (offline).")
+        with self.lock(key, timeout):
+            df = self._recheck(key)
+            if df is None:
+                df = fetch()
+                self.set(key, df, ttl_seconds=ttl_seconds, params=params)
+        return df
+
+    def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], pd.DataFrame],
+        ttl_seconds: int | float | None,
+        params: dict | None,
+        timeout: float,
+    ) -> pd.DataFrame:
+        """Fetch *key* and overwrite its entry, holding the key's lock."""
+        with self.lock(key, timeout):
+            df = fetch()
+            self.set(key, df, ttl_seconds=ttl_seconds, params=params)
+        return df
+
+    async def get_or_fetch_async(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[pd.DataFrame]],
+        ttl_seconds: int | float | None = None,
+        params: dict | None = None,
+        timeout: float = _LOCK_TIMEOUT_SECONDS,
+        policy: str = "default",
+    ) -> pd.DataFrame:
+        """Async version of :meth:`get_or_fetch`; *fetch* returns an awaitable.
+
+        Disk I/O and lock waits run in worker threads.  Background refreshes
+        under ``"stale-ok"`` run *fetch* on a private event loop, closing
+        that loop's API client when done.
+        """
+        policy = self._effective_policy(policy)
+        if policy == "bypass":
+            return await fetch()
+        if policy != "refresh":
+            df, expired = await asyncio.to_thread(
+                self._lookup, key, stale=policy in ("stale-ok", "offline")
+            )
+            if df is not None:
+                if expired and policy == "stale-ok":
+
+                    async def fetch_and_close() -> pd.DataFrame:
+                        try:
+                            return await fetch()
+                        finally:
+                            await aclose_client()
+
+                    def refresh() -> pd.DataFrame:
+                        return self._refresh(
+                            key,
+                            lambda: asyncio.run(fetch_and_close()),
+                            ttl_seconds,
+                            params,
+                            timeout,
+                        )
+
+                    _revalidate(self._dir, key, refresh)
+                return df
+            if policy == "offline":
+                raise CacheMiss(
+                    f"No cached entry for {key!r} in {self._dir} (offline)."
+                )
+        lock = self._key_lock(key)
+        await asyncio.to_thread(lock.acquire, timeout)
+        try:
+            df = None
+            if policy != "refresh":
+                df = await asyncio.to_thread(self._recheck, key)
+            if df is None:
+                df = await fetch()
+                await asyncio.to_thread(
+                    self.set, key, df, ttl_seconds=ttl_seconds, params=params
+                )
+        finally:
+            lock.release()
+        return df
 
-        return pd.read_parquet(data_path)
+    def entries(self, dataset: str | None = None) -> list[dict]:
+        """Describe entries on disk, optionally only one dataset's.
+
+        Returns
+        -------
+        list of dict
+            One dict per entry with ``name`` (the hashed filename stem),
+            ``key``, ``dataset``, ``params``, ``size``, ``created_at``,
+            ``last_access``, ``hits``, ``columns`` (the frame's column names),
+            ``format`` and ``expired``.
+        """
+        now = time.time()
+        rows = (
+            self._index.select("dataset = ?", (dataset,))
+            if dataset is not None
+            else self._index.select()
+        )
+        return [_entry(row, now) for row in rows]
+
+    def find(self, dataset: str | None = None, **params) -> list[dict]:
+        """Return entries whose recorded request parameters match *params*.
+
+        Raw API payloads stored by the ``get_*`` functions (recorded with
+        ``layer="raw"``) are only returned when asked for with
+        ``layer="raw"``.
+
+        Examples
+        --------
+        All cached county-level ACS 5-year entries for 2022:
+
+        >>> cache.find("acs", geography="county", year=2022, survey="acs5")
+        ... # doctest: +SKIP
+        """
+        clauses, args = [], []
+        if dataset is not None:
+            clauses.append("dataset = ?")
+            args.append(dataset)
+        for name, value in params.items():
+            clauses.append("json_extract(params, ?) = ?")
+            args += [f"$.{name}", _json_value(value)]
+        if "layer" not in params:
+            clauses.append("json_extract(params, '$.layer') IS NOT 'raw'")
+        now = time.time()
+        rows = self._index.select(" AND ".join(clauses), tuple(args))
+        return [_entry(row, now) for row in rows]
+
+    def _remove(self, names: list[str]) -> None:
+        if self.read_only:
+            return
+        for name in names:
+            for suffix in CACHE_FORMATS.values():
+                (self._dir / f"{name}{suffix}").unlink(missing_ok=True)
+        self._index.delete(names)
+        if self._memory is not None:
+            directory = str(self._index.directory)
+            doomed = set(names)
+            self._memory.discard(lambda key: key[0] == directory and key[1] in doomed)
+
+    def _import_entry(self, source: BinaryIO, item: dict) -> int:
+        """Write one bundled entry and its index row; return its size."""
+
+        def copy(tmp: str) -> None:
+            with open(tmp, "wb") as out:
+                shutil.copyfileobj(source, out)
+
+        format = item.get("format", "parquet")
+        size = self._replace_file(item["key"], format, copy)
+        created_at, ttl = item["created_at"], item["ttl_seconds"]
+        self._index.upsert(
+            (
+                item["name"],
+                item["key"],
+                item["dataset"],
+                json.dumps(item["params"], sort_keys=True, default=str)
+                if item["params"]
+                else None,
+                size,
+                created_at,
+                ttl,
+                _expires_at(created_at, ttl),
+                time.time(),
+                0,
+                json.dumps(item["columns"]) if item["columns"] is not None else None,
+                format,
+            )
+        )
+        # Even when this instance skips the memory tier, other caches of the
+        # directory in this process must not keep serving the replaced frame.
+        memory_key = self._memory_key(item["key"])
+        _memory_cache.discard(lambda key: key == memory_key)
+        return size
+
+    def sweep(self) -> dict:
+        """Remove every expired entry.
+
+        Returns
+        -------
+        dict
+            ``removed`` entry count and ``freed_bytes``.
+        """
+        expired = self._index.select("expires_at < ?", (time.time(),))
+        self._remove([row["name"] for row in expired])
+        return {
+            "removed": len(expired),
+            "freed_bytes": sum(row["size"] for row in expired),
+        }
+
+    def prune(self, max_bytes: int | None = None, policy: str | None = None) -> dict:
+        """Sweep expired entries, then evict until the directory fits a budget.
+
+        Parameters
+        ----------
+        max_bytes
+            Byte budget; defaults to this cache's ``max_bytes``.  ``None``
+            only sweeps.
+        policy
+            ``"lru"`` or ``"lfu"``; defaults to this cache's ``policy``.
+
+        Returns
+        -------
+        dict
+            ``removed`` entry count and ``freed_bytes``, expired entries
+            included.
+        """
+        policy = self.policy if policy is None else policy
+        _check_policy(policy)
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        result = self.sweep()
+        if max_bytes is None:
+            return result
+        total = (
+            self._index.connect()
+            .execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+            .fetchone()[0]
+        )
+        doomed = []
+        for row in self._index.select(order=_EVICTION_ORDER[policy]):
+            if total <= max_bytes:
+                break
+            doomed.append(row["name"])
+            total -= row["size"]
+            result["freed_bytes"] += row["size"]
+        self._remove(doomed)
+        result["removed"] += len(doomed)
+        if doomed:
+            metrics.increment("cache_evictions_total", len(doomed), policy=policy)
+        return result
+
+    def stats(self) -> dict:
+        """Summarize size, entry counts and lookup hit rates.
+
+        Returns
+        -------
+        dict
+            ``entries``, ``bytes`` and ``expired`` totals, plus
+            ``datasets`` mapping each dataset to its own ``entries``,
+            ``bytes``, ``hits``, ``misses`` and ``hit_rate`` (``None``
+            before any lookup).
+        """
+        lookups = self._index.lookups()
+        rows = self._index.connect().execute(
+            "SELECT dataset, COUNT(*) AS entries, SUM(size) AS bytes, "
+            "SUM(expires_at < ?) AS expired FROM entries GROUP BY dataset",
+            (time.time(),),
+        )
+        sizes = {row["dataset"]: row for row in rows}
+        datasets: dict[str, dict] = {}
+        for name in sorted(set(sizes) | set(lookups)):
+            hits, misses = lookups.get(name, (0, 0))
+            row = sizes.get(name)
+            datasets[name] = {
+                "entries": row["entries"] if row else 0,
+                "bytes": row["bytes"] if row else 0,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+        return {
+            "entries": sum(ds["entries"] for ds in datasets.values()),
+            "bytes": sum(ds["bytes"] for ds in datasets.values()),
+            "expired": sum((row["expired"] or 0) for row in sizes.values()),
+            "datasets": datasets,
+        }
 
     def clear(self) -> None:
         """Remove all cached entries."""
-        for path in self._dir.glob(f"*{_CACHE_DATA_SUFFIX}"):
-            path.unlink()
-        for path in self._dir.glob(f"*{_CACHE_META_SUFFIX}"):
-            path.unlink()
+        if self.read_only:
+            return
+        self._remove([row["name"] for row in self._index.select()])
+        for suffix in CACHE_FORMATS.values():
+            for path in self._dir.glob(f"*{suffix}"):
+                path.unlink()
+
+
+def _as_set(values: object) -> set | None:
+    if values is None:
+        return None
+    if isinstance(values, str | int):
+        return {values}
+    return set(values)
+
+
+def export_cache(
+    path: str | Path,
+    root: Path = CACHE_ROOT,
+    dataset: str | Iterable[str] | None = None,
+    year: int | Iterable[int] | None = None,
+    geography: str | Iterable[str] | None = None,
+    include_expired: bool = False,
+) -> dict:
+    """Pack cache entries under *root* into one compressed bundle.
+
+    The bundle is a gzipped tar file holding a ``manifest.json`` -- each
+    entry's directory (relative to *root*), key, dataset, request
+    parameters, columns, creation time and TTL -- followed by the entries'
+    Parquet files.  Unpack it on another machine with :func:`import_cache`.
+
+    Parameters
+    ----------
+    path
+        Bundle file to write, e.g. ``"acs-2023.tar.gz"``.
+    root
+        Cache root whose directories are exported (default
+        ``~/.pypums/cache``).
+    dataset, year, geography
+        Only export entries matching these values (one value or several).
+        *year* and *geography* match the request parameters recorded with
+        each entry, so entries without them are left out.
+    include_expired
+        If True, also export entries past their TTL.
+
+    Returns
+    -------
+    dict
+        The bundle's manifest.
+
+    Examples
+    --------
+    >>> export_cache("acs-2023.tar.gz", dataset="acs", year=2023)
+    ... # doctest: +SKIP
+    """
+    root = Path(root)
+    datasets, geographies = _as_set(dataset), _as_set(geography)
+    years = _as_set(year)
+    if years is not None:
+        years = {int(y) for y in years}
+    now = time.time()
+    selected = []
+    for directory in cache_directories(root):
+        cache = CensusCache(directory, memory=False)
+        # Leave nothing in the -wal file, so read-only openers of this
+        # directory see every entry.
+        cache._index.checkpoint()
+        relative = PurePosixPath(directory.relative_to(root).as_posix())
+        for row in cache._index.select(order="name"):
+            expired = row["expires_at"] is not None and now > row["expires_at"]
+            params = json.loads(row["params"]) if row["params"] else {}
+            if (
+                (expired and not include_expired)
+                or (datasets is not None and row["dataset"] not in datasets)
+                or (years is not None and params.get("year") not in years)
+                or (
+                    geographies is not None
+                    and params.get("geography") not in geographies
+                )
+            ):
+                continue
+            format = row["format"] or "parquet"
+            filename = f"{row['name']}{CACHE_FORMATS[format]}"
+            selected.append(
+                (
+                    directory / filename,
+                    {
+                        "directory": str(relative),
+                        "file": str(PurePosixPath("entries") / relative / filename),
+                        "name": row["name"],
+                        "key": row["key"],
+                        "dataset": row["dataset"],
+                        "params": params or None,
+                        "columns": json.loads(row["columns"])
+                        if row["columns"]
+                        else None,
+                        "size": row["size"],
+                        "created_at": row["created_at"],
+                        "ttl_seconds": row["ttl_seconds"],
+                        "format": format,
+                    },
+                )
+            )
+    manifest = {
+        "format": _BUNDLE_FORMAT,
+        "created_at": now,
+        "filters": {
+            "dataset": sorted(datasets) if datasets is not None else None,
+            "year": sorted(years) if years is not None else None,
+            "geography": sorted(geographies) if geographies is not None else None,
+        },
+        "entries": [item for _, item in selected],
+        "bytes": sum(item["size"] for _, item in selected),
+    }
+    payload = json.dumps(manifest, indent=2, default=str).encode()
+    with tarfile.open(path, "w:gz") as bundle:
+        # The manifest goes first so imports can read it without scanning
+        # the whole stream.
+        info = tarfile.TarInfo(_BUNDLE_MANIFEST)
+        info.size = len(payload)
+        info.mtime = int(now)
+        bundle.addfile(info, io.BytesIO(payload))
+        for data_path, item in selected:
+            # An entry evicted since it was selected is skipped on import.
+            with contextlib.suppress(FileNotFoundError):
+                bundle.add(data_path, arcname=item["file"])
+    return manifest
+
+
+def _read_manifest(bundle: tarfile.TarFile) -> dict:
+    try:
+        manifest = json.load(bundle.extractfile(_BUNDLE_MANIFEST))
+    except KeyError as exc:
+        raise ValueError(f"{bundle.name} is not a pypums cache bundle.") from exc
+    if manifest.get("format") != _BUNDLE_FORMAT:
+        raise ValueError(
+            f"Unsupported cache bundle format {manifest.get('format')!r}; "
+            f"expected {_BUNDLE_FORMAT}."
+        )
+    return manifest
+
+
+def import_cache(
+    path: str | Path, root: Path = CACHE_ROOT, overwrite: bool = False
+) -> dict:
+    """Unpack a bundle written by :func:`export_cache` into *root*.
+
+    Entries keep their original creation time and TTL, so they expire when
+    they would have on the exporting machine.  Each entry is written
+    atomically, so processes already using the cache never see a partial
+    file.
+
+    Parameters
+    ----------
+    path
+        Bundle file to read.
+    root
+        Cache root to import into (default ``~/.pypums/cache``).
+    overwrite
+        If True, replace existing entries even when they are newer than
+        the bundled ones.
+
+    Returns
+    -------
+    dict
+        ``imported`` and ``skipped`` entry counts and ``bytes`` written.
+
+    Raises
+    ------
+    ValueError
+        If *path* is not a cache bundle, an entry points outside *root*,
+        or the target cache is read-only.
+    """
+    root = Path(root)
+    result = {"imported": 0, "skipped": 0, "bytes": 0}
+    caches: dict[str, CensusCache] = {}
+    with tarfile.open(path, "r:*") as bundle:
+        manifest = _read_manifest(bundle)
+        for item in manifest["entries"]:
+            relative = PurePosixPath(item["directory"])
+            if (
+                relative.is_absolute()
+                or ".." in relative.parts
+                or CensusCache._safe_name(item["key"]) != item["name"]
+                or item.get("format", "parquet") not in CACHE_FORMATS
+            ):
+                raise ValueError(
+                    f"Invalid entry {item['directory']}/{item['name']} in {path}."
+                )
+            cache = caches.get(item["directory"])
+            if cache is None:
+                cache = CensusCache(root.joinpath(*relative.parts), memory=False)
+                if cache.read_only:
+                    raise ValueError(f"Cannot import into read-only cache {root}.")
+                caches[item["directory"]] = cache
+            existing = cache._index.lookup(item["name"])
+            if (
+                existing is not None
+                and not overwrite
+                and existing["created_at"] >= item["created_at"]
+            ):
+                result["skipped"] += 1
+                continue
+            try:
+                source = bundle.extractfile(item["file"])
+            except KeyError:
+                result["skipped"] += 1
+                continue
+            result["bytes"] += cache._import_entry(source, item)
+            result["imported"] += 1
+    for cache in caches.values():
+        if cache.max_bytes is not None:
+            cache.prune(cache.max_bytes)
+    return result
+
+
+metrics.add_collector("memory_cache", memory_cache_stats)
@@ -244,6 +244,222 @@ def estimates_cmd(
     console.print(df.to_string())
 
 
+cache_cli = typer.Typer(help="Inspect and prune the local Census data cache.")
+cli.add_typer(cache_cli, name="cache")
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+@cache_cli.command("stats")
+def cache_stats(
+    cache_dir: Path = typer.Option(
+        None, "--dir", help="Cache directory (default: all under ~/.pypums/cache)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print stats as JSON"),
+):
+    """Report cache size, entry counts and hit rates per dataset."""
+    import json
+
+    from rich.table import Table
+
+    from .cache import CACHE_ROOT, CensusCache, cache_directories
+
+    dirs = [cache_dir] if cache_dir else cache_directories(CACHE_ROOT)
+    report = {str(d): CensusCache(d, memory=False).stats() for d in dirs}
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+    if not report:
+        console.print("The cache is empty.")
+        return
+
+    table = Table(
+        "Directory", "Dataset", "Entries", "Size", "Hits", "Misses", "Hit rate"
+    )
+    for directory, stats in report.items():
+        for dataset, ds in stats["datasets"].items():
+            rate = "-" if ds["hit_rate"] is None else f"{ds['hit_rate']:.0%}"
+            table.add_row(
+                directory,
+                dataset,
+                str(ds["entries"]),
+                _format_bytes(ds["bytes"]),
+                str(ds["hits"]),
+                str(ds["misses"]),
+                rate,
+            )
+    console.print(table)
+    total = sum(stats["bytes"] for stats in report.values())
+    entries = sum(stats["entries"] for stats in report.values())
+    expired = sum(stats["expired"] for stats in report.values())
+    console.print(
+        f"Total: {entries} entries, {_format_bytes(total)} ({expired} expired)"
+    )
+
+
+@cache_cli.command("prune")
+def cache_prune(
+    cache_dir: Path = typer.Option(
+        None, "--dir", help="Cache directory (default: all under ~/.pypums/cache)"
+    ),
+    max_size: str = typer.Option(
+        None,
+        "--max-size",
+        help="Byte budget per directory, e.g. 500MB or 2GiB (default: only "
+        "remove expired entries)",
+    ),
+    policy: str = typer.Option("lru", "--policy", help="Eviction policy: lru or lfu"),
+):
+    """Remove expired entries and evict entries beyond a size budget."""
+    from .cache import CACHE_ROOT, CensusCache, cache_directories, parse_size
+
+    try:
+        budget = parse_size(max_size) if max_size else None
+        dirs = [cache_dir] if cache_dir else cache_directories(CACHE_ROOT)
+        removed = freed = 0
+        for directory in dirs:
+            result = CensusCache(directory, memory=False).prune(budget, policy)
+            removed += result["removed"]
+            freed += result["freed_bytes"]
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    console.print(f"Removed {removed} entries, freed {_format_bytes(freed)}.")
+
+
+@cache_cli.command("export")
+def cache_export(
+    bundle: Path = typer.Argument(..., help="Bundle file to write (.tar.gz)"),
+    cache_dir: Path = typer.Option(
+        None, "--dir", help="Cache root to export (default: ~/.pypums/cache)"
+    ),
+    dataset: list[str] = typer.Option(
+        None, "--dataset", "-d", help="Only this dataset, e.g. acs (repeatable)"
+    ),
+    year: list[int] = typer.Option(
+        None, "--year", "-y", help="Only this data year (repeatable)"
+    ),
+    geography: list[str] = typer.Option(
+        None, "--geography", "-g", help="Only this geography level (repeatable)"
+    ),
+    include_expired: bool = typer.Option(
+        False, "--include-expired", help="Also export entries past their TTL"
+    ),
+):
+    """Pack cache entries into one compressed bundle with a manifest."""
+    from .cache import CACHE_ROOT, export_cache
+
+    manifest = export_cache(
+        bundle,
+        cache_dir or CACHE_ROOT,
+        dataset=dataset or None,
+        year=year or None,
+        geography=geography or None,
+        include_expired=include_expired,
+    )
+    console.print(
+        f"Exported {len(manifest['entries'])} entries "
+        f"({_format_bytes(manifest['bytes'])}) to {bundle}."
+    )
+
+
+@cache_cli.command("import")
+def cache_import(
+    bundle: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Bundle written by cache export"
+    ),
+    cache_dir: Path = typer.Option(
+        None, "--dir", help="Cache root to import into (default: ~/.pypums/cache)"
+    ),
+    overwrite: bool = typer.Option(
+        False, "--overwrite", help="Replace entries newer than the bundled ones"
+    ),
+):
+    """Unpack a bundle written by `pypums cache export` into the cache."""
+    import tarfile
+
+    from .cache import CACHE_ROOT, import_cache
+
+    try:
+        result = import_cache(bundle, cache_dir or CACHE_ROOT, overwrite=overwrite)
+    except (ValueError, tarfile.TarError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    console.print(
+        f"Imported {result['imported']} entries "
+        f"({_format_bytes(result['bytes'])}), skipped {result['skipped']}."
+    )
+
+
+@cache_cli.command("warm")
+def cache_warm(
+    manifest: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="YAML or JSON manifest of get_* calls"
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Calls run at once"),
+    rate: float = typer.Option(
+        None, "--rate", help="Census API requests per second (default: 10)"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-fetch calls that are already cached"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Print the merged calls without running them"
+    ),
+    key: str = typer.Option(None, "--key", "-k", help="Census API key"),
+):
+    """Fill the cache from a manifest of get_* calls.
+
+    Calls are normalized, deduplicated and merged (variables and states of
+    otherwise identical calls are combined) before being run concurrently.
+    """
+    from rich.progress import Progress
+
+    from .warm import load_manifest, plan_warming, warm_cache
+
+    try:
+        specs = load_manifest(manifest)
+    except (ValueError, ImportError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    if dry_run:
+        planned = plan_warming(specs)
+        for spec in planned:
+            console.print(str(spec), markup=False)
+        console.print(f"{len(specs)} manifest entries -> {len(planned)} calls.")
+        return
+    if rate is not None:
+        from .api.client import configure_rate_limit
+
+        configure_rate_limit(rate=rate)
+
+    with Progress(console=console) as progress:
+        task = progress.add_task("Warming", total=None)
+
+        def advance(done, total, spec, error):
+            progress.update(task, completed=done, total=total)
+            if error is not None:
+                progress.console.print(f"[red]Failed[/red] {spec}: {error}")
+
+        result = warm_cache(
+            specs, concurrency=concurrency, refresh=refresh, key=key, progress=advance
+        )
+    console.print(
+        f"Warmed {result['succeeded']} of {result['calls']} calls "
+        f"({result['specs']} manifest entries), fetched "
+        f"{_format_bytes(result['bytes'])} in {result['seconds']:.1f} s."
+    )
+    if result["failed"]:
+        console.print(f"[red]{len(result['failed'])} calls failed.[/red]")
+        raise typer.Exit(code=1)
+
+
 def _version_callback(value: bool) -> None:
     if value:
         typer.echo(f"{__app_name__} v{__version__}")
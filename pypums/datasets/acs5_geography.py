@@ -69,6 +69,6 @@ def acs5_geography(
     df = pd.DataFrame(rows)
 
     if disk_cache is not None:
-        disk_cache.set(cache_key, df)
+        disk_cache.set(cache_key, df, params={"year": year})
 
     return df
@@ -70,6 +70,6 @@ def pums_variables(
 
     if disk_cache is not None:
         # Cache indefinitely since PUMS variables rarely change within a year.
-        disk_cache.set(cache_key, df)
+        disk_cache.set(cache_key, df, params={"year": year, "survey": survey})
 
     return df
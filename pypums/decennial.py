@@ -1,13 +1,22 @@
 """Decennial Census data retrieval via the Census API."""
 
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
 
-from pypums.api.client import CENSUS_API_BASE, call_census_api
-from pypums.api.geography import build_geography_query
+from pypums.api.client import (
+    CENSUS_API_BASE,
+    call_census_api_table,
+    call_census_api_table_async,
+)
+from pypums.api.geography import expand_geography_query
 from pypums.api.key import census_api_key
-from pypums.cache import CensusCache
+from pypums.api.query import QueryPlan, fan_out, run_query, run_query_async
+from pypums.api.request import CensusRequest
+from pypums.cache import resolve_cache_policy
+from pypums.instrumentation import stage
 
 _DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache" / "api"
 
@@ -35,23 +44,166 @@ _GEO_COL_ORDER = [
 _GEO_COLUMNS = frozenset(_GEO_COL_ORDER)
 
 
-def _call_census_api(url: str, params: dict) -> list[list[str]]:
+def _call_census_api(url: str, params: dict) -> pa.Table:
     """Thin wrapper so tests can mock ``pypums.decennial._call_census_api``."""
-    return call_census_api(url, params)
+    return call_census_api_table(url, params)
+
+
+async def _call_census_api_async(url: str, params: dict) -> pa.Table:
+    """Thin wrapper so tests can mock ``pypums.decennial._call_census_api_async``."""
+    return await call_census_api_table_async(url, params)
+
+
+def _numeric_column(name: str) -> bool:
+    """True for the variable columns :func:`_format_decennial` converts."""
+    return name not in _GEO_COLUMNS and name not in ("NAME", "GEOID")
+
+
+def _format_decennial(
+    df: pd.DataFrame,
+    *,
+    output: str,
+    keep_geo_vars: bool,
+) -> pd.DataFrame:
+    """Turn a raw Decennial API response frame into tidy or wide output."""
+    # Build GEOID from FIPS columns in canonical order.
+    with stage("geoid", query="get_decennial"):
+        geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
+        if geo_cols:
+            df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
+
+    # Identify variable columns (everything except NAME and geo columns).
+    var_cols = [
+        c for c in df.columns if c not in _GEO_COLUMNS and c not in ("NAME", "GEOID")
+    ]
+
+    # Convert to numeric.
+    with stage("numeric", query="get_decennial"):
+        for col in var_cols:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    with stage("reshape", query="get_decennial", output=output):
+        # Determine which geo FIPS columns to keep.
+        geo_cols_present = [c for c in _GEO_COL_ORDER if c in df.columns]
+        extra_geo = geo_cols_present if keep_geo_vars else []
+
+        if output == "wide":
+            keep_cols = ["GEOID", "NAME"] + extra_geo + var_cols
+            return df[[c for c in keep_cols if c in df.columns]]
+
+        # Tidy format: melt to one row per geography x variable.
+        id_cols = ["GEOID", "NAME"] if "GEOID" in df.columns else ["NAME"]
+        id_cols = id_cols + extra_geo
+        return df.melt(
+            id_vars=id_cols,
+            value_vars=var_cols,
+            var_name="variable",
+            value_name="value",
+        )
+
+
+def _plan_decennial(
+    *,
+    geography: str,
+    variables: str | list[str] | None,
+    table: str | None,
+    state: str | list[str] | None,
+    county: str | list[str] | None,
+    year: int,
+    output: str,
+    pop_group: str | None,
+    geometry: bool,
+    keep_geo_vars: bool,
+    cache_table: bool,
+    cache: str | None,
+    key: str | None,
+) -> QueryPlan:
+    """Validate ``get_decennial`` arguments and build its query plan."""
+    if output not in ("tidy", "wide"):
+        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
+
+    api_key = census_api_key(key) if key else census_api_key()
+
+    # Select dataset.
+    dataset = (
+        "dec/dhc-a" if pop_group is not None else _YEAR_DATASETS.get(year, "dec/dhc")
+    )
+
+    # Build the variable list.
+    if variables is not None:
+        if isinstance(variables, str):
+            variables = [variables]
+        requested = list(dict.fromkeys(variables))
+    elif table is not None:
+        requested = [f"group({table})"]
+    else:
+        raise ValueError("Must provide either 'variables' or 'table'.")
+
+    request = CensusRequest.create(
+        "dec",
+        year,
+        geography=geography,
+        state=state,
+        county=county,
+        variables=requested,
+        dataset=dataset,
+        output=output,
+        pop_group=pop_group,
+        keep_geo_vars=keep_geo_vars,
+        geometry=geometry,
+    )
+    geographies = expand_geography_query(
+        request.geography, state=request.state, county=request.county
+    )
+    for_clause, in_clause = geographies[0]
+    api_vars = list(request.variables)
+
+    url = f"{CENSUS_API_BASE}/{year}/{dataset}"
+    params: dict[str, str] = {
+        "get": f"NAME,{','.join(api_vars)}",
+        "for": for_clause,
+        "key": api_key,
+    }
+    if in_clause is not None:
+        params["in"] = in_clause
+    if pop_group is not None:
+        params["POP_GROUP"] = pop_group
+
+    return QueryPlan(
+        requests=fan_out(url, params, geographies),
+        transform=partial(
+            _format_decennial, output=output, keep_geo_vars=keep_geo_vars
+        ),
+        cache_key=request.cache_key,
+        cache_params=request.params,
+        cache_table=cache_table,
+        cache_policy=resolve_cache_policy(cache),
+        cache_dir=_DEFAULT_CACHE_DIR,
+        geometry=(
+            {"geography": request.geography, "state": state, "year": year}
+            if geometry
+            else None
+        ),
+        numeric=_numeric_column,
+        name="get_decennial",
+        request=request,
+        column_order=requested if requested != api_vars else None,
+    )
 
 
 def get_decennial(
     geography: str,
     variables: str | list[str] | None = None,
     table: str | None = None,
-    state: str | None = None,
-    county: str | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
     year: int = 2020,
     output: str = "tidy",
     pop_group: str | None = None,
     geometry: bool = False,
     keep_geo_vars: bool = False,
     cache_table: bool = False,
+    cache: str | None = None,
     key: str | None = None,
 ) -> pd.DataFrame:
     """Retrieve Decennial Census data from the Census API.
@@ -65,9 +217,12 @@ def get_decennial(
     table
         Census table ID. Alternative to *variables*.
     state
-        State FIPS code or abbreviation.
+        State FIPS code or abbreviation, a list of them, or ``"*"`` for
+        every state.  Multiple states are queried concurrently and the
+        results concatenated.
     county
-        County FIPS code.
+        County FIPS code, a list of them, or ``"*"`` for every county in
+        the selected state(s).
     year
         Census year: 2000, 2010, or 2020 (default 2020).
     output
@@ -83,101 +238,68 @@ def get_decennial(
         Census API key. Falls back to ``census_api_key()``.
     cache_table
         If True, cache the API response locally to avoid redundant calls.
+    cache
+        Cache policy for this call: ``"default"``, ``"refresh"``,
+        ``"stale-ok"``, ``"offline"`` or ``"bypass"`` (see
+        :mod:`pypums.cache`).  ``None`` uses the global policy set with
+        :func:`~pypums.cache.configure_cache_policy`.
 
     Returns
     -------
     pd.DataFrame
         Census data in tidy or wide format.
     """
-    if output not in ("tidy", "wide"):
-        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
-
-    api_key = census_api_key(key) if key else census_api_key()
-    for_clause, in_clause = build_geography_query(geography, state=state, county=county)
-
-    # Select dataset.
-    dataset = (
-        "dec/dhc-a" if pop_group is not None else _YEAR_DATASETS.get(year, "dec/dhc")
-    )
-
-    # Build the variable list.
-    if variables is not None:
-        if isinstance(variables, str):
-            variables = [variables]
-        api_vars = list(variables)
-    elif table is not None:
-        api_vars = [f"group({table})"]
-    else:
-        raise ValueError("Must provide either 'variables' or 'table'.")
-
-    # Build a cache key from request parameters.
-    cache_key = (
-        f"dec_{year}_{dataset}_{geography}_{state}_{county}"
-        f"_{output}_{pop_group}_{','.join(api_vars)}"
+    plan = _plan_decennial(
+        geography=geography,
+        variables=variables,
+        table=table,
+        state=state,
+        county=county,
+        year=year,
+        output=output,
+        pop_group=pop_group,
+        geometry=geometry,
+        keep_geo_vars=keep_geo_vars,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
     )
+    return run_query(plan, _call_census_api)
 
-    # Check cache before calling API.
-    disk_cache = CensusCache(_DEFAULT_CACHE_DIR) if cache_table else None
-    if disk_cache is not None:
-        cached = disk_cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-    url = f"{CENSUS_API_BASE}/{year}/{dataset}"
-    params: dict[str, str] = {
-        "get": f"NAME,{','.join(api_vars)}",
-        "for": for_clause,
-        "key": api_key,
-    }
-    if in_clause is not None:
-        params["in"] = in_clause
-    if pop_group is not None:
-        params["POP_GROUP"] = pop_group
-
-    data = _call_census_api(url, params)
-
-    # Convert JSON rows to DataFrame.
-    headers = data[0]
-    df = pd.DataFrame(data[1:], columns=headers)
-
-    # Build GEOID from FIPS columns in canonical order.
-    geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
-    if geo_cols:
-        df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
-
-    # Identify variable columns (everything except NAME and geo columns).
-    var_cols = [
-        c for c in df.columns if c not in _GEO_COLUMNS and c not in ("NAME", "GEOID")
-    ]
-
-    # Convert to numeric.
-    for col in var_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Determine which geo FIPS columns to keep.
-    geo_cols_present = [c for c in _GEO_COL_ORDER if c in df.columns]
-    extra_geo = geo_cols_present if keep_geo_vars else []
-
-    if output == "wide":
-        keep_cols = ["GEOID", "NAME"] + extra_geo + var_cols
-        result = df[[c for c in keep_cols if c in df.columns]]
-    else:
-        # Tidy format: melt to one row per geography x variable.
-        id_cols = ["GEOID", "NAME"] if "GEOID" in df.columns else ["NAME"]
-        id_cols = id_cols + extra_geo
-        result = df.melt(
-            id_vars=id_cols,
-            value_vars=var_cols,
-            var_name="variable",
-            value_name="value",
-        )
-
-    if geometry:
-        from pypums.spatial import attach_geometry
 
-        result = attach_geometry(result, geography, state=state, year=year)
-
-    if disk_cache is not None:
-        disk_cache.set(cache_key, result, ttl_seconds=86400)
+async def get_decennial_async(
+    geography: str,
+    variables: str | list[str] | None = None,
+    table: str | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
+    year: int = 2020,
+    output: str = "tidy",
+    pop_group: str | None = None,
+    geometry: bool = False,
+    keep_geo_vars: bool = False,
+    cache_table: bool = False,
+    cache: str | None = None,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Asynchronous version of :func:`get_decennial`.
 
-    return result
+    Takes the same parameters and returns the same frame, but awaits the
+    Census API on the running event loop.
+    """
+    plan = _plan_decennial(
+        geography=geography,
+        variables=variables,
+        table=table,
+        state=state,
+        county=county,
+        year=year,
+        output=output,
+        pop_group=pop_group,
+        geometry=geometry,
+        keep_geo_vars=keep_geo_vars,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
+    )
+    return await run_query_async(plan, _call_census_api_async)
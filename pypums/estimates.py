@@ -1,13 +1,22 @@
 """Population Estimates Program data retrieval via the Census API."""
 
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
-
-from pypums.api.client import CENSUS_API_BASE, call_census_api
-from pypums.api.geography import build_geography_query
+import pyarrow as pa
+
+from pypums.api.client import (
+    CENSUS_API_BASE,
+    call_census_api_table,
+    call_census_api_table_async,
+)
+from pypums.api.geography import expand_geography_query
 from pypums.api.key import census_api_key
-from pypums.cache import CensusCache
+from pypums.api.query import QueryPlan, fan_out, run_query, run_query_async
+from pypums.api.request import CensusRequest
+from pypums.cache import resolve_cache_policy
+from pypums.instrumentation import stage
 
 # Valid output formats.
 _VALID_OUTPUTS = frozenset({"tidy", "wide"})
@@ -80,9 +89,187 @@ _GEO_COL_ORDER = ["state", "county"]
 _DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache" / "api"
 
 
-def _call_census_api(url: str, params: dict) -> list[list[str]]:
+def _call_census_api(url: str, params: dict) -> pa.Table:
     """Thin wrapper so tests can mock ``pypums.estimates._call_census_api``."""
-    return call_census_api(url, params)
+    return call_census_api_table(url, params)
+
+
+async def _call_census_api_async(url: str, params: dict) -> pa.Table:
+    """Thin wrapper so tests can mock ``pypums.estimates._call_census_api_async``."""
+    return await call_census_api_table_async(url, params)
+
+
+def _numeric_column(name: str) -> bool:
+    """True for the columns :func:`_format_estimates` converts."""
+    return name not in _GEO_COL_ORDER and name not in ("NAME", "GEOID")
+
+
+def _format_estimates(
+    df: pd.DataFrame,
+    *,
+    breakdown: list[str] | None,
+    breakdown_labels: bool,
+    output: str,
+) -> pd.DataFrame:
+    """Turn a raw PEP API response frame into tidy or wide output."""
+    # Build GEOID from FIPS columns.
+    with stage("geoid", query="get_estimates"):
+        geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
+        if geo_cols:
+            df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
+
+    # Convert numeric columns (everything except NAME and geo columns).
+    geo_set = frozenset(_GEO_COL_ORDER)
+    numeric_cols = [
+        c for c in df.columns if c not in geo_set and c not in ("NAME", "GEOID")
+    ]
+    with stage("numeric", query="get_estimates"):
+        for col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    with stage("reshape", query="get_estimates", output=output):
+        # Add human-readable labels for breakdown dimensions.
+        if breakdown_labels and breakdown is not None:
+            for dim in breakdown:
+                dim_upper = dim.upper()
+                if dim_upper in _BREAKDOWN_LABELS and dim_upper in df.columns:
+                    df[f"{dim_upper}_label"] = (
+                        df[dim_upper].astype(str).map(_BREAKDOWN_LABELS[dim_upper])
+                    )
+
+        # Format output.
+        if output == "tidy":
+            id_cols = ["GEOID", "NAME"] if "GEOID" in df.columns else ["NAME"]
+            # Include any breakdown columns in id_cols.
+            excluded = geo_set | set(id_cols) | set(numeric_cols)
+            breakdown_cols = [c for c in df.columns if c not in excluded]
+            id_cols = id_cols + breakdown_cols
+
+            value_cols = [c for c in numeric_cols if c in df.columns]
+            if value_cols:
+                df = df.melt(
+                    id_vars=id_cols,
+                    value_vars=value_cols,
+                    var_name="variable",
+                    value_name="value",
+                )
+
+        return df
+
+
+def _plan_estimates(
+    *,
+    geography: str,
+    product: str | None,
+    variables: str | list[str] | None,
+    breakdown: str | list[str] | None,
+    breakdown_labels: bool,
+    vintage: int,
+    year: int | None,
+    state: str | list[str] | None,
+    county: str | list[str] | None,
+    time_series: bool,
+    output: str,
+    geometry: bool,
+    cache_table: bool,
+    cache: str | None,
+    show_call: bool,
+    key: str | None,
+) -> QueryPlan:
+    """Validate ``get_estimates`` arguments and build its query plan."""
+    if output not in _VALID_OUTPUTS:
+        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
+
+    api_key = census_api_key(key) if key else census_api_key()
+
+    # Validate product.
+    resolved_product = product or "population"
+    if resolved_product not in _VALID_PRODUCTS:
+        raise ValueError(
+            f"product must be one of {sorted(_VALID_PRODUCTS)},"
+            f" got {resolved_product!r}"
+        )
+    dataset = _PRODUCT_DATASETS[resolved_product]
+    if time_series and resolved_product != "population":
+        raise ValueError("time_series=True is only supported for product='population'")
+
+    if isinstance(variables, str):
+        variables = [variables]
+    requested = list(dict.fromkeys(variables)) if variables is not None else []
+    if isinstance(breakdown, str):
+        breakdown = [breakdown]
+
+    request = CensusRequest.create(
+        "est",
+        vintage,
+        geography=geography,
+        state=state,
+        county=county,
+        variables=requested,
+        product=resolved_product,
+        estimate_year=year,
+        breakdown=breakdown,
+        breakdown_labels=breakdown_labels,
+        time_series=time_series,
+        output=output,
+        geometry=geometry,
+    )
+    geographies = expand_geography_query(
+        request.geography, state=request.state, county=request.county
+    )
+    for_clause, in_clause = geographies[0]
+
+    url = f"{CENSUS_API_BASE}/{vintage}/{dataset}"
+
+    # Build variable list.
+    get_vars = ",".join(["NAME", *request.variables])
+
+    params: dict[str, str] = {
+        "get": get_vars,
+        "for": for_clause,
+        "key": api_key,
+    }
+    if in_clause is not None:
+        params["in"] = in_clause
+
+    # Add breakdown parameters.
+    for dim in breakdown or []:
+        params[dim] = "*"
+
+    if time_series:
+        # Add date columns and request all dates within the vintage.
+        params["get"] = params["get"] + ",DATE_CODE,DATE_DESC"
+        params["DATE_CODE"] = "*"
+
+    if year is not None:
+        params["YEAR"] = str(year)
+
+    return QueryPlan(
+        requests=fan_out(url, params, geographies),
+        transform=partial(
+            _format_estimates,
+            breakdown=breakdown,
+            breakdown_labels=breakdown_labels,
+            output=output,
+        ),
+        cache_key=request.cache_key,
+        cache_params=request.params,
+        cache_table=cache_table,
+        cache_policy=resolve_cache_policy(cache),
+        cache_dir=_DEFAULT_CACHE_DIR,
+        geometry=(
+            {"geography": request.geography, "state": state, "year": vintage}
+            if geometry
+            else None
+        ),
+        show_call=show_call,
+        # Time-series rows repeat per date, so DATE_CODE must key every chunk.
+        chunk_keys=("DATE_CODE",) if time_series else (),
+        numeric=_numeric_column,
+        name="get_estimates",
+        request=request,
+        column_order=requested if requested != list(request.variables) else None,
+    )
 
 
 def get_estimates(
@@ -94,12 +281,13 @@ def get_estimates(
     breakdown_labels: bool = False,
     vintage: int = 2023,
     year: int | None = None,
-    state: str | None = None,
-    county: str | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
     time_series: bool = False,
     output: str = "tidy",
     geometry: bool = False,
     cache_table: bool = False,
+    cache: str | None = None,
     show_call: bool = False,
     key: str | None = None,
 ) -> pd.DataFrame:
@@ -124,9 +312,12 @@ def get_estimates(
     year
         Specific data year within the vintage.
     state
-        State FIPS code or abbreviation.
+        State FIPS code or abbreviation, a list of them, or ``"*"`` for
+        every state.  Multiple states are queried concurrently and the
+        results concatenated.
     county
-        County FIPS code.
+        County FIPS code, a list of them, or ``"*"`` for every county in
+        the selected state(s).
     time_series
         If True, request data across multiple years within the vintage
         by querying the ``/pep/population`` time-series endpoint and
@@ -137,6 +328,11 @@ def get_estimates(
         If True, return a GeoDataFrame with shapes.
     cache_table
         If True, cache the API response locally to avoid redundant calls.
+    cache
+        Cache policy for this call: ``"default"``, ``"refresh"``,
+        ``"stale-ok"``, ``"offline"`` or ``"bypass"`` (see
+        :mod:`pypums.cache`).  ``None`` uses the global policy set with
+        :func:`~pypums.cache.configure_cache_policy`.
     show_call
         If True, print the API URL.
     key
@@ -147,128 +343,67 @@ def get_estimates(
     pd.DataFrame
         Population estimates data.
     """
-    if output not in _VALID_OUTPUTS:
-        raise ValueError(f"output must be 'tidy' or 'wide', got {output!r}")
-
-    api_key = census_api_key(key) if key else census_api_key()
-    for_clause, in_clause = build_geography_query(geography, state=state, county=county)
-
-    # Validate product.
-    resolved_product = product or "population"
-    if resolved_product not in _VALID_PRODUCTS:
-        raise ValueError(
-            f"product must be one of {sorted(_VALID_PRODUCTS)},"
-            f" got {resolved_product!r}"
-        )
-    dataset = _PRODUCT_DATASETS[resolved_product]
-
-    url = f"{CENSUS_API_BASE}/{vintage}/{dataset}"
-
-    # Build variable list.
-    if variables is not None:
-        if isinstance(variables, str):
-            variables = [variables]
-        get_vars = ",".join(["NAME"] + list(variables))
-    else:
-        get_vars = "NAME"
-
-    params: dict[str, str] = {
-        "get": get_vars,
-        "for": for_clause,
-        "key": api_key,
-    }
-    if in_clause is not None:
-        params["in"] = in_clause
-
-    # Add breakdown parameters.
-    if breakdown is not None:
-        if isinstance(breakdown, str):
-            breakdown = [breakdown]
-        for dim in breakdown:
-            params[dim] = "*"
-
-    if time_series:
-        if resolved_product != "population":
-            raise ValueError(
-                "time_series=True is only supported for product='population'"
-            )
-        # Add date columns and request all dates within the vintage.
-        params["get"] = params["get"] + ",DATE_CODE,DATE_DESC"
-        params["DATE_CODE"] = "*"
-
-    if year is not None:
-        params["YEAR"] = str(year)
-
-    # Build cache key from all parameters that affect the result.
-    vars_str = ",".join(variables) if variables is not None else ""
-    breakdown_str = ",".join(breakdown) if breakdown is not None else ""
-    cache_key = (
-        f"est_{vintage}_{resolved_product}_{geography}_{state}_{county}"
-        f"_{year}_{vars_str}_{breakdown_str}_{output}"
+    plan = _plan_estimates(
+        geography=geography,
+        product=product,
+        variables=variables,
+        breakdown=breakdown,
+        breakdown_labels=breakdown_labels,
+        vintage=vintage,
+        year=year,
+        state=state,
+        county=county,
+        time_series=time_series,
+        output=output,
+        geometry=geometry,
+        cache_table=cache_table,
+        cache=cache,
+        show_call=show_call,
+        key=key,
     )
+    return run_query(plan, _call_census_api)
 
-    # Check cache before calling API.
-    disk_cache = CensusCache(_DEFAULT_CACHE_DIR) if cache_table else None
-    if disk_cache is not None:
-        cached = disk_cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-    if show_call:
-        print(f"Census API call: {url}")
-        print(f"  Parameters: {params}")
 
-    data = _call_census_api(url, params)
-
-    # Convert JSON rows to DataFrame.
-    headers = data[0]
-    df = pd.DataFrame(data[1:], columns=headers)
-
-    # Build GEOID from FIPS columns.
-    geo_cols = [c for c in _GEO_COL_ORDER if c in df.columns]
-    if geo_cols:
-        df["GEOID"] = df[geo_cols].apply(lambda row: "".join(row), axis=1)
-
-    # Convert numeric columns (everything except NAME and geo columns).
-    geo_set = frozenset(_GEO_COL_ORDER)
-    numeric_cols = [
-        c for c in df.columns if c not in geo_set and c not in ("NAME", "GEOID")
-    ]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Add human-readable labels for breakdown dimensions.
-    if breakdown_labels and breakdown is not None:
-        for dim in breakdown:
-            dim_upper = dim.upper()
-            if dim_upper in _BREAKDOWN_LABELS and dim_upper in df.columns:
-                df[f"{dim_upper}_label"] = (
-                    df[dim_upper].astype(str).map(_BREAKDOWN_LABELS[dim_upper])
-                )
-
-    # Format output.
-    if output == "tidy":
-        id_cols = ["GEOID", "NAME"] if "GEOID" in df.columns else ["NAME"]
-        # Include any breakdown columns in id_cols.
-        excluded = geo_set | set(id_cols) | set(numeric_cols)
-        breakdown_cols = [c for c in df.columns if c not in excluded]
-        id_cols = id_cols + breakdown_cols
-
-        value_cols = [c for c in numeric_cols if c in df.columns]
-        if value_cols:
-            df = df.melt(
-                id_vars=id_cols,
-                value_vars=value_cols,
-                var_name="variable",
-                value_name="value",
-            )
-
-    if geometry:
-        from pypums.spatial import attach_geometry
-
-        df = attach_geometry(df, geography, state=state, year=vintage)
-
-    if disk_cache is not None:
-        disk_cache.set(cache_key, df, ttl_seconds=86400)
+async def get_estimates_async(
+    geography: str,
+    *,
+    product: str | None = None,
+    variables: str | list[str] | None = None,
+    breakdown: str | list[str] | None = None,
+    breakdown_labels: bool = False,
+    vintage: int = 2023,
+    year: int | None = None,
+    state: str | list[str] | None = None,
+    county: str | list[str] | None = None,
+    time_series: bool = False,
+    output: str = "tidy",
+    geometry: bool = False,
+    cache_table: bool = False,
+    cache: str | None = None,
+    show_call: bool = False,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Asynchronous version of :func:`get_estimates`.
 
-    return df
+    Takes the same parameters and returns the same frame, but awaits the
+    Census API on the running event loop.
+    """
+    plan = _plan_estimates(
+        geography=geography,
+        product=product,
+        variables=variables,
+        breakdown=breakdown,
+        breakdown_labels=breakdown_labels,
+        vintage=vintage,
+        year=year,
+        state=state,
+        county=county,
+        time_series=time_series,
+        output=output,
+        geometry=geometry,
+        cache_table=cache_table,
+        cache=cache,
+        show_call=show_call,
+        key=key,
+    )
+    return await run_query_async(plan, _call_census_api_async)
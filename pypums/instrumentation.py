@@ -0,0 +1,300 @@
+"""Instrumentation hooks and an in-process metrics registry.
+
+pypums emits events as it works:
+
+``on_request``
+    Before each HTTP request: ``url``, ``params`` (API key removed).
+``on_response``
+    After each HTTP response: ``url``, ``status``, ``seconds``, ``bytes``.
+``on_cache_hit`` / ``on_cache_miss``
+    On each :class:`~pypums.cache.CensusCache` lookup: ``key``, ``cache_dir``
+    and, for misses, ``reason`` (``"missing"`` or ``"expired"``).
+``on_stage``
+    When a timed stage of a ``get_*`` call finishes: ``stage``, ``seconds``
+    and any labels (e.g. ``query="get_acs"``).  A ``get_*`` call runs
+    ``cache_read``, ``fetch`` (each response's ``decode`` happens inside
+    it), ``frame``, ``transform`` (split into ``geoid``, ``numeric``,
+    ``reshape`` or ``recode``), ``geometry`` and ``cache_write``, all
+    within ``total``.
+
+Register callbacks with :func:`add_hook`; they receive the event fields as
+keyword arguments.  Independently, every event updates :data:`metrics`, a
+:class:`MetricsRegistry` of counters and latency histograms that can be
+dumped with :meth:`MetricsRegistry.to_json` or scraped via
+:meth:`MetricsRegistry.to_prometheus`.
+
+Examples
+--------
+>>> from pypums import instrumentation
+>>> with instrumentation.timings() as spent:  # doctest: +SKIP
+...     get_acs("tract", "B19013_001", state="CA", county="*")
+>>> spent  # doctest: +SKIP
+{'fetch': 3.12, 'decode': 0.04, 'frame': 0.01, 'geoid': 0.02, ...}
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# Events callbacks can subscribe to.
+EVENTS = ("on_request", "on_response", "on_cache_hit", "on_cache_miss", "on_stage")
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_hooks: dict[str, list[Callable[..., None]]] = {event: [] for event in EVENTS}
+_hooks_lock = threading.Lock()
+
+
+def _check_event(event: str) -> None:
+    if event not in _hooks:
+        raise ValueError(f"event must be one of {EVENTS}, got {event!r}")
+
+
+def add_hook(event: str, callback: Callable[..., None]) -> None:
+    """Call *callback* with the event's fields each time *event* fires."""
+    _check_event(event)
+    with _hooks_lock:
+        _hooks[event] = [*_hooks[event], callback]
+
+
+def remove_hook(event: str, callback: Callable[..., None]) -> None:
+    """Unregister a callback added with :func:`add_hook`."""
+    _check_event(event)
+    with _hooks_lock:
+        _hooks[event] = [h for h in _hooks[event] if h is not callback]
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, n in zip((*LATENCY_BUCKETS, float("inf")), self.counts, strict=True):
+            cumulative += n
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class MetricsRegistry:
+    """Thread-safe counters and latency histograms keyed by name and labels.
+
+    Collectors registered with :meth:`add_collector` are called on each
+    :meth:`snapshot` to report point-in-time gauges (rate-limiter state,
+    retry counts, ...).
+
+    Examples
+    --------
+    >>> registry = MetricsRegistry()
+    >>> registry.increment("requests_total", status=200)
+    >>> registry.observe("request_seconds", 0.2)
+    >>> registry.snapshot()["counters"]["requests_total"]
+    [{'labels': {'status': '200'}, 'value': 1}]
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = defaultdict(dict)
+        self._histograms: dict[str, dict[tuple, _Histogram]] = defaultdict(dict)
+        self._collectors: dict[str, Callable[[], dict]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Add *value* to the counter *name* with the given labels."""
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record a duration in the histogram *name*."""
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = _Histogram()
+            series[key].observe(seconds)
+
+    def add_collector(self, name: str, collect: Callable[[], dict]) -> None:
+        """Report ``collect()`` under ``gauges[name]`` in every snapshot."""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def reset(self) -> None:
+        """Drop all counters and histograms (collectors are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Return every metric as plain JSON-serializable data."""
+        with self._lock:
+            counters = {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {"labels": dict(key), **hist.snapshot()}
+                    for key, hist in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+            collectors = dict(self._collectors)
+        gauges = {name: collect() for name, collect in collectors.items()}
+        return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize :meth:`snapshot` to JSON (kwargs go to ``json.dumps``)."""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "pypums_") -> str:
+        """Render counters, histograms and numeric gauges in Prometheus text format."""
+
+        def fmt(labels: dict) -> str:
+            if not labels:
+                return ""
+            inner = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+            return "{" + inner + "}"
+
+        snap = self.snapshot()
+        lines = []
+        for name, series in snap["counters"].items():
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines += [f"{prefix}{name}{fmt(s['labels'])} {s['value']}" for s in series]
+        for name, series in snap["histograms"].items():
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for s in series:
+                for bound, n in s["buckets"].items():
+                    labels = fmt({**s["labels"], "le": bound})
+                    lines.append(f"{prefix}{name}_bucket{labels} {n}")
+                lines.append(f"{prefix}{name}_sum{fmt(s['labels'])} {s['sum']}")
+                lines.append(f"{prefix}{name}_count{fmt(s['labels'])} {s['count']}")
+        for group, values in snap["gauges"].items():
+            for field, value in _flatten(values):
+                if isinstance(value, bool) or not isinstance(value, int | float):
+                    continue
+                lines.append(f"{prefix}{group}_{field} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(values: dict, parent: str = "") -> Iterator[tuple[str, object]]:
+    for key, value in values.items():
+        name = f"{parent}_{key}" if parent else str(key)
+        name = "".join(c if c.isalnum() else "_" for c in name)
+        if isinstance(value, dict):
+            yield from _flatten(value, name)
+        else:
+            yield name, value
+
+
+# The process-wide registry every pypums event updates.
+metrics = MetricsRegistry()
+
+
+def _update_metrics(event: str, fields: dict) -> None:
+    if event == "on_request":
+        metrics.increment("api_requests_started_total")
+    elif event == "on_response":
+        metrics.increment("api_responses_total", status=fields["status"])
+        metrics.increment("api_response_bytes_total", fields["bytes"])
+        metrics.observe("api_request_seconds", fields["seconds"])
+    elif event == "on_cache_hit":
+        metrics.increment("cache_lookups_total", result="hit")
+    elif event == "on_cache_miss":
+        metrics.increment("cache_lookups_total", result="miss")
+    elif event == "on_stage":
+        labels = {k: v for k, v in fields.items() if k not in ("stage", "seconds")}
+        metrics.observe("stage_seconds", fields["seconds"], stage=fields["stage"])
+        if fields["stage"] == "total":
+            metrics.increment("queries_total", **labels)
+        if "rows" in fields:
+            metrics.increment("rows_total", fields["rows"], stage=fields["stage"])
+
+
+def emit(event: str, **fields) -> None:
+    """Fire *event*: update :data:`metrics` and call registered hooks.
+
+    Exceptions raised by hooks propagate to the caller.
+    """
+    _update_metrics(event, fields)
+    for callback in _hooks[event]:
+        callback(**fields)
+
+
+@contextmanager
+def stage(name: str, **labels) -> Iterator[dict]:
+    """Time a block as stage *name* and emit ``on_stage`` when it ends.
+
+    The yielded dict may be filled with extra fields for the event, such
+    as ``rows``.
+    """
+    extra: dict = {}
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        emit(
+            "on_stage",
+            stage=name,
+            seconds=time.perf_counter() - start,
+            **labels,
+            **extra,
+        )
+
+
+@contextmanager
+def timings() -> Iterator[dict[str, float]]:
+    """Collect total seconds per stage for everything run inside the block.
+
+    Stages in worker threads (e.g. ``decode``) are included.
+    """
+    spent: dict[str, float] = defaultdict(float)
+    lock = threading.Lock()
+
+    def record(stage: str, seconds: float, **_) -> None:
+        with lock:
+            spent[stage] += seconds
+
+    add_hook("on_stage", record)
+    try:
+        yield spent
+    finally:
+        remove_hook("on_stage", record)
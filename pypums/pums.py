@@ -1,13 +1,21 @@
 """PUMS microdata retrieval via the Census API."""
 
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
 
-from pypums.api.client import CENSUS_API_BASE, call_census_api
-from pypums.api.geography import _resolve_state_fips
+from pypums.api.client import (
+    CENSUS_API_BASE,
+    call_census_api_table,
+    call_census_api_table_async,
+)
 from pypums.api.key import census_api_key
-from pypums.cache import CensusCache
+from pypums.api.query import QueryPlan, run_query, run_query_async
+from pypums.api.request import CensusRequest
+from pypums.cache import resolve_cache_policy
+from pypums.instrumentation import stage
 
 _DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache" / "api"
 
@@ -58,9 +66,154 @@ _PUMS_RECODES: dict[str, dict[str, str]] = {
 }
 
 
-def _call_census_api(url: str, params: dict) -> list[list[str]]:
+def _call_census_api(url: str, params: dict) -> pa.Table:
     """Thin wrapper so tests can mock ``pypums.pums._call_census_api``."""
-    return call_census_api(url, params)
+    return call_census_api_table(url, params)
+
+
+async def _call_census_api_async(url: str, params: dict) -> pa.Table:
+    """Thin wrapper so tests can mock ``pypums.pums._call_census_api_async``."""
+    return await call_census_api_table_async(url, params)
+
+
+def _numeric_column(
+    name: str, *, user_vars: list[str], rep_weights: str | None
+) -> bool:
+    """True for weights, ages, person numbers and the requested variables."""
+    if name in ("PWGTP", "AGEP", "SPORDER") or name in user_vars:
+        return True
+    return bool(rep_weights) and name.startswith(("PWGTP", "WGTP"))
+
+
+def _format_pums(
+    df: pd.DataFrame,
+    *,
+    user_vars: list[str],
+    rep_weights: str | None,
+    recode: bool,
+) -> pd.DataFrame:
+    """Convert numeric columns and add recode labels to raw PUMS records."""
+    # Convert numeric columns.
+    with stage("numeric", query="get_pums"):
+        for col in df.columns:
+            if _numeric_column(col, user_vars=user_vars, rep_weights=rep_weights):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # Recode: add label columns for coded variables.
+    with stage("recode", query="get_pums"):
+        if recode:
+            for var in user_vars:
+                if var in _PUMS_RECODES and var in df.columns:
+                    df[f"{var}_label"] = df[var].astype(str).map(_PUMS_RECODES[var])
+
+    return df
+
+
+def _plan_pums(
+    *,
+    variables: str | list[str] | None,
+    state: str | list[str] | None,
+    puma: str | list[str] | None,
+    year: int,
+    survey: str,
+    variables_filter: dict[str, list | int | str] | None,
+    rep_weights: str | None,
+    recode: bool,
+    show_call: bool,
+    cache_table: bool,
+    cache: str | None,
+    key: str | None,
+) -> QueryPlan:
+    """Validate ``get_pums`` arguments and build its query plan."""
+    if state is None:
+        raise ValueError(
+            "A state is required for get_pums(). "
+            "Pass state='CA' or a FIPS code like state='06'."
+        )
+
+    api_key = census_api_key(key) if key else census_api_key()
+
+    # Normalize variables.
+    if variables is None:
+        user_vars: list[str] = []
+    elif isinstance(variables, str):
+        user_vars = [variables]
+    else:
+        user_vars = list(dict.fromkeys(variables))
+
+    if isinstance(puma, str):
+        puma = [puma]
+    request = CensusRequest.create(
+        "pums",
+        year,
+        state=state,
+        variables=user_vars,
+        survey=survey,
+        puma=sorted(set(puma)) if puma else None,
+        variables_filter=variables_filter,
+        rep_weights=rep_weights,
+        recode=recode,
+    )
+
+    # Build the full variable list.
+    all_vars = list(_PUMS_BASE_VARS)
+    for v in request.variables:
+        if v not in all_vars:
+            all_vars.append(v)
+
+    # Add replicate weights.
+    if rep_weights in ("person", "both"):
+        all_vars.extend(_PERSON_REP_WEIGHTS)
+    if rep_weights in ("housing", "both"):
+        all_vars.extend(_HOUSING_REP_WEIGHTS)
+
+    # One request per state, in FIPS order.
+    states = request.state if isinstance(request.state, tuple) else [request.state]
+    filters = request.params["variables_filter"] or {}
+
+    requests = []
+    for state_fips in states:
+        url = f"{CENSUS_API_BASE}/{year}/acs/{survey}/pums"
+        params: dict[str, str] = {
+            "get": ",".join(all_vars),
+            "for": f"state:{state_fips}",
+            "key": api_key,
+        }
+
+        # Add server-side filters.
+        for var, values in filters.items():
+            params[var] = ",".join(values)
+
+        # Add PUMA filter.
+        if puma:
+            params["PUMA"] = ",".join(request.params["puma"])
+
+        requests.append((url, params))
+
+    canonical_vars = [v for v in request.variables if v not in _PUMS_BASE_VARS]
+    requested_vars = [v for v in user_vars if v not in _PUMS_BASE_VARS]
+
+    return QueryPlan(
+        requests=requests,
+        transform=partial(
+            _format_pums,
+            user_vars=user_vars,
+            rep_weights=rep_weights,
+            recode=recode,
+        ),
+        cache_key=request.cache_key,
+        cache_params=request.params,
+        cache_table=cache_table,
+        cache_policy=resolve_cache_policy(cache),
+        cache_dir=_DEFAULT_CACHE_DIR,
+        show_call=show_call,
+        # Person records are identified by household serial + person number.
+        chunk_keys=("SERIALNO", "SPORDER"),
+        numeric=partial(_numeric_column, user_vars=user_vars, rep_weights=rep_weights),
+        name="get_pums",
+        request=request,
+        column_order=requested_vars if requested_vars != canonical_vars else None,
+    )
 
 
 def get_pums(
@@ -75,6 +228,7 @@ def get_pums(
     recode: bool = False,
     show_call: bool = False,
     cache_table: bool = False,
+    cache: str | None = None,
     key: str | None = None,
 ) -> pd.DataFrame:
     """Load PUMS microdata from the Census API.
@@ -99,6 +253,13 @@ def get_pums(
         If True, add ``*_label`` columns with human-readable values.
     show_call
         If True, print the API URL.
+    cache_table
+        If True, cache the API response locally to avoid redundant calls.
+    cache
+        Cache policy for this call: ``"default"``, ``"refresh"``,
+        ``"stale-ok"``, ``"offline"`` or ``"bypass"`` (see
+        :mod:`pypums.cache`).  ``None`` uses the global policy set with
+        :func:`~pypums.cache.configure_cache_policy`.
     key
         Census API key. Falls back to ``census_api_key()``.
 
@@ -112,111 +273,56 @@ def get_pums(
     ValueError
         If ``state`` is not provided.
     """
-    if state is None:
-        raise ValueError(
-            "A state is required for get_pums(). "
-            "Pass state='CA' or a FIPS code like state='06'."
-        )
-
-    api_key = census_api_key(key) if key else census_api_key()
-
-    # Normalize variables.
-    if variables is None:
-        user_vars: list[str] = []
-    elif isinstance(variables, str):
-        user_vars = [variables]
-    else:
-        user_vars = list(variables)
-
-    # Build a cache key from request parameters.
-    state_str = state if isinstance(state, str) else ",".join(state) if state else ""
-    puma_str = puma if isinstance(puma, str) else ",".join(puma) if puma else ""
-    filter_str = str(sorted(variables_filter.items())) if variables_filter else ""
-    cache_key = (
-        f"pums_{year}_{survey}_{state_str}_{puma_str}"
-        f"_{rep_weights}_{recode}_{filter_str}_{','.join(user_vars)}"
+    plan = _plan_pums(
+        variables=variables,
+        state=state,
+        puma=puma,
+        year=year,
+        survey=survey,
+        variables_filter=variables_filter,
+        rep_weights=rep_weights,
+        recode=recode,
+        show_call=show_call,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
     )
+    return run_query(plan, _call_census_api)
 
-    # Check cache before calling API.
-    disk_cache = CensusCache(_DEFAULT_CACHE_DIR) if cache_table else None
-    if disk_cache is not None:
-        cached = disk_cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-    # Build the full variable list.
-    all_vars = list(_PUMS_BASE_VARS)
-    for v in user_vars:
-        if v not in all_vars:
-            all_vars.append(v)
-
-    # Add replicate weights.
-    if rep_weights in ("person", "both"):
-        all_vars.extend(_PERSON_REP_WEIGHTS)
-    if rep_weights in ("housing", "both"):
-        all_vars.extend(_HOUSING_REP_WEIGHTS)
-
-    # Resolve state FIPS — support single string or list of states.
-    if isinstance(state, str):
-        state_fips_list = [_resolve_state_fips(state)]
-    else:
-        state_fips_list = [_resolve_state_fips(s) for s in state]
-
-    frames = []
-    for state_fips in state_fips_list:
-        url = f"{CENSUS_API_BASE}/{year}/acs/{survey}/pums"
-        params: dict[str, str] = {
-            "get": ",".join(all_vars),
-            "for": f"state:{state_fips}",
-            "key": api_key,
-        }
 
-        # Add server-side filters.
-        if variables_filter is not None:
-            for var, val in variables_filter.items():
-                if isinstance(val, list):
-                    params[var] = ",".join(str(v) for v in val)
-                else:
-                    params[var] = str(val)
-
-        # Add PUMA filter.
-        if puma is not None:
-            if isinstance(puma, str):
-                params["PUMA"] = puma
-            else:
-                params["PUMA"] = ",".join(puma)
-
-        if show_call:
-            print(f"Census API call: {url}")
-            print(f"  Parameters: {params}")
-
-        data = _call_census_api(url, params)
-
-        # Convert JSON rows to DataFrame.
-        headers = data[0]
-        frames.append(pd.DataFrame(data[1:], columns=headers))
-
-    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
-
-    # Convert numeric columns.
-    numeric_candidates = ["PWGTP", "AGEP", "SPORDER"] + user_vars
-    if rep_weights:
-        numeric_candidates.extend(
-            col
-            for col in df.columns
-            if col.startswith(("PWGTP", "WGTP")) and col not in numeric_candidates
-        )
-    for col in numeric_candidates:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Recode: add label columns for coded variables.
-    if recode:
-        for var in user_vars:
-            if var in _PUMS_RECODES and var in df.columns:
-                df[f"{var}_label"] = df[var].astype(str).map(_PUMS_RECODES[var])
-
-    if disk_cache is not None:
-        disk_cache.set(cache_key, df, ttl_seconds=86400)
+async def get_pums_async(
+    variables: str | list[str] | None = None,
+    *,
+    state: str | list[str] | None = None,
+    puma: str | list[str] | None = None,
+    year: int = 2023,
+    survey: str = "acs5",
+    variables_filter: dict[str, list | int | str] | None = None,
+    rep_weights: str | None = None,
+    recode: bool = False,
+    show_call: bool = False,
+    cache_table: bool = False,
+    cache: str | None = None,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Asynchronous version of :func:`get_pums`.
 
-    return df
+    Takes the same parameters and returns the same frame, but awaits the
+    Census API on the running event loop.  Multi-state requests are sent
+    concurrently.
+    """
+    plan = _plan_pums(
+        variables=variables,
+        state=state,
+        puma=puma,
+        year=year,
+        survey=survey,
+        variables_filter=variables_filter,
+        rep_weights=rep_weights,
+        recode=recode,
+        show_call=show_call,
+        cache_table=cache_table,
+        cache=cache,
+        key=key,
+    )
+    return await run_query_async(plan, _call_census_api_async)
@@ -4,11 +4,20 @@ Provides shapefile fetching (via `pygris <https://github.com/walkerke/pygris>`_)
 and merging, plus dot-density conversion and areal interpolation for thematic
 mapping.
 
+Shapes merged by :func:`attach_geometry` are cached once normalized: the
+``GEOID`` and EPSG:4269 geometry of each (geography, state, year,
+resolution) are stored as GeoParquet under ``~/.pypums/cache/shapes`` and
+kept in memory, so repeated ``geometry=True`` calls skip shapefile parsing
+and reprojection.
+
 Requires the ``spatial`` optional dependency group (``geopandas`` + ``pygris``).
 """
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -18,6 +27,14 @@ if TYPE_CHECKING:
     import pandas as pd
 
 
+_SHAPE_CACHE_DIR = Path.home() / ".pypums" / "cache" / "shapes"
+
+# Normalized shapes kept in this process, least recently used first.
+_SHAPE_MEMO_SIZE = 32
+_shape_memo: OrderedDict[str, gpd.GeoDataFrame] = OrderedDict()
+_shape_memo_lock = threading.Lock()
+
+
 def _pygris_func(name: str) -> Callable[..., Any]:
     """Lazily import a pygris function by name."""
     import pygris
@@ -136,17 +153,135 @@ def _fetch_tiger_shapes(
     return gdf
 
 
+def _shape_cache_key(
+    geography: str, state: str | None, year: int, resolution: str
+) -> str:
+    """Cache key of one shapefile download, ignoring unused arguments."""
+    geo = geography.lower()
+    entry = _GEO_TO_PYGRIS.get(geo)
+    if entry is None:
+        raise ValueError(f"No shapefile mapping for geography: {geography!r}")
+    _, accepts_state, accepts_resolution, _ = entry
+    if accepts_state and state is not None:
+        from pypums.api.request import normalize_states
+
+        state = normalize_states(state)
+    else:
+        state = None
+    return "_".join(
+        [
+            "shapes",
+            str(int(year)),
+            geo.replace(" ", "_"),
+            state or "all",
+            resolution if accepts_resolution else "cb",
+        ]
+    )
+
+
+def _load_shapes(
+    geography: str,
+    *,
+    state: str | None = None,
+    year: int = 2023,
+    resolution: str = "500k",
+    cache: bool = True,
+) -> gpd.GeoDataFrame:
+    """Return the ``GEOID`` and geometry of one shapefile download.
+
+    With *cache*, shapes are served from memory, then from the GeoParquet
+    shape cache, and only fetched and normalized with
+    :func:`_fetch_tiger_shapes` when neither has them.  The returned frame
+    may be shared between calls and must not be modified.
+    """
+    if not cache:
+        shapes = _fetch_tiger_shapes(
+            geography, state=state, year=year, resolution=resolution, cache=False
+        )
+        return shapes[["GEOID", "geometry"]]
+
+    key = _shape_cache_key(geography, state, year, resolution)
+    with _shape_memo_lock:
+        shapes = _shape_memo.get(key)
+        if shapes is not None:
+            _shape_memo.move_to_end(key)
+            return shapes
+
+    import geopandas as _gpd
+
+    from pypums.cache import CacheMiss, CensusCache
+
+    def fetch() -> gpd.GeoDataFrame:
+        shapes = _fetch_tiger_shapes(
+            geography, state=state, year=year, resolution=resolution, cache=True
+        )
+        return shapes[["GEOID", "geometry"]].reset_index(drop=True)
+
+    disk = CensusCache(_SHAPE_CACHE_DIR, memory=False, format="parquet")
+    params = {
+        "geography": geography.lower(),
+        "state": state,
+        "year": year,
+        "resolution": resolution,
+    }
+    try:
+        # Concurrent callers missing the same shapes fetch them once.
+        shapes = disk.get_or_fetch(key, fetch, params=params)
+    except CacheMiss:  # read-only cache without these shapes
+        shapes = fetch()
+    if not isinstance(shapes, _gpd.GeoDataFrame):
+        # Read back from GeoParquet: the geometry column holds WKB.
+        shapes = _gpd.GeoDataFrame(
+            shapes[["GEOID"]],
+            geometry=_gpd.GeoSeries.from_wkb(shapes["geometry"], crs=4269),
+        )
+
+    with _shape_memo_lock:
+        _shape_memo[key] = shapes
+        _shape_memo.move_to_end(key)
+        while len(_shape_memo) > _SHAPE_MEMO_SIZE:
+            _shape_memo.popitem(last=False)
+    return shapes
+
+
+def _shape_states(geography: str, state: str | list[str] | None) -> list[str | None]:
+    """Return the ``state`` argument for each shapefile download.
+
+    A list of states, or ``"*"`` for a geography pygris only serves per
+    state, needs one download per state; otherwise a single download
+    covers the request.
+    """
+    entry = _GEO_TO_PYGRIS.get(geography.lower())
+    accepts_state = entry is not None and entry[1]
+    requires_state = entry is not None and entry[3]
+    if state == "*":
+        if not requires_state:
+            return [None]
+    elif not isinstance(state, (list, tuple)):
+        return [state]
+    elif not accepts_state:
+        return [None]
+
+    from pypums.api.geography import _expand_states
+
+    return list(_expand_states(state))
+
+
 def attach_geometry(
     df: pd.DataFrame,
     geography: str,
     *,
-    state: str | None = None,
+    state: str | list[str] | None = None,
     year: int = 2023,
     resolution: str = "500k",
     cache: bool = True,
 ) -> gpd.GeoDataFrame:
     """Fetch shapes via pygris and merge with Census tabular data.
 
+    Normalized shapes are cached on disk and in memory (see
+    :mod:`pypums.spatial`), so only the first call for a geography, state,
+    year and resolution downloads and parses shapefiles.
+
     Parameters
     ----------
     df
@@ -154,13 +289,15 @@ def attach_geometry(
     geography
         Geography level name.
     state
-        State FIPS code or abbreviation.
+        State FIPS code or abbreviation, a list of them, or ``"*"``.
+        Shapes for multiple states are downloaded and combined.
     year
         Data year.
     resolution
         Shapefile resolution.
     cache
-        If True (default), cache downloaded shapefiles locally.
+        If True (default), cache downloaded shapefiles and the normalized
+        shapes locally.
 
     Returns
     -------
@@ -168,13 +305,23 @@ def attach_geometry(
         Merged GeoDataFrame with Census data and geometry.
     """
     import geopandas as _gpd
-
-    shapes = _fetch_tiger_shapes(
-        geography,
-        state=state,
-        year=year,
-        resolution=resolution,
-        cache=cache,
+    import pandas as _pd
+
+    states = _shape_states(geography, state)
+    parts = [
+        _load_shapes(
+            geography,
+            state=st,
+            year=year,
+            resolution=resolution,
+            cache=cache,
+        )
+        for st in states
+    ]
+    shapes = (
+        parts[0]
+        if len(parts) == 1
+        else _gpd.GeoDataFrame(_pd.concat(parts, ignore_index=True), crs=parts[0].crs)
     )
 
     if "GEOID" not in df.columns:
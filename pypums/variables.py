@@ -7,9 +7,6 @@ import pandas as pd
 from pypums.api.client import CENSUS_API_BASE, fetch_json
 from pypums.cache import CensusCache
 
-# Module-level in-memory cache for variable tables.
-_cache: dict[tuple[int, str], pd.DataFrame] = {}
-
 # Default persistent cache directory.
 _DEFAULT_CACHE_DIR = Path.home() / ".pypums" / "cache"
 
@@ -47,22 +44,16 @@ def load_variables(
     pd.DataFrame
         DataFrame with columns ``name``, ``label``, ``concept``.
     """
-    cache_key = (year, dataset)
     disk_key = f"{year}_{dataset.replace('/', '_')}"
 
-    # 1. Check in-memory cache.
-    if cache and cache_key in _cache:
-        return _cache[cache_key]
-
-    # 2. Check persistent disk cache.
+    # 1. Check the cache (shared in-memory tier, then disk).
     persistent = _get_persistent_cache() if cache else None
     if persistent is not None:
         cached_df = persistent.get(disk_key)
         if cached_df is not None:
-            _cache[cache_key] = cached_df
             return cached_df
 
-    # 3. Fetch from API.
+    # 2. Fetch from API.
     url = f"{CENSUS_API_BASE}/{year}/{dataset}/variables.json"
     raw = _fetch_variables_json(url)
 
@@ -78,9 +69,8 @@ def load_variables(
 
     df = pd.DataFrame(rows)
 
-    # 4. Store in caches.
-    if cache:
-        _cache[cache_key] = df
-        persistent.set(disk_key, df)
+    # 3. Store in the cache.
+    if persistent is not None:
+        persistent.set(disk_key, df, params={"year": year, "dataset": dataset})
 
     return df
@@ -0,0 +1,371 @@
+"""Partitioned local Parquet warehouse of fetched Census data.
+
+The hashed files of :class:`pypums.cache.CensusCache` answer repeated
+``get_*`` calls but can't be queried as a dataset.  Once enabled with
+:func:`configure_warehouse`, every response fetched by :func:`get_acs`,
+:func:`get_decennial`, :func:`get_pums` and :func:`get_estimates` is also
+written to a hive-partitioned Parquet dataset::
+
+    ~/.pypums/warehouse/
+        dataset=acs%2Facs5/year=2023/geography=county/state=06/part-0.parquet
+        dataset=acs%2Facs1%2Fpums/year=2022/geography=__HIVE_DEFAULT_PARTITION__/
+            state=48/part-0.parquet
+
+Rows are stored as the API returns them -- variables such as
+``B01001_001E`` next to the geography columns (``county``, ``tract``,
+...) -- so any ``output``/``moe_level`` of a call maps to the same rows.
+``dataset`` is the API dataset path (``"acs/acs5"``, ``"dec/pl"``,
+``"acs/acs1/pums"``, ``"pep/population"``) and ``state`` comes from each
+row's ``state`` column; PUMS partitions have no geography and nation- or
+region-level rows no state.
+
+Fetching new variables for rows already in a partition merges them in as
+new columns, matching rows on their geography columns and predicate columns
+such as ``AGEGROUP`` or ``YEAR`` (or the person keys ``SERIALNO``/``SPORDER``
+for PUMS); re-fetched values replace stored ones.  Rows without a key
+column, e.g. totals stored before a breakdown was fetched, are kept next to
+the rows that have it.
+
+:func:`query` reads the warehouse back with pyarrow's dataset API: the
+partition filters prune directories and a ``filter`` expression on data
+columns is pushed down to the Parquet row groups.
+
+Examples
+--------
+>>> from pypums import get_acs, warehouse
+>>> warehouse.configure_warehouse()  # doctest: +SKIP
+>>> for year in (2021, 2022, 2023):  # doctest: +SKIP
+...     get_acs("county", "B19013_001", state="*", year=year)
+>>> warehouse.query("acs/acs5", state=["CA", "TX"])  # doctest: +SKIP
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from pypums.api.request import normalize_geography, normalize_states
+from pypums.cache import _KeyLock
+from pypums.instrumentation import metrics
+
+# Default root of the warehouse.
+WAREHOUSE_ROOT = Path.home() / ".pypums" / "warehouse"
+
+# Partition columns, outermost first.
+PARTITION_SCHEMA = pa.schema(
+    [
+        ("dataset", pa.string()),
+        ("year", pa.int32()),
+        ("geography", pa.string()),
+        ("state", pa.string()),
+    ]
+)
+
+# Directory name of a missing partition value (pyarrow's default).
+_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Parquet metadata listing the key columns of a partition's rows.
+_KEYS_METADATA = b"pypums.keys"
+
+# Key of partitions holding a single row without key columns.
+_ROW_KEY = "__row__"
+
+# One file per partition; merging rewrites it.
+_PART_FILE = "part-0.parquet"
+
+# Per-partition lock files.  The leading underscore keeps pyarrow's dataset
+# discovery out of the directory.
+_LOCK_DIR = "_locks"
+
+# Seconds a writer waits for another one to finish a partition.
+_LOCK_TIMEOUT_SECONDS = 600.0
+
+_options: dict = {"root": None}
+
+
+def configure_warehouse(
+    enabled: bool = True, root: str | Path = WAREHOUSE_ROOT
+) -> None:
+    """Write every fetched ``get_*`` response to the warehouse, or stop.
+
+    Parameters
+    ----------
+    enabled
+        If False, stop writing to the warehouse (its files are kept).
+    root
+        Directory holding the partitioned dataset (default
+        ``~/.pypums/warehouse``).
+    """
+    _options["root"] = Path(root) if enabled else None
+
+
+def warehouse_root() -> Path | None:
+    """Return the directory written to, or ``None`` if disabled."""
+    return _options["root"]
+
+
+def _partition_value(value: object) -> str:
+    return _NULL_PARTITION if value is None else quote(str(value), safe="")
+
+
+def _partition_dir(
+    root: Path, dataset: str, year: int, geography: str | None, state: str | None
+) -> Path:
+    return (
+        root
+        / f"dataset={_partition_value(dataset)}"
+        / f"year={int(year)}"
+        / f"geography={_partition_value(geography)}"
+        / f"state={_partition_value(state)}"
+    )
+
+
+def _merge(old: pd.DataFrame, new: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Merge *new* rows and columns into *old*, preferring *new* values.
+
+    A key column missing from one frame counts as null for its rows, so
+    e.g. totals and an ``AGEGROUP`` breakdown of them are kept side by
+    side.
+
+    Raises
+    ------
+    ValueError
+        If the keys don't identify the rows of either frame one to one.
+    """
+    keys = [k for k in keys if k in old.columns or k in new.columns]
+    columns = list(dict.fromkeys([*old.columns, *new.columns]))
+    if not keys:
+        # One row per partition, such as a state's totals.
+        keys = [_ROW_KEY]
+        old, new = old.assign(**{_ROW_KEY: 0}), new.assign(**{_ROW_KEY: 0})
+    old_rows = old.reindex(columns=[*dict.fromkeys([*old.columns, *keys])])
+    new_rows = new.reindex(columns=[*dict.fromkeys([*new.columns, *keys])])
+    old_rows, new_rows = old_rows.set_index(keys), new_rows.set_index(keys)
+    if not (old_rows.index.is_unique and new_rows.index.is_unique):
+        matched = "no key columns" if keys == [_ROW_KEY] else keys
+        raise ValueError(
+            f"Rows can't be matched on {matched}; not merging them into the "
+            "stored partition."
+        )
+    merged = new_rows.combine_first(old_rows).reset_index()
+    return merged[[c for c in columns if c in merged.columns]]
+
+
+def _write_partition(
+    directory: Path, df: pd.DataFrame, keys: list[str], root: Path
+) -> None:
+    lock = _KeyLock(
+        root / _LOCK_DIR / f"{hashlib.sha256(str(directory).encode()).hexdigest()}.lock"
+    )
+    lock.acquire(_LOCK_TIMEOUT_SECONDS)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / _PART_FILE
+        with contextlib.suppress(FileNotFoundError):
+            stored = pq.read_table(path)
+            # Key columns of earlier fetches (e.g. a breakdown's AGEGROUP)
+            # still tell their rows apart when this fetch lacks them.
+            raw = (stored.schema.metadata or {}).get(_KEYS_METADATA, b"[]")
+            keys = list(dict.fromkeys([*json.loads(raw), *keys]))
+            df = _merge(stored.to_pandas(), df, keys)
+        keys = [k for k in keys if k in df.columns]
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), _KEYS_METADATA: json.dumps(keys)}
+        )
+        # Dot-prefixed, so dataset discovery skips it until it is renamed.
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    finally:
+        lock.release()
+
+
+def write(
+    df: pd.DataFrame,
+    dataset: str,
+    year: int,
+    geography: str | None = None,
+    keys: Iterable[str] = (),
+    root: str | Path | None = None,
+) -> int:
+    """Merge a raw Census API response frame into the warehouse.
+
+    Called for every fetched ``get_*`` response while the warehouse is
+    enabled; call it directly to load frames fetched some other way.
+
+    Parameters
+    ----------
+    df
+        Rows as returned by the API, with a ``state`` column unless the
+        rows have no state.
+    dataset
+        API dataset path, e.g. ``"acs/acs5"``.
+    year
+        Data year (the vintage, for population estimates).
+    geography
+        Geography level, or ``None`` (PUMS).
+    keys
+        Columns identifying a row within its partition, used to merge new
+        variables into stored rows.
+    root
+        Warehouse directory; defaults to the configured one, then to
+        ``~/.pypums/warehouse``.
+
+    Returns
+    -------
+    int
+        Number of partitions written.
+
+    Raises
+    ------
+    ValueError
+        If *keys* don't identify rows one to one; nothing stored is
+        changed for such a partition.
+    """
+    root = Path(root or warehouse_root() or WAREHOUSE_ROOT)
+    if df.empty:
+        return 0
+    keys = [k for k in keys if k != "state"]
+    if "state" in df.columns:
+        groups = [
+            (None if pd.isna(state) else str(state), rows.drop(columns="state"))
+            for state, rows in df.groupby("state", dropna=False, sort=False)
+        ]
+    else:
+        groups = [(None, df)]
+    for state, rows in groups:
+        directory = _partition_dir(root, dataset, year, geography, state)
+        _write_partition(directory, rows.reset_index(drop=True), keys, root)
+    metrics.increment("warehouse_rows_written_total", len(df))
+    return len(groups)
+
+
+def _values(value: object) -> list | None:
+    if value is None:
+        return None
+    if isinstance(value, str | int):
+        return [value]
+    return list(value)
+
+
+def _unify(schemas: list[pa.Schema]) -> pa.Schema:
+    try:
+        # A column may be int64 in one partition and double in another.
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except TypeError:  # pyarrow < 14
+        return pa.unify_schemas(schemas)
+
+
+def query(
+    dataset: str | Iterable[str] | None = None,
+    year: int | Iterable[int] | None = None,
+    geography: str | Iterable[str] | None = None,
+    state: str | Iterable[str] | None = None,
+    columns: list[str] | None = None,
+    filter: ds.Expression | None = None,
+    root: str | Path | None = None,
+) -> pd.DataFrame:
+    """Read rows from the warehouse across datasets, years and states.
+
+    Partitions not matching *dataset*, *year*, *geography* and *state* are
+    never opened, and *filter* is pushed down to the Parquet files, so
+    only matching row groups are read.  Columns missing from some
+    partitions (variables fetched for some states only) come back as
+    nulls.
+
+    Parameters
+    ----------
+    dataset
+        API dataset path(s), e.g. ``"acs/acs5"``.
+    year
+        Data year(s).
+    geography
+        Geography level(s), e.g. ``"county"``.
+    state
+        State(s) as FIPS codes, abbreviations or names.
+    columns
+        Columns to read, partition columns included; default all.
+    filter
+        Extra :mod:`pyarrow.dataset` expression, e.g.
+        ``pyarrow.dataset.field("B19013_001E") > 100_000``.
+    root
+        Warehouse directory; defaults to the configured one, then to
+        ``~/.pypums/warehouse``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The matching rows with their partition columns.
+
+    Examples
+    --------
+    >>> import pyarrow.dataset as ds
+    >>> query(  # doctest: +SKIP
+    ...     "acs/acs5",
+    ...     year=[2021, 2022, 2023],
+    ...     geography="county",
+    ...     state="CA",
+    ...     columns=["year", "county", "NAME", "B19013_001E"],
+    ...     filter=ds.field("B19013_001E") > 100_000,
+    ... )
+    """
+    root = Path(root or warehouse_root() or WAREHOUSE_ROOT)
+    states = _values(state)
+    if states is not None:
+        states = [normalize_states(s) for s in states]
+    geographies = _values(geography)
+    if geographies is not None:
+        geographies = [normalize_geography(g) for g in geographies]
+
+    expression = None
+    for name, values in (
+        ("dataset", _values(dataset)),
+        ("year", _values(year)),
+        ("geography", geographies),
+        ("state", states),
+    ):
+        if values is not None:
+            clause = ds.field(name).isin(values)
+            expression = clause if expression is None else expression & clause
+
+    partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+    empty = pd.DataFrame(columns=columns or list(PARTITION_SCHEMA.names))
+    if not root.exists():
+        return empty
+    fragments = list(
+        ds.dataset(root, format="parquet", partitioning=partitioning).get_fragments(
+            filter=expression
+        )
+    )
+    if not fragments:
+        return empty
+    # Each file has only the variables fetched for its partition; read them
+    # all under one schema.
+    schema = _unify(
+        [pq.read_schema(fragment.path) for fragment in fragments] + [PARTITION_SCHEMA]
+    )
+    matching = ds.dataset(
+        [fragment.path for fragment in fragments],
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning,
+        partition_base_dir=str(root),
+    )
+    if filter is not None:
+        expression = filter if expression is None else expression & filter
+    return matching.to_table(columns=columns, filter=expression).to_pandas()
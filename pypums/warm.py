@@ -0,0 +1,321 @@
+"""Fill the cache ahead of time from a declarative manifest.
+
+A warming manifest lists ``get_*`` calls so caches can be filled before
+anyone needs them (e.g. by a nightly job), leaving interactive users with
+cache hits only.  It is a YAML (or JSON) file with optional ``defaults``
+merged into every entry of ``requests``::
+
+    defaults:
+      year: 2023
+    requests:
+      - function: get_acs
+        geography: county
+        variables: [B19013_001, B01003_001]
+        state: [CA, TX]
+      - function: get_acs
+        geography: county
+        variables: B25077_001
+        state: CA
+      - function: get_pums
+        variables: [AGEP, SEX, WAGP]
+        state: CA
+        survey: acs1
+
+A bare list of entries is accepted too.  Before anything is fetched the
+entries are normalized (spellings of states, geographies and variable
+lists, defaults filled in) and deduplicated, then compatible ones are
+merged: calls differing only in their variables become one call for the
+union of the variables, and calls differing only in their states one call
+for every state.  Later calls for any subset are answered from the cached
+superset (see :mod:`pypums.api.query`).
+
+:func:`warm_cache` runs the merged calls on a thread pool; their requests
+go through the shared rate limiter (see
+:func:`pypums.api.client.configure_rate_limit`).
+"""
+
+import inspect
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pypums.api.request import (
+    normalize_counties,
+    normalize_filters,
+    normalize_geography,
+    normalize_states,
+    normalize_variables,
+)
+from pypums.instrumentation import add_hook, remove_hook
+
+# Functions a manifest may call.
+WARM_FUNCTIONS = ("get_acs", "get_decennial", "get_pums", "get_estimates", "get_flows")
+
+# Functions whose ``state`` accepts a list, so calls can be merged by state.
+_STATE_LISTS = frozenset({"get_acs", "get_decennial", "get_pums", "get_estimates"})
+
+# Arguments set by the warmer itself rather than the manifest.
+_CONTROLLED = ("cache_table", "cache", "show_call", "key")
+
+# Arguments holding codes that only make sense within one state.
+_WITHIN_STATE = ("county", "puma", "msa")
+
+
+def _function(name: str) -> Callable:
+    import pypums
+
+    return getattr(pypums, name)
+
+
+@dataclass(frozen=True)
+class WarmSpec:
+    """One normalized ``get_*`` call of a warming manifest.
+
+    Build instances with :func:`normalize_spec`.
+
+    Parameters
+    ----------
+    function
+        One of :data:`WARM_FUNCTIONS`.
+    arguments
+        Every argument of the call, defaults included, except the cache
+        and key arguments the warmer sets.
+    """
+
+    function: str
+    arguments: dict = field(default_factory=dict)
+
+    def identity(self, *exclude: str) -> str:
+        """A string equal for calls that match apart from *exclude*."""
+        arguments = {k: v for k, v in self.arguments.items() if k not in exclude}
+        return json.dumps([self.function, arguments], sort_keys=True, default=str)
+
+    def __str__(self) -> str:
+        shown = ", ".join(
+            f"{name}={value!r}"
+            for name, value in self.arguments.items()
+            if value is not None
+        )
+        return f"{self.function}({shown})"
+
+
+def normalize_spec(entry: dict, defaults: dict | None = None) -> WarmSpec:
+    """Validate a manifest entry and normalize it into a :class:`WarmSpec`.
+
+    Examples
+    --------
+    >>> spec = normalize_spec(
+    ...     {"function": "get_acs", "geography": "County", "state": "California",
+    ...      "variables": ["B19013_001", "B01003_001", "B19013_001"]},
+    ... )
+    >>> spec.arguments["geography"], spec.arguments["state"]
+    ('county', '06')
+    >>> spec.arguments["variables"]
+    ['B01003_001', 'B19013_001']
+    """
+    entry = {**(defaults or {}), **entry}
+    name = entry.pop("function", None)
+    if name not in WARM_FUNCTIONS:
+        raise ValueError(f"function must be one of {WARM_FUNCTIONS}, got {name!r}")
+    for argument in _CONTROLLED:
+        entry.pop(argument, None)
+    try:
+        bound = inspect.signature(_function(name)).bind(**entry)
+    except TypeError as exc:
+        raise ValueError(f"Invalid {name} entry {entry!r}: {exc}") from exc
+    bound.apply_defaults()
+    arguments = {k: v for k, v in bound.arguments.items() if k not in _CONTROLLED}
+
+    if arguments.get("geography") is not None:
+        arguments["geography"] = normalize_geography(arguments["geography"])
+    if arguments.get("state") is not None:
+        arguments["state"] = _unlisted(normalize_states(arguments["state"]))
+    if arguments.get("county") is not None:
+        arguments["county"] = _unlisted(normalize_counties(arguments["county"]))
+    if arguments.get("variables") is not None:
+        arguments["variables"] = list(normalize_variables(arguments["variables"]))
+    if arguments.get("variables_filter"):
+        arguments["variables_filter"] = normalize_filters(arguments["variables_filter"])
+    return WarmSpec(name, arguments)
+
+
+def _unlisted(value: str | tuple[str, ...]) -> str | list[str]:
+    return list(value) if isinstance(value, tuple) else value
+
+
+def _listed(value: str | list[str]) -> list[str]:
+    return [value] if isinstance(value, str) else list(value)
+
+
+def load_manifest(path: str | Path) -> list[WarmSpec]:
+    """Read a warming manifest into normalized specs.
+
+    ``.json`` files are parsed as JSON, everything else as YAML (which
+    needs PyYAML: ``pip install 'pypums[yaml]'``).
+
+    Raises
+    ------
+    ValueError
+        If the manifest or one of its entries is invalid.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix.lower() == ".json":
+        document = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError(
+                "Reading YAML manifests requires PyYAML. "
+                "Install with: pip install 'pypums[yaml]' (or use a .json manifest)"
+            ) from exc
+        document = yaml.safe_load(text)
+
+    if isinstance(document, list):
+        defaults, entries = {}, document
+    elif isinstance(document, dict):
+        defaults = document.get("defaults") or {}
+        entries = document.get("requests") or []
+    else:
+        raise ValueError(f"{path} must hold a list of requests or a mapping.")
+    if not all(isinstance(entry, dict) for entry in [defaults, *entries]):
+        raise ValueError(f"Every entry of {path} must be a mapping.")
+    return [normalize_spec(entry, defaults) for entry in entries]
+
+
+def _merge_on(
+    specs: list[WarmSpec], name: str, mergeable: Callable[[WarmSpec], bool]
+) -> list[WarmSpec]:
+    """Merge specs equal apart from argument *name* by taking its union."""
+    groups: dict[str, list[WarmSpec]] = {}
+    for spec in specs:
+        token = spec.identity(name) if mergeable(spec) else spec.identity()
+        groups.setdefault(token, []).append(spec)
+    merged = []
+    for members in groups.values():
+        if len(members) == 1:
+            merged.append(members[0])
+            continue
+        values = sorted({v for m in members for v in _listed(m.arguments[name])})
+        value = values[0] if len(values) == 1 and name == "state" else values
+        merged.append(
+            WarmSpec(members[0].function, {**members[0].arguments, name: value})
+        )
+    return merged
+
+
+def plan_warming(specs: Iterable[WarmSpec]) -> list[WarmSpec]:
+    """Deduplicate *specs* and merge the compatible ones.
+
+    Examples
+    --------
+    >>> specs = [
+    ...     normalize_spec({"function": "get_acs", "geography": "county",
+    ...                     "state": state, "variables": variables})
+    ...     for state, variables in [("CA", "B01003_001"), ("CA", "B19013_001"),
+    ...                              ("TX", ["B01003_001", "B19013_001"]),
+    ...                              ("ca", "B19013_001")]
+    ... ]
+    >>> [spec.arguments["state"] for spec in plan_warming(specs)]
+    [['06', '48']]
+    """
+    unique = list({spec.identity(): spec for spec in specs}.values())
+    by_variables = _merge_on(
+        unique,
+        "variables",
+        lambda spec: (
+            spec.arguments.get("variables") is not None
+            and spec.arguments.get("table") is None
+        ),
+    )
+    return _merge_on(
+        by_variables,
+        "state",
+        lambda spec: (
+            spec.function in _STATE_LISTS
+            and spec.arguments.get("state") not in (None, "*")
+            and all(spec.arguments.get(a) is None for a in _WITHIN_STATE)
+        ),
+    )
+
+
+def _run(spec: WarmSpec, refresh: bool, key: str | None) -> None:
+    extra = {"key": key} if key else {}
+    _function(spec.function)(
+        **spec.arguments,
+        cache_table=True,
+        cache="refresh" if refresh else "default",
+        **extra,
+    )
+
+
+def warm_cache(
+    specs: Iterable[WarmSpec],
+    concurrency: int = 4,
+    refresh: bool = False,
+    key: str | None = None,
+    progress: Callable[[int, int, WarmSpec, BaseException | None], None] | None = None,
+) -> dict:
+    """Run the merged *specs* with caching on, filling the cache.
+
+    Entries already cached and fresh are left alone (they cost a cache
+    lookup) unless *refresh* is set.
+
+    Parameters
+    ----------
+    specs
+        Normalized calls, e.g. from :func:`load_manifest`.
+    concurrency
+        Calls run at once.  Their API requests also go through the shared
+        rate limiter.
+    refresh
+        If True, re-fetch every call even when it is cached.
+    key
+        Census API key; defaults to ``census_api_key()``.
+    progress
+        Called after each call finishes with the number done, the total,
+        the spec and its exception (``None`` on success).
+
+    Returns
+    -------
+    dict
+        ``specs`` (manifest entries), ``calls`` (after merging),
+        ``succeeded``, ``failed`` (``(spec, exception)`` pairs), ``bytes``
+        (API response bytes received) and ``seconds``.
+    """
+    specs = list(specs)
+    planned = plan_warming(specs)
+    received = [0]
+    lock = threading.Lock()
+
+    def count(**fields) -> None:
+        with lock:
+            received[0] += fields["bytes"]
+
+    failed: list[tuple[WarmSpec, BaseException]] = []
+    start = time.perf_counter()
+    add_hook("on_response", count)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(_run, spec, refresh, key): spec for spec in planned}
+            for done, future in enumerate(as_completed(futures), 1):
+                spec, error = futures[future], future.exception()
+                if error is not None:
+                    failed.append((spec, error))
+                if progress is not None:
+                    progress(done, len(planned), spec, error)
+    finally:
+        remove_hook("on_response", count)
+    return {
+        "specs": len(specs),
+        "calls": len(planned),
+        "succeeded": len(planned) - len(failed),
+        "failed": failed,
+        "bytes": received[0],
+        "seconds": time.perf_counter() - start,
+    }
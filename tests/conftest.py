@@ -139,3 +139,36 @@ def flows_api_response():
             "013",
         ],
     ]
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP client plumbing
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def install_transport():
+    """Route the shared Census API client through an ``httpx.MockTransport``.
+
+    Call the returned function with a request handler.  Client options,
+    the rate limiter, retry policy, circuit breakers and cassette are reset
+    afterwards.
+    """
+    import httpx
+
+    from pypums.api import client
+
+    saved = dict(client._client_options)
+
+    def install(handler):
+        client.configure_client(transport=httpx.MockTransport(handler))
+
+    yield install
+
+    client.close_client()
+    client._client_options.clear()
+    client._client_options.update(saved)
+    client.configure_rate_limit()
+    client.configure_retries()
+    client.configure_circuit_breaker()
+    client.configure_cassette(None)
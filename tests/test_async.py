@@ -0,0 +1,144 @@
+"""Tests for the asyncio ``get_*_async`` functions.
+
+Phase 1 — Core Data Functions.
+
+The async functions share planning and formatting with their sync
+counterparts, so for the same API response they must return identical
+frames.  They are plain coroutines and can be awaited from an event loop
+that is already running (as in Jupyter).
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pandas as pd
+import pytest
+
+from pypums import (
+    get_acs,
+    get_acs_async,
+    get_decennial,
+    get_decennial_async,
+    get_estimates,
+    get_estimates_async,
+    get_flows,
+    get_flows_async,
+    get_pums,
+    get_pums_async,
+)
+from pypums.api import client
+
+pytestmark = pytest.mark.phase1
+
+
+def _run_both(module, sync_func, async_func, response, **kwargs):
+    with patch(f"pypums.{module}._call_census_api", return_value=response):
+        sync_df = sync_func(**kwargs)
+    with patch(
+        f"pypums.{module}._call_census_api_async",
+        new=AsyncMock(return_value=response),
+    ):
+        async_df = asyncio.run(async_func(**kwargs))
+    return sync_df, async_df
+
+
+def test_acs_async_matches_sync(acs_api_response_tidy, fake_api_key):
+    sync_df, async_df = _run_both(
+        "acs",
+        get_acs,
+        get_acs_async,
+        acs_api_response_tidy,
+        geography="county",
+        variables=["B01001_001", "B02001_002"],
+        state="CA",
+        key=fake_api_key,
+    )
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_decennial_async_matches_sync(decennial_api_response, fake_api_key):
+    sync_df, async_df = _run_both(
+        "decennial",
+        get_decennial,
+        get_decennial_async,
+        decennial_api_response,
+        geography="state",
+        variables=["P1_001N", "P1_002N"],
+        key=fake_api_key,
+    )
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_estimates_async_matches_sync(estimates_api_response, fake_api_key):
+    sync_df, async_df = _run_both(
+        "estimates",
+        get_estimates,
+        get_estimates_async,
+        estimates_api_response,
+        geography="state",
+        variables=["POP_2023", "DENSITY_2023"],
+        key=fake_api_key,
+    )
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_flows_async_matches_sync(flows_api_response, fake_api_key):
+    sync_df, async_df = _run_both(
+        "flows",
+        get_flows,
+        get_flows_async,
+        flows_api_response,
+        geography="county",
+        state="CA",
+        key=fake_api_key,
+    )
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_pums_async_multi_state(pums_api_response, fake_api_key):
+    sync_df, async_df = _run_both(
+        "pums",
+        get_pums,
+        get_pums_async,
+        pums_api_response,
+        variables=["AGEP", "SEX"],
+        state=["CA", "TX"],
+        key=fake_api_key,
+    )
+    assert len(async_df) == 2 * (len(pums_api_response) - 1)
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_gather_inside_running_loop(acs_api_response_tidy, fake_api_key):
+    """Many queries can be fanned out from a loop that is already running."""
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(
+                get_acs_async("county", "B01001_001", state=state, key=fake_api_key)
+                for state in ("CA", "TX", "NY")
+            )
+        )
+
+    with patch(
+        "pypums.acs._call_census_api_async",
+        new=AsyncMock(return_value=acs_api_response_tidy),
+    ) as mock_call:
+        frames = asyncio.run(fan_out())
+    assert len(frames) == 3
+    assert mock_call.await_count == 3
+
+
+def test_async_client_per_event_loop(install_transport):
+    """Each event loop gets its own AsyncClient bound to that loop."""
+    install_transport(lambda request: httpx.Response(200, json=[["a"]]))
+
+    async def call():
+        rows = await client.call_census_api_async("https://example.test", {})
+        return rows, client.get_async_client()
+
+    rows, first = asyncio.run(call())
+    _, second = asyncio.run(call())
+    assert rows == [["a"]]
+    assert first is not second
@@ -8,8 +8,12 @@ store → retrieve contract, TTL expiration, and clearing.
 """
 
 import time
+from functools import partial
+from pathlib import Path
 
+import httpx
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 from pypums.cache import CensusCache
@@ -54,3 +58,892 @@ def test_cache_clear(cache):
     cache.clear()
     assert cache.get("key1") is None
     assert cache.get("key2") is None
+
+
+# ---------------------------------------------------------------------------
+# In-memory LRU tier
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def memory(monkeypatch):
+    """A private in-memory tier so tests don't share the process-wide one."""
+    from pypums import cache as cache_module
+
+    tier = cache_module.MemoryCache()
+    monkeypatch.setattr(cache_module, "_memory_cache", tier)
+    return tier
+
+
+def test_memory_tier_serves_hits_without_disk(cache_dir, memory):
+    cache = CensusCache(cache_dir)
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    cache.set("k", df)
+    for path in cache_dir.iterdir():
+        path.unlink()
+    pd.testing.assert_frame_equal(cache.get("k"), df)
+    assert memory.stats()["hits"] == 1
+
+
+def test_disk_hits_are_promoted(cache_dir, memory):
+    df = pd.DataFrame({"a": [1]})
+    CensusCache(cache_dir, memory=False).set("k", df)
+    cache = CensusCache(cache_dir)
+    cache.get("k")
+    cache.get("k")
+    stats = memory.stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+
+
+def test_cached_frames_cannot_be_mutated(cache_dir, memory):
+    cache = CensusCache(cache_dir)
+    df = pd.DataFrame({"a": [1, 2]})
+    cache.set("k", df)
+    df.loc[0, "a"] = 99
+    hit = cache.get("k")
+    hit.loc[1, "a"] = 99
+    assert cache.get("k")["a"].tolist() == [1, 2]
+
+
+def test_memory_tier_evicts_least_recently_used(memory):
+    frame = pd.DataFrame({"a": range(100)})
+    memory.resize(int(frame.memory_usage(deep=True).sum()) * 2)
+    memory.put(("d", "a"), frame)
+    memory.put(("d", "b"), frame)
+    memory.get(("d", "a"))
+    memory.put(("d", "c"), frame)
+    assert memory.get(("d", "b")) is None
+    assert memory.get(("d", "a")) is not None
+    stats = memory.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_memory_tier_respects_ttl(cache_dir, memory):
+    cache = CensusCache(cache_dir)
+    cache.set("short_lived", pd.DataFrame({"a": [1]}), ttl_seconds=0)
+    time.sleep(0.05)
+    assert cache.get("short_lived") is None
+    assert memory.stats()["entries"] == 0
+
+
+def test_clear_drops_memory_entries_for_that_directory(tmp_path, memory):
+    first = CensusCache(tmp_path / "first")
+    second = CensusCache(tmp_path / "second")
+    df = pd.DataFrame({"a": [1]})
+    first.set("k", df)
+    second.set("k", df)
+    first.clear()
+    assert first.get("k") is None
+    assert second.get("k") is not None
+
+
+def test_disabled_memory_tier(cache_dir, memory):
+    memory.resize(0)
+    cache = CensusCache(cache_dir)
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    assert cache.get("k") is not None
+    assert memory.stats()["entries"] == 0
+    with pytest.raises(ValueError, match="max_bytes must be >= 0"):
+        memory.resize(-1)
+
+
+# ---------------------------------------------------------------------------
+# Disk budget, eviction and sweeping
+# ---------------------------------------------------------------------------
+
+
+def _sized_frame(rows: int = 2000) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(rows), "b": [f"value {i}" for i in range(rows)]})
+
+
+def _entry_size(cache_dir) -> int:
+    return sum(p.stat().st_size for p in cache_dir.glob("*.parquet"))
+
+
+def test_budget_evicts_least_recently_used(cache_dir, memory):
+    cache = CensusCache(cache_dir)
+    cache.set("acs_2023_a", _sized_frame())
+    budget = _entry_size(cache_dir) * 2
+    cache = CensusCache(cache_dir, memory=False, max_bytes=budget)
+    cache.set("acs_2023_b", _sized_frame())
+    time.sleep(0.01)
+    cache.get("acs_2023_a")
+    cache.set("acs_2023_c", _sized_frame())
+    assert cache.get("acs_2023_b") is None
+    assert cache.get("acs_2023_a") is not None
+    assert _entry_size(cache_dir) <= budget
+
+
+def test_lfu_policy_keeps_frequently_hit_entries(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    for key in ("acs_2023_a", "acs_2023_b"):
+        cache.set(key, _sized_frame())
+    cache.get("acs_2023_a")
+    cache.get("acs_2023_a")
+    cache.get("acs_2023_b")
+    result = cache.prune(max_bytes=_entry_size(cache_dir) // 2, policy="lfu")
+    assert result["removed"] == 1
+    assert cache.get("acs_2023_a") is not None
+
+
+def test_sweep_removes_expired_entries(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("acs_2023_old", _sized_frame(), ttl_seconds=0)
+    cache.set("acs_2023_new", _sized_frame())
+    time.sleep(0.05)
+    result = cache.sweep()
+    assert result["removed"] == 1
+    assert result["freed_bytes"] > 0
+    assert [e["key"] for e in cache.entries()] == ["acs_2023_new"]
+
+
+def test_stats_per_dataset(cache_dir, memory):
+    cache = CensusCache(cache_dir)
+    cache.set("acs_2023_a", _sized_frame())
+    cache.set("pums_vars_2023_acs5", _sized_frame())
+    cache.get("acs_2023_a")  # memory hit
+    cache.get("acs_2023_missing")
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == _entry_size(cache_dir)
+    assert set(stats["datasets"]) == {"acs", "pums_vars"}
+    assert stats["datasets"]["acs"]["hit_rate"] == 0.5
+    assert stats["datasets"]["pums_vars"]["hit_rate"] is None
+
+
+def test_legacy_sidecars_are_imported(cache_dir):
+    import hashlib
+    import json
+
+    name = hashlib.sha256(b"acs_2023_old").hexdigest()
+    pd.DataFrame({"a": [1]}).to_parquet(cache_dir / f"{name}.parquet")
+    (cache_dir / f"{name}.meta.json").write_text(
+        json.dumps({"created_at": time.time(), "ttl_seconds": None})
+    )
+    (cache_dir / "stats.json").write_text(json.dumps({"acs": {"hits": 3, "misses": 1}}))
+
+    cache = CensusCache(cache_dir, memory=False)
+    assert list(cache_dir.glob("*.meta.json")) == []
+    assert not (cache_dir / "stats.json").exists()
+    (entry,) = cache.entries()
+    assert entry["name"] == name
+    assert cache.get("acs_2023_old")["a"].tolist() == [1]
+    assert cache.stats()["datasets"]["acs"]["hits"] == 4
+
+
+# ---------------------------------------------------------------------------
+# SQLite index
+# ---------------------------------------------------------------------------
+
+
+def test_index_records_request_parameters(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    df = pd.DataFrame({"a": [1]})
+    cache.set("acs_2022_a", df, params={"year": 2022, "geography": "county"})
+    cache.set("acs_2022_b", df, params={"year": 2022, "geography": "tract"})
+    cache.set("acs_2023_c", df, params={"year": 2023, "geography": "county"})
+    (entry,) = cache.find("acs", geography="county", year=2022)
+    assert entry["key"] == "acs_2022_a"
+    assert entry["params"] == {"geography": "county", "year": 2022}
+    assert len(cache.find(geography="county")) == 2
+    assert cache.find("dec", geography="county") == []
+
+
+def test_find_matches_list_parameters(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("acs_2022_a", pd.DataFrame({"a": [1]}), params={"state": ["06", "48"]})
+    assert len(cache.find(state=["06", "48"])) == 1
+    assert cache.find(state=["06"]) == []
+
+
+def test_lookup_uses_index_not_sidecars(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    assert (cache_dir / "index.db").exists()
+    assert list(cache_dir.glob("*.meta.json")) == []
+    (entry,) = cache.entries()
+    cache.get("k")
+    (after,) = cache.entries()
+    assert after["hits"] == entry["hits"] + 1
+    assert after["last_access"] >= entry["last_access"]
+
+
+def test_reads_batch_index_writes(cache_dir):
+    import sqlite3
+
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("acs_2023_k", pd.DataFrame({"a": [1]}))
+    for _ in range(3):
+        cache.get("acs_2023_k")
+    cache.get("acs_2023_missing")
+    with sqlite3.connect(cache_dir / "index.db") as db:
+        assert db.execute("SELECT hits FROM entries").fetchone() == (0,)
+        assert db.execute("SELECT COUNT(*) FROM lookups").fetchone() == (0,)
+    (entry,) = cache.entries()
+    assert entry["hits"] == 3
+    stats = cache.stats()["datasets"]["acs"]
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_deleted_data_file_is_a_miss(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    for path in cache_dir.glob("*.parquet"):
+        path.unlink()
+    assert cache.get("k") is None
+    assert cache.entries() == []
+
+
+def test_invalid_policy_and_size():
+    from pypums.cache import configure_disk_cache, parse_size
+
+    with pytest.raises(ValueError, match="policy must be one of"):
+        configure_disk_cache(policy="fifo")
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("lots")
+
+
+def test_get_acs_results_are_queryable(tmp_path, monkeypatch, fake_api_key):
+    from pypums import acs, get_acs
+
+    rows = [
+        ["NAME", "B01001_001E", "B01001_001M", "state", "county"],
+        ["Los Angeles County, California", "10014009", "0", "06", "037"],
+    ]
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(acs, "_call_census_api", lambda url, params: rows)
+    get_acs(
+        "county",
+        "B01001_001",
+        state="CA",
+        year=2022,
+        cache_table=True,
+        key=fake_api_key,
+    )
+    get_acs("state", "B01001_001", year=2022, cache_table=True, key=fake_api_key)
+
+    (entry,) = CensusCache(tmp_path).find(
+        "acs", geography="county", year=2022, survey="acs5"
+    )
+    assert entry["params"]["variables"] == ["B01001_001"]
+
+
+def test_output_variants_share_one_raw_payload(
+    tmp_path, monkeypatch, install_transport, fake_api_key
+):
+    from pypums import acs, get_acs
+
+    body = (
+        b'[["NAME","B01001_001E","B01001_001M","state"],\n'
+        b'["California","39029342","1200","06"],\n'
+        b'["Texas","30503301","1500","48"]]'
+    )
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=body)
+
+    install_transport(handler)
+    query = partial(get_acs, "state", "B01001_001", key=fake_api_key)
+    fresh = {
+        (output, moe): query(output=output, moe_level=moe)
+        for output in ("tidy", "wide")
+        for moe in (90, 95)
+    }
+    calls.clear()
+
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    for (output, moe), expected in fresh.items():
+        cached = query(output=output, moe_level=moe, cache_table=True)
+        pd.testing.assert_frame_equal(cached, expected)
+    assert len(calls) == 1
+
+    cache = CensusCache(tmp_path)
+    (raw,) = cache.find("acs", layer="raw")
+    assert "key" not in raw["params"]["requests"][0][1]
+    assert len(cache.find("acs", geography="state")) == 4
+
+
+def _table_server(calls):
+    """Answer ACS requests for any subset of a small B19001 table."""
+    columns = ["GEO_ID", "NAME"] + [
+        f"B19001_00{i}{s}" for i in (1, 2, 3) for s in ("E", "M")
+    ]
+    rows = {
+        "037": ["0500000US06037", "Los Angeles County"] + ["10", "1", "2", "1"] * 2,
+        "059": ["0500000US06059", "Orange County"] + ["20", "2", "4", "2"] * 2,
+    }
+
+    def handler(request):
+        params = dict(request.url.params)
+        calls.append(params)
+        get = params["get"].split(",")
+        names = [c for c in columns if c in get or "group(B19001)" in get]
+        body = [names + ["state", "county"]]
+        for county, values in rows.items():
+            row = dict(zip(columns, values, strict=False))
+            body.append([row[n] for n in names] + ["06", county])
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_variable_subsets_are_read_from_cached_tables(
+    tmp_path, monkeypatch, install_transport, fake_api_key
+):
+    from pypums import acs, get_acs
+
+    calls = []
+    install_transport(_table_server(calls))
+    query = partial(get_acs, "county", state="CA", output="wide", key=fake_api_key)
+    expected = query(["B19001_002", "B19001_001"])
+
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    query(table="B19001", cache_table=True)
+    calls.clear()
+    subset = query(["B19001_002", "B19001_001"], cache_table=True)
+    assert calls == []
+    pd.testing.assert_frame_equal(subset, expected)
+
+    (table,) = CensusCache(tmp_path).find("acs", layer="raw")
+    assert {"B19001_001E", "B19001_003M", "county"} <= set(table["columns"])
+
+    # Another parent geography is not covered.
+    query(["B19001_001"], state="TX", cache_table=True)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("broad", "narrow"),
+    [
+        ({"geography": "tract", "state": "DE", "county": "*"}, {"county": "003"}),
+        ({"geography": "county", "state": "*"}, {"state": "DE"}),
+        (
+            {"geography": "county", "state": ["DE", "MD", "CA"]},
+            {"state": ["CA", "DE"]},
+        ),
+    ],
+)
+def test_nested_geographies_are_filtered_from_broader_entries(
+    tmp_path, monkeypatch, install_transport, fake_api_key, broad, narrow
+):
+    from pypums import acs, get_acs
+    from pypums.api import client
+    from pypums.api.stub import StubCensusServer
+
+    client.configure_rate_limit(rate=None)
+    with StubCensusServer(rows_per_geography=3) as server:
+        client.configure_client(api_base=server.url)
+        query = partial(get_acs, variables="B01001_001", key=fake_api_key)
+        narrow = {**broad, **narrow}
+        expected = query(**narrow)
+
+        monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+        query(**broad, cache_table=True)
+        sent = server.stats()["requests"]
+        served = query(**narrow, cache_table=True)
+        assert server.stats()["requests"] == sent
+
+    pd.testing.assert_frame_equal(served, expected)
+    assert not served.empty
+
+
+def test_column_pruned_get(cache):
+    cache.set("k", pd.DataFrame({"a": [1], "b": [2], "c": [3]}))
+    assert list(cache.get("k", columns=["c", "a"]).columns) == ["c", "a"]
+    (entry,) = cache.entries()
+    assert entry["columns"] == ["a", "b", "c"]
+
+
+def test_index_gains_columns_field(cache_dir):
+    import sqlite3
+
+    with sqlite3.connect(cache_dir / "index.db") as db:
+        db.execute(
+            "CREATE TABLE entries (name TEXT PRIMARY KEY, key TEXT NOT NULL, "
+            "dataset TEXT NOT NULL, params TEXT, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, ttl_seconds REAL, expires_at REAL, "
+            "last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    assert cache.get("k", columns=["a"])["a"].tolist() == [1]
+
+
+# ---------------------------------------------------------------------------
+# Atomic writes and per-key locking
+# ---------------------------------------------------------------------------
+
+_WORKER = """
+import sys, time
+from pathlib import Path
+import pandas as pd
+from pypums.cache import CensusCache
+
+cache_dir, log = Path(sys.argv[1]), Path(sys.argv[2])
+
+def fetch():
+    with log.open("a") as f:
+        f.write("fetch\\n")
+    time.sleep(0.5)
+    return pd.DataFrame({"a": range(1000)})
+
+df = CensusCache(cache_dir).get_or_fetch("acs_2023_shared", fetch)
+assert len(df) == 1000
+"""
+
+
+def test_processes_fetch_each_cold_key_once(tmp_path):
+    import subprocess
+    import sys
+
+    cache_dir, log = tmp_path / "cache", tmp_path / "fetches.log"
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _WORKER, str(cache_dir), str(log)],
+            stderr=subprocess.PIPE,
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        _, err = worker.communicate(timeout=60)
+        assert worker.returncode == 0, err.decode()
+    assert log.read_text().count("fetch") == 1
+    stats = CensusCache(cache_dir).stats()["datasets"]["acs"]
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_threads_fetch_each_cold_key_once(cache_dir, memory):
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return pd.DataFrame({"a": [1]})
+
+    cache = CensusCache(cache_dir)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(lambda _: cache.get_or_fetch("k", fetch), range(8)))
+    assert len(calls) == 1
+    assert all(df["a"].tolist() == [1] for df in frames)
+
+
+def test_failed_fetch_releases_the_lock(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+
+    def broken():
+        raise RuntimeError("API down")
+
+    with pytest.raises(RuntimeError, match="API down"):
+        cache.get_or_fetch("k", broken)
+    df = cache.get_or_fetch("k", lambda: pd.DataFrame({"a": [1]}), timeout=1)
+    assert df["a"].tolist() == [1]
+
+
+def test_lock_timeout_runs_unlocked(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    with cache.lock("k") as held, cache.lock("k", timeout=0.05) as also_held:
+        assert held and not also_held
+
+
+def test_failed_write_leaves_no_partial_file(cache_dir, monkeypatch):
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}))
+
+    def torn(table, where, *args, **kwargs):
+        Path(where).write_bytes(b"PAR1 torn")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pq, "write_table", torn)
+    with pytest.raises(OSError, match="disk full"):
+        cache.set("k", pd.DataFrame({"a": [2]}))
+    monkeypatch.undo()
+    assert cache.get("k")["a"].tolist() == [1]
+    assert list(cache_dir.glob("*.tmp")) == []
+
+
+def test_get_or_fetch_async(cache_dir):
+    import asyncio
+
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return pd.DataFrame({"a": [1]})
+
+    async def main():
+        cache = CensusCache(cache_dir, memory=False)
+        return await asyncio.gather(
+            *(cache.get_or_fetch_async("k", fetch) for _ in range(4))
+        )
+
+    frames = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(df["a"].tolist() == [1] for df in frames)
+
+
+def _counting(calls, value):
+    def fetch():
+        calls.append(value)
+        return pd.DataFrame({"a": [value]})
+
+    return fetch
+
+
+def test_stale_ok_serves_expired_entries_and_revalidates(cache_dir):
+    from pypums.cache import wait_for_revalidation
+
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}), ttl_seconds=0)
+    time.sleep(0.05)
+    calls = []
+    df = cache.get_or_fetch("k", _counting(calls, 2), ttl_seconds=60, policy="stale-ok")
+    assert df["a"].tolist() == [1]
+    assert wait_for_revalidation(timeout=5)
+    assert calls == [2]
+    assert cache.get("k")["a"].tolist() == [2]
+
+
+def test_async_revalidation_closes_its_api_client(cache_dir):
+    import asyncio
+
+    from pypums.api import client
+    from pypums.cache import wait_for_revalidation
+
+    clients = []
+
+    async def fetch():
+        clients.append(client.get_async_client())
+        return pd.DataFrame({"a": [2]})
+
+    cache = CensusCache(cache_dir, memory=False)
+    cache.set("k", pd.DataFrame({"a": [1]}), ttl_seconds=0)
+    time.sleep(0.05)
+    df = asyncio.run(cache.get_or_fetch_async("k", fetch, policy="stale-ok"))
+    assert df["a"].tolist() == [1]
+    assert wait_for_revalidation(timeout=5)
+    assert cache.get("k")["a"].tolist() == [2]
+    assert [c.is_closed for c in clients] == [True]
+
+
+def test_offline_reads_stale_entries_and_never_fetches(cache_dir):
+    from pypums.cache import CacheMiss
+
+    cache = CensusCache(cache_dir, memory=False)
+    calls = []
+    with pytest.raises(CacheMiss, match="offline"):
+        cache.get_or_fetch("k", _counting(calls, 1), policy="offline")
+    cache.set("k", pd.DataFrame({"a": [1]}), ttl_seconds=0)
+    time.sleep(0.05)
+    df = cache.get_or_fetch("k", _counting(calls, 2), policy="offline")
+    assert df["a"].tolist() == [1]
+    assert calls == []
+
+
+def test_refresh_and_bypass(cache_dir):
+    cache = CensusCache(cache_dir, memory=False)
+    calls = []
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    df = cache.get_or_fetch("k", _counting(calls, 2), policy="refresh")
+    assert df["a"].tolist() == [2]
+    assert cache.get("k")["a"].tolist() == [2]
+    df = cache.get_or_fetch("k", _counting(calls, 3), policy="bypass")
+    assert df["a"].tolist() == [3]
+    assert cache.get("k")["a"].tolist() == [2]
+    assert calls == [2, 3]
+
+
+def test_get_acs_cache_policies(tmp_path, monkeypatch, install_transport, fake_api_key):
+    from pypums import acs, get_acs
+    from pypums.cache import CacheMiss, configure_cache_policy
+
+    body = (
+        b'[["NAME","B01001_001E","B01001_001M","state"],\n'
+        b'["California","39029342","1200","06"]]'
+    )
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=body)
+
+    install_transport(handler)
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    query = partial(get_acs, "state", "B01001_001", key=fake_api_key)
+
+    with pytest.raises(CacheMiss):
+        query(cache="offline")
+    assert calls == []
+
+    fetched = query(cache="refresh")
+    assert len(calls) == 1
+    configure_cache_policy("offline")
+    try:
+        pd.testing.assert_frame_equal(query(), fetched)
+        pd.testing.assert_frame_equal(query(output="wide"), query(output="wide"))
+        query(cache="bypass")
+    finally:
+        configure_cache_policy()
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError, match="cache must be one of"):
+        query(cache="sometimes")
+
+
+# ---------------------------------------------------------------------------
+# Export/import bundles and read-only caches
+# ---------------------------------------------------------------------------
+
+
+def _fill_for_export(root):
+    acs = CensusCache(root / "api", memory=False)
+    acs.set("acs_2023_a", pd.DataFrame({"a": [1]}), params={"year": 2023})
+    acs.set(
+        "acs_2022_b",
+        pd.DataFrame({"a": [2]}),
+        params={"year": 2022, "geography": "county"},
+    )
+    acs.set("acs_2023_old", pd.DataFrame({"a": [3]}), ttl_seconds=0)
+    CensusCache(root / "variables", memory=False).set(
+        "variables_2023_acs5", pd.DataFrame({"name": ["B01001_001E"]})
+    )
+
+
+def test_export_import_round_trip(tmp_path):
+    from pypums.cache import export_cache, import_cache
+
+    _fill_for_export(tmp_path / "src")
+    time.sleep(0.05)
+    bundle = tmp_path / "bundle.tar.gz"
+    manifest = export_cache(bundle, tmp_path / "src")
+    assert len(manifest["entries"]) == 3  # the expired entry is left out
+
+    result = import_cache(bundle, tmp_path / "dst")
+    assert result["imported"] == 3
+    imported = CensusCache(tmp_path / "dst" / "api", memory=False)
+    assert imported.get("acs_2022_b")["a"].tolist() == [2]
+    assert imported.find("acs", geography="county")[0]["key"] == "acs_2022_b"
+    variables = CensusCache(tmp_path / "dst" / "variables", memory=False)
+    assert variables.get("variables_2023_acs5") is not None
+
+    again = import_cache(bundle, tmp_path / "dst")
+    assert again == {"imported": 0, "skipped": 3, "bytes": 0}
+    assert import_cache(bundle, tmp_path / "dst", overwrite=True)["imported"] == 3
+
+
+def test_export_filters(tmp_path):
+    from pypums.cache import export_cache
+
+    _fill_for_export(tmp_path)
+    time.sleep(0.05)
+    bundle = tmp_path / "bundle.tar.gz"
+    keys = lambda manifest: sorted(e["key"] for e in manifest["entries"])  # noqa: E731
+    assert keys(export_cache(bundle, tmp_path, year=2023)) == ["acs_2023_a"]
+    assert keys(export_cache(bundle, tmp_path, geography="county")) == ["acs_2022_b"]
+    assert keys(export_cache(bundle, tmp_path, dataset=["variables"])) == [
+        "variables_2023_acs5"
+    ]
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"directory": "../outside", "name": "x", "key": "k"},
+        {
+            "directory": "api",
+            "name": CensusCache._safe_name("k"),
+            "key": "k",
+            "format": "csv",
+        },
+    ],
+)
+def test_import_rejects_invalid_entries(tmp_path, entry):
+    import io
+    import json
+    import tarfile
+
+    from pypums.cache import import_cache
+
+    bundle = tmp_path / "evil.tar.gz"
+    payload = json.dumps({"format": 1, "entries": [entry]}).encode()
+    with tarfile.open(bundle, "w:gz") as tar:
+        info = tarfile.TarInfo("manifest.json")
+        info.size = len(payload)
+        tar.addfile(info, io.BytesIO(payload))
+    with pytest.raises(ValueError, match="Invalid entry"):
+        import_cache(bundle, tmp_path / "cache")
+
+
+def test_import_evicts_replaced_frames_from_memory(tmp_path, memory):
+    from pypums.cache import export_cache, import_cache
+
+    _fill_for_export(tmp_path / "src")
+    bundle = tmp_path / "bundle.tar.gz"
+    export_cache(bundle, tmp_path / "src")
+    reader = CensusCache(tmp_path / "dst" / "api")
+    reader.set("acs_2022_b", pd.DataFrame({"a": [-1]}))
+    assert reader.get("acs_2022_b")["a"].tolist() == [-1]
+
+    import_cache(bundle, tmp_path / "dst", overwrite=True)
+    assert reader.get("acs_2022_b")["a"].tolist() == [2]
+
+
+def test_read_only_cache_never_writes_or_fetches(cache_dir):
+    from pypums.cache import CacheMiss
+
+    CensusCache(cache_dir, memory=False).set(
+        "k", pd.DataFrame({"a": [1]}), ttl_seconds=0
+    )
+    time.sleep(0.05)
+    before = sorted(p.name for p in cache_dir.iterdir())
+    cache = CensusCache(cache_dir, memory=False, read_only=True)
+    calls = []
+    assert cache.get_or_fetch("k", _counting(calls, 2))["a"].tolist() == [1]
+    with pytest.raises(CacheMiss):
+        cache.get_or_fetch("missing", _counting(calls, 3), policy="refresh")
+    cache.set("other", pd.DataFrame({"a": [4]}))
+    cache.clear()
+    assert calls == []
+    assert cache.get("other") is None
+    assert sorted(p.name for p in cache_dir.iterdir()) == before
+
+
+def test_read_only_cache_after_checkpoint(cache_dir):
+    writer = CensusCache(cache_dir, memory=False)
+    writer.set("k", pd.DataFrame({"a": [1]}))
+    writer._index.checkpoint()
+    assert (cache_dir / "index.db-wal").stat().st_size == 0
+    cache = CensusCache(cache_dir, memory=False, read_only=True)
+    assert cache.get("k")["a"].tolist() == [1]
+
+
+def test_read_only_cache_of_empty_index(cache_dir):
+    (cache_dir / "index.db").touch()
+    cache = CensusCache(cache_dir, memory=False, read_only=True)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_read_only_cache_of_missing_directory(tmp_path):
+    cache = CensusCache(tmp_path / "absent", read_only=True)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    assert not (tmp_path / "absent").exists()
+
+
+# ---------------------------------------------------------------------------
+# Arrow IPC format
+# ---------------------------------------------------------------------------
+
+
+def test_arrow_format_round_trip(cache_dir):
+    cache = CensusCache(cache_dir, memory=False, format="arrow")
+    df = pd.DataFrame(
+        {"SERIALNO": ["a", "b"], "PWGTP": [10, 20], "PWGTP1": [1.5, None]},
+        index=pd.Index([5, 7], name="row"),
+    )
+    cache.set("pums_2022_k", df)
+    assert (cache_dir / f"{cache._safe_name('pums_2022_k')}.arrow").exists()
+    pd.testing.assert_frame_equal(cache.get("pums_2022_k"), df)
+    pd.testing.assert_frame_equal(
+        cache.get("pums_2022_k", columns=["PWGTP"]), df[["PWGTP"]]
+    )
+    assert cache.entries()[0]["format"] == "arrow"
+
+
+def test_formats_read_each_others_entries(cache_dir):
+    CensusCache(cache_dir, memory=False).set("k", pd.DataFrame({"a": [1]}))
+    arrow = CensusCache(cache_dir, memory=False, format="arrow")
+    assert arrow.get("k")["a"].tolist() == [1]
+    arrow.set("k", pd.DataFrame({"a": [2]}))
+    assert list(cache_dir.glob("*.parquet")) == []
+    assert len(list(cache_dir.glob("*.arrow"))) == 1
+    assert CensusCache(cache_dir, memory=False).get("k")["a"].tolist() == [2]
+
+
+def test_invalid_format(cache_dir):
+    from pypums.cache import configure_disk_cache
+
+    with pytest.raises(ValueError, match="format must be one of"):
+        CensusCache(cache_dir, format="csv")
+    with pytest.raises(ValueError, match="format must be one of"):
+        configure_disk_cache(format="csv")
+
+
+def _tidy_tracts(tracts: int = 200) -> pd.DataFrame:
+    geoids = [f"06037{i:06d}" for i in range(tracts)]
+    variables = ["B01001_001", "B19013_001", "B25077_001"]
+    return pd.DataFrame(
+        {
+            "GEOID": [g for g in geoids for _ in variables],
+            "NAME": [f"Census Tract {g[5:]}" for g in geoids for _ in variables],
+            "variable": variables * tracts,
+            "estimate": [float(i % 5000) for i in range(tracts * len(variables))],
+            "moe": [i % 300 for i in range(tracts * len(variables))],
+        }
+    )
+
+
+def test_parquet_codec_is_configurable(cache_dir):
+    import pyarrow.parquet as pq
+
+    df = _tidy_tracts()
+    for codec in ("zstd", "gzip", "none"):
+        cache = CensusCache(cache_dir, memory=False, compression=codec)
+        cache.set(f"acs_2023_{codec}", df)
+        path = cache_dir / f"{cache._safe_name(f'acs_2023_{codec}')}.parquet"
+        column = pq.ParquetFile(path).metadata.row_group(0).column(0)
+        expected = "UNCOMPRESSED" if codec == "none" else codec.upper()
+        assert column.compression == expected
+        pd.testing.assert_frame_equal(cache.get(f"acs_2023_{codec}"), df)
+
+
+def test_compact_entries_round_trip_losslessly(cache_dir):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = _tidy_tracts()
+    df["big"] = 2**40
+    df["share"] = 0.1
+    df["note"] = None
+    cache = CensusCache(cache_dir, memory=False, compact=True)
+    cache.set("acs_2023_k", df)
+
+    schema = pq.read_schema(cache_dir / f"{cache._safe_name('acs_2023_k')}.parquet")
+    assert schema.field("moe").type == pa.int16()
+    assert schema.field("estimate").type == pa.float32()
+    assert pa.types.is_dictionary(schema.field("variable").type)
+    assert schema.field("big").type == pa.int64()
+    assert schema.field("share").type == pa.float64()
+    pd.testing.assert_frame_equal(cache.get("acs_2023_k"), df)
+    pd.testing.assert_frame_equal(
+        cache.get("acs_2023_k", columns=["moe", "variable"]),
+        df[["moe", "variable"]],
+    )
+
+
+def test_categorical_columns_keep_their_categories(cache_dir):
+    cache = CensusCache(cache_dir, memory=False, compact=True)
+    df = pd.DataFrame(
+        {
+            "sex": pd.Categorical(["F", "F"], categories=["M", "F"]),
+            "age": pd.Categorical([3, 1], categories=[1, 2, 3], ordered=True),
+        }
+    )
+    cache.set("pums_2022_k", df)
+    pd.testing.assert_frame_equal(cache.get("pums_2022_k"), df)
+
+
+def test_invalid_compression(cache_dir):
+    from pypums.cache import configure_disk_cache
+
+    with pytest.raises(ValueError, match="compression must be one of"):
+        CensusCache(cache_dir, compression="lzma")
+    with pytest.raises(ValueError, match="does not take a level"):
+        configure_disk_cache(compression="snappy", compression_level=3)
@@ -0,0 +1,115 @@
+"""Tests for recording and replaying raw Census API responses.
+
+Phase 0 — Foundation.
+
+In record mode every final response is saved under a fingerprint of the
+request (API key excluded); replay mode serves those recordings without
+touching the network and fails loudly on anything unrecorded.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from pypums import get_acs
+from pypums.api import client
+from pypums.api.cassette import Cassette, CassetteMiss, request_fingerprint
+
+pytestmark = pytest.mark.phase0
+
+URL = "https://api.census.gov/data/2023/acs/acs5"
+BODY = b'[["NAME","B01001_001E","state"],\n["California","39029342","06"]]'
+
+
+def _counting_handler(status=200, body=BODY):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status, content=body)
+
+    return handler, calls
+
+
+def test_fingerprint_ignores_key_and_order():
+    a = request_fingerprint(URL, {"get": "NAME", "for": "state:*", "key": "one"})
+    b = request_fingerprint(URL, {"for": "state:*", "get": "NAME", "key": "two"})
+    assert a == b
+    assert a != request_fingerprint(URL, {"get": "NAME", "for": "county:*"})
+
+
+def test_record_then_replay_without_network(install_transport, tmp_path):
+    handler, calls = _counting_handler()
+    install_transport(handler)
+    client.configure_cassette(tmp_path, mode="record")
+    recorded = get_acs("state", "B01001_001", output="wide", key="secret-key")
+    assert len(calls) == 1
+
+    def offline(request):
+        raise AssertionError("replay must not reach the network")
+
+    install_transport(offline)
+    cassette = client.configure_cassette(tmp_path)
+    replayed = get_acs("state", "B01001_001", output="wide", key="another-key")
+    assert replayed.equals(recorded)
+    assert cassette.stats()["replayed"] == 1
+
+
+def test_api_key_is_not_written(install_transport, tmp_path):
+    handler, _ = _counting_handler()
+    install_transport(handler)
+    client.configure_cassette(tmp_path, mode="record")
+    client.call_census_api(URL, {"get": "NAME", "key": "secret-key"})
+    (entry,) = tmp_path.glob("*.json")
+    text = entry.read_text()
+    assert "secret-key" not in text
+    assert json.loads(text)["params"] == {"get": "NAME"}
+
+
+def test_replay_miss_raises(tmp_path):
+    client.configure_cassette(tmp_path)
+    try:
+        with pytest.raises(CassetteMiss, match="No recorded response"):
+            client.call_census_api(URL, {"get": "NAME"})
+    finally:
+        client.configure_cassette(None)
+
+
+def test_auto_mode_records_misses_once(install_transport, tmp_path):
+    handler, calls = _counting_handler()
+    install_transport(handler)
+    cassette = client.configure_cassette(tmp_path, mode="auto")
+    client.call_census_api(URL, {"get": "NAME"})
+    client.call_census_api(URL, {"get": "NAME"})
+    assert len(calls) == 1
+    assert cassette.stats() == {"replayed": 1, "recorded": 1, "missed": 1}
+
+
+def test_transient_errors_are_not_recorded(install_transport, tmp_path):
+    client.configure_retries(max_attempts=1)
+    handler, _ = _counting_handler(status=503, body=b"busy")
+    install_transport(handler)
+    client.configure_cassette(tmp_path, mode="record")
+    with pytest.raises(httpx.HTTPStatusError):
+        client.call_census_api(URL, {"get": "NAME"})
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_replayed_client_errors_still_raise(tmp_path):
+    cassette = Cassette(tmp_path, mode="record")
+    request = httpx.Request("GET", URL)
+    cassette.record(
+        URL, {"get": "BAD"}, httpx.Response(400, text="error", request=request)
+    )
+    client.configure_cassette(tmp_path)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.call_census_api(URL, {"get": "BAD"})
+    finally:
+        client.configure_cassette(None)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError, match="mode must be one of"):
+        Cassette("unused", mode="rewind")
@@ -0,0 +1,107 @@
+"""Tests for automatic 50-variable request chunking.
+
+Phase 1 — Core Data Functions.
+
+The Census API accepts at most 50 variables per request.  Larger requests
+are split into chunks, fetched concurrently, and joined back together on
+their shared geography/key columns — with NAME requested only once.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pypums import get_acs, get_decennial, get_pums
+from pypums.api.query import MAX_API_VARIABLES, split_params
+
+pytestmark = pytest.mark.phase1
+
+COUNTIES = [("06", "037", "Los Angeles County"), ("06", "059", "Orange County")]
+
+
+def _fake_api(calls, delay=0.0):
+    """Build a Census API stand-in that answers whatever ``get`` asks for."""
+    lock = threading.Lock()
+
+    def fake(url, params):
+        variables = params["get"].split(",")
+        with lock:
+            calls.append(variables)
+        time.sleep(delay)
+        header = variables + ["state", "county"]
+        rows = []
+        for state, county, name in COUNTIES:
+            values = [
+                name if v == "NAME" else f"{int(county)}{i}"
+                for i, v in enumerate(variables)
+            ]
+            rows.append(values + [state, county])
+        return [header] + rows
+
+    return fake
+
+
+def test_split_params_keeps_name_once_and_repeats_keys():
+    variables = ["NAME", "SERIALNO", "SPORDER"] + [f"V{i}" for i in range(100)]
+    chunks = split_params({"get": ",".join(variables)}, keys=("SERIALNO", "SPORDER"))
+    gets = [c["get"].split(",") for c in chunks]
+    assert all(len(g) <= MAX_API_VARIABLES for g in gets)
+    assert sum(g.count("NAME") for g in gets) == 1
+    assert all(g[:2] == ["SERIALNO", "SPORDER"] or g[0] == "NAME" for g in gets)
+    data_vars = [v for g in gets for v in g if v.startswith("V")]
+    assert data_vars == [f"V{i}" for i in range(100)]
+
+
+def test_split_params_leaves_small_requests_alone():
+    params = {"get": "NAME,B01001_001E", "for": "state:*"}
+    assert split_params(params) == [params]
+
+
+def test_get_acs_chunks_and_joins(fake_api_key):
+    variables = [f"B19001_{i:03d}" for i in range(1, 61)]
+    calls = []
+    with patch("pypums.acs._call_census_api", side_effect=_fake_api(calls)):
+        df = get_acs("county", variables, state="CA", output="wide", key=fake_api_key)
+    assert len(calls) == 3
+    assert all(len(c) <= MAX_API_VARIABLES for c in calls)
+    assert sum(c.count("NAME") for c in calls) == 1
+    assert len(df) == 2
+    assert list(df["NAME"]) == ["Los Angeles County", "Orange County"]
+    for v in variables:
+        assert f"{v}E" in df.columns
+        assert f"{v}M" in df.columns
+
+
+def test_chunks_are_fetched_concurrently(fake_api_key):
+    variables = [f"B19001_{i:03d}" for i in range(1, 100)]
+    calls = []
+    start = time.perf_counter()
+    with patch("pypums.acs._call_census_api", side_effect=_fake_api(calls, delay=0.2)):
+        df = get_acs("county", variables, state="CA", key=fake_api_key)
+    elapsed = time.perf_counter() - start
+    assert len(calls) == 4
+    assert elapsed < 0.6
+    assert df["variable"].nunique() == len(variables)
+
+
+def test_get_decennial_chunks(fake_api_key):
+    variables = [f"P1_{i:03d}N" for i in range(1, 76)]
+    calls = []
+    with patch("pypums.decennial._call_census_api", side_effect=_fake_api(calls)):
+        df = get_decennial(
+            "county", variables, state="CA", output="wide", key=fake_api_key
+        )
+    assert len(calls) == 2
+    assert [v for v in variables if v not in df.columns] == []
+
+
+def test_get_pums_replicate_weights_repeat_person_keys(fake_api_key):
+    calls = []
+    with patch("pypums.pums._call_census_api", side_effect=_fake_api(calls)):
+        df = get_pums(["AGEP"], state="CA", rep_weights="both", key=fake_api_key)
+    assert len(calls) > 1
+    assert all("SERIALNO" in c and "SPORDER" in c for c in calls)
+    assert "WGTP80" in df.columns
+    assert len(df) == 2
@@ -78,3 +78,95 @@ class TestEstimatesCommand:
         assert result.exit_code == 0
         output = strip_ansi(result.output)
         assert "estimates" in output.lower()
+
+
+class TestCacheCommands:
+    def _fill(self, cache_dir):
+        from pypums.cache import CensusCache
+
+        cache = CensusCache(cache_dir, memory=False)
+        cache.set("acs_2023_a", pd.DataFrame({"a": range(1000)}))
+        cache.set("acs_2023_b", pd.DataFrame({"a": range(1000)}), ttl_seconds=0)
+        cache.get("acs_2023_a")
+        return cache
+
+    def test_cache_stats(self, cache_dir):
+        import json
+
+        self._fill(cache_dir)
+        result = runner.invoke(
+            cli.cli, ["cache", "stats", "--dir", str(cache_dir), "--json"]
+        )
+        assert result.exit_code == 0
+        stats = json.loads(result.output)[str(cache_dir)]
+        assert stats["entries"] == 2
+        assert stats["datasets"]["acs"]["hits"] == 1
+
+    def test_cache_stats_table(self, cache_dir):
+        self._fill(cache_dir)
+        result = runner.invoke(cli.cli, ["cache", "stats", "--dir", str(cache_dir)])
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert "acs" in output
+        assert "2 entries" in output
+
+    def test_cache_prune(self, cache_dir):
+        cache = self._fill(cache_dir)
+        result = runner.invoke(
+            cli.cli,
+            ["cache", "prune", "--dir", str(cache_dir), "--max-size", "1B"],
+        )
+        assert result.exit_code == 0
+        assert "Removed 2 entries" in strip_ansi(result.output)
+        assert cache.entries() == []
+
+    def test_cache_prune_rejects_bad_size(self, cache_dir):
+        result = runner.invoke(
+            cli.cli, ["cache", "prune", "--dir", str(cache_dir), "--max-size", "big"]
+        )
+        assert result.exit_code == 1
+
+    def test_cache_export_import(self, tmp_path):
+        from pypums.cache import CensusCache
+
+        self._fill(tmp_path / "src" / "api")
+        bundle = tmp_path / "bundle.tar.gz"
+        result = runner.invoke(
+            cli.cli,
+            ["cache", "export", str(bundle), "--dir", str(tmp_path / "src")],
+        )
+        assert result.exit_code == 0
+        assert "Exported 1 entries" in strip_ansi(result.output)
+        result = runner.invoke(
+            cli.cli,
+            ["cache", "import", str(bundle), "--dir", str(tmp_path / "dst")],
+        )
+        assert result.exit_code == 0
+        assert "Imported 1 entries" in strip_ansi(result.output)
+        cache = CensusCache(tmp_path / "dst" / "api", memory=False)
+        assert len(cache.get("acs_2023_a")) == 1000
+
+    def test_cache_warm_dry_run(self, tmp_path):
+        import json
+
+        manifest = tmp_path / "warm.json"
+        manifest.write_text(
+            json.dumps(
+                [
+                    {"function": "get_acs", "geography": "state", "variables": v}
+                    for v in ("B01003_001", "B19013_001", "B01003_001")
+                ]
+            )
+        )
+        result = runner.invoke(cli.cli, ["cache", "warm", str(manifest), "--dry-run"])
+        assert result.exit_code == 0
+        output = strip_ansi(result.output)
+        assert "3 manifest entries -> 1 calls" in output
+        assert "B19013_001" in output
+
+    def test_cache_warm_rejects_bad_manifest(self, tmp_path):
+        manifest = tmp_path / "warm.json"
+        manifest.write_text('[{"function": "get_everything"}]')
+        result = runner.invoke(cli.cli, ["cache", "warm", str(manifest)])
+        assert result.exit_code == 1
+        assert "function must be one of" in strip_ansi(result.output)
@@ -0,0 +1,86 @@
+"""Tests for the shared Census API HTTP client.
+
+Phase 0 — Foundation.
+
+Every Census API call should go through one pooled ``httpx.Client``:
+
+* ``call_census_api`` and ``fetch_json`` reuse the same client.
+* ``configure_client`` replaces the client with new settings.
+* ``session()`` scopes a client and restores the previous one on exit.
+"""
+
+import httpx
+import pytest
+
+from pypums.api import client
+
+pytestmark = pytest.mark.phase0
+
+
+@pytest.fixture()
+def mock_transport():
+    """Route all shared-client traffic to an in-memory handler."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("variables.json"):
+            return httpx.Response(200, json={"variables": {}})
+        return httpx.Response(200, json=[["NAME", "state"], ["California", "06"]])
+
+    transport = httpx.MockTransport(handler)
+    saved = dict(client._client_options)
+    client.configure_client(transport=transport)
+    yield seen
+    client.close_client()
+    client._client_options.clear()
+    client._client_options.update(saved)
+
+
+def test_call_census_api_returns_rows(mock_transport):
+    rows = client.call_census_api(
+        "https://api.census.gov/data/2023/acs/acs5", {"get": "NAME"}
+    )
+    assert rows == [["NAME", "state"], ["California", "06"]]
+    assert mock_transport[0].url.params["get"] == "NAME"
+
+
+def test_calls_reuse_one_client(mock_transport):
+    first = client.get_client()
+    client.call_census_api("https://api.census.gov/data/2023/acs/acs5", {})
+    client.fetch_json("https://api.census.gov/data/2023/acs/acs5/variables.json")
+    assert client.get_client() is first
+    assert len(mock_transport) == 2
+
+
+def test_configure_client_replaces_client(mock_transport):
+    first = client.get_client()
+    client.configure_client(timeout=5)
+    second = client.get_client()
+    assert second is not first
+    assert first.is_closed
+    assert second.timeout.read == 5
+
+
+def test_session_scopes_and_restores(mock_transport):
+    outer = client.get_client()
+    with client.session(timeout=7) as scoped:
+        assert client.get_client() is scoped
+        assert scoped.timeout.read == 7
+        client.call_census_api("https://api.census.gov/data/2023/acs/acs5", {})
+    assert scoped.is_closed
+    assert client.get_client() is outer
+    assert len(mock_transport) == 1
+
+
+def test_session_rejects_unknown_options():
+    with (
+        pytest.raises(TypeError, match="Unknown client options"),
+        client.session(bogus=1),
+    ):
+        pass
+
+
+def test_requests_gzip_encoding(mock_transport):
+    client.call_census_api("https://api.census.gov/data/2023/acs/acs5", {})
+    assert "gzip" in mock_transport[0].headers["Accept-Encoding"]
@@ -0,0 +1,111 @@
+"""Tests for column-wise decoding of Census API responses.
+
+Phase 0 — Foundation.
+
+``decode_census_json`` turns the API's JSON array-of-arrays into Arrow
+string columns — straight through Arrow's CSV reader for the API's usual
+one-row-per-line layout, via a JSON parser otherwise — and
+``census_table_to_frame`` parses the numeric columns into typed arrays
+while NAME and FIPS columns stay strings.
+"""
+
+import json
+
+import httpx
+import pandas as pd
+import pytest
+
+from pypums import get_acs
+from pypums.api import client
+from pypums.api.client import census_table_to_frame, decode_census_json
+
+pytestmark = pytest.mark.phase0
+
+ROWS = [
+    ["NAME", "B01001_001E", "B01001_001M", "state", "county"],
+    ["Los Angeles County, California", "9663345", "-555555555", "06", "037"],
+    ["Alpine County, California", "1190", "154", "06", "003"],
+    ["Nowhere County, California", None, "", "06", "999"],
+]
+
+
+def _census_body(rows) -> bytes:
+    """Serialize rows the way the Census API does: compact, one per line."""
+    lines = [json.dumps(r, separators=(",", ":"), ensure_ascii=False) for r in rows]
+    return ("[" + ",\n".join(lines) + "]").encode()
+
+
+def _numeric(name):
+    return name.endswith(("E", "M")) and name != "NAME"
+
+
+def test_line_layout_decodes_to_string_columns():
+    table = decode_census_json(_census_body(ROWS))
+    assert table.column_names == ROWS[0]
+    assert table.column("state").to_pylist() == ["06", "06", "06"]
+    assert table.column("NAME").to_pylist()[0] == "Los Angeles County, California"
+    assert table.column("B01001_001E").to_pylist()[2] is None
+    assert table.column("B01001_001M").to_pylist()[2] == ""
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        json.dumps(ROWS).encode(),  # spaced separators, single line
+        _census_body(ROWS[:2] + [['Quote "County"', "1", "2", "06", "005"]]),
+        _census_body([["NAME", "value"], ["Ciudad Juárez", 5]]),
+    ],
+    ids=["not-line-layout", "escaped", "non-string-cells"],
+)
+def test_fallback_matches_json_parse(body):
+    table = decode_census_json(body)
+    rows = json.loads(body)
+    assert table.column_names == rows[0]
+    expected = [[None if v is None else str(v) for v in row] for row in rows[1:]]
+    assert [list(r.values()) for r in table.to_pylist()] == expected
+
+
+def test_fast_path_and_fallback_agree():
+    fast = decode_census_json(_census_body(ROWS))
+    slow = decode_census_json(json.dumps(ROWS).encode())
+    assert fast.equals(slow)
+
+
+def test_header_only_response():
+    table = decode_census_json(_census_body(ROWS[:1]))
+    assert table.num_rows == 0
+    assert table.column_names == ROWS[0]
+
+
+def test_numeric_columns_are_typed_and_fips_stay_strings():
+    df = census_table_to_frame(decode_census_json(_census_body(ROWS)), _numeric)
+    assert df["B01001_001E"].dtype == "float64"  # has a missing value
+    assert df["B01001_001M"].dtype == "float64"  # "" coerced to NaN
+    assert df["B01001_001M"].iloc[0] == -555555555
+    assert pd.isna(df["B01001_001M"].iloc[2])
+    assert list(df["county"]) == ["037", "003", "999"]
+    assert pd.api.types.is_string_dtype(df["NAME"])
+
+
+def test_integer_columns_stay_integers():
+    rows = [["NAME", "P1_001N", "state"], ["Alaska", "733391", "02"]]
+    df = census_table_to_frame(
+        decode_census_json(_census_body(rows)), lambda c: c == "P1_001N"
+    )
+    assert df["P1_001N"].dtype == "int64"
+    assert df["state"].iloc[0] == "02"
+
+
+def test_get_acs_matches_row_decoding(install_transport, fake_api_key):
+    """Typed decoding returns the same frame as the JSON-rows path."""
+    install_transport(lambda request: httpx.Response(200, content=_census_body(ROWS)))
+    columnar = get_acs(
+        "county", "B01001_001", state="CA", output="wide", key=fake_api_key
+    )
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("pypums.acs._call_census_api", client.call_census_api)
+        rows = get_acs(
+            "county", "B01001_001", state="CA", output="wide", key=fake_api_key
+        )
+    pd.testing.assert_frame_equal(columnar, rows)
@@ -0,0 +1,124 @@
+"""Tests for fanning national pulls out over parent geographies.
+
+Phase 1 — Core Data Functions.
+
+``state="*"`` / ``county="*"`` (or lists) turn one ``get_*`` call into one
+Census API request per parent state or county.  Those requests run
+concurrently and their rows are concatenated into a single frame.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pypums import get_acs, get_acs_async, get_decennial, get_estimates
+
+pytestmark = pytest.mark.phase1
+
+
+def _fake_api(calls, delay=0.0):
+    """Answer each request with one tract in the requested state/county."""
+    lock = threading.Lock()
+
+    def fake(url, params):
+        with lock:
+            calls.append(params)
+        time.sleep(delay)
+        parents = dict(part.split(":") for part in params["in"].split())
+        variables = params["get"].split(",")
+        values = [
+            f"Tract 1, {parents['state']}" if v == "NAME" else "5" for v in variables
+        ]
+        return [
+            variables + ["state", "county", "tract"],
+            values + [parents["state"], parents.get("county", "001"), "000100"],
+        ]
+
+    return fake
+
+
+def test_state_list_concatenates_results(fake_api_key):
+    calls = []
+    with patch("pypums.acs._call_census_api", side_effect=_fake_api(calls)):
+        df = get_acs(
+            "tract",
+            "B01001_001",
+            state=["CA", "TX"],
+            county="001",
+            output="wide",
+            key=fake_api_key,
+        )
+    assert sorted(c["in"] for c in calls) == [
+        "state:06 county:001",
+        "state:48 county:001",
+    ]
+    assert list(df["GEOID"]) == ["06001000100", "48001000100"]
+
+
+def test_county_wildcard_requests_every_county(fake_api_key):
+    calls = []
+    with patch("pypums.decennial._call_census_api", side_effect=_fake_api(calls)):
+        df = get_decennial("tract", "P1_001N", state="DE", county="*", key=fake_api_key)
+    assert sorted(c["in"] for c in calls) == [
+        "state:10 county:001",
+        "state:10 county:003",
+        "state:10 county:005",
+    ]
+    assert len(df) == 3
+
+
+def test_state_wildcard_fans_out_concurrently(fake_api_key):
+    calls = []
+    start = time.perf_counter()
+    with patch(
+        "pypums.estimates._call_census_api",
+        side_effect=_fake_api(calls, delay=0.05),
+    ):
+        df = get_estimates("place", variables="POP_2023", state="*", key=fake_api_key)
+    elapsed = time.perf_counter() - start
+    assert len(calls) == 52
+    assert df["GEOID"].str[:2].nunique() == 52
+    # 52 sequential requests would take at least 2.6s.
+    assert elapsed < 1.5
+
+
+def test_async_fan_out_matches_sync(fake_api_key):
+    kwargs = dict(
+        geography="tract",
+        variables="B01001_001",
+        state=["CA", "TX"],
+        county="001",
+        key=fake_api_key,
+    )
+    with patch("pypums.acs._call_census_api", side_effect=_fake_api([])):
+        sync_df = get_acs(**kwargs)
+
+    fake = _fake_api([])
+
+    async def fake_async(url, params):
+        return fake(url, params)
+
+    with patch("pypums.acs._call_census_api_async", new=fake_async):
+        async_df = asyncio.run(get_acs_async(**kwargs))
+    assert async_df.equals(sync_df)
+
+
+def test_geometry_receives_state_list(fake_api_key):
+    with (
+        patch("pypums.acs._call_census_api", side_effect=_fake_api([])),
+        patch(
+            "pypums.spatial.attach_geometry", side_effect=lambda df, **kw: df
+        ) as attach,
+    ):
+        get_acs(
+            "tract",
+            "B01001_001",
+            state=["CA", "TX"],
+            county="001",
+            geometry=True,
+            key=fake_api_key,
+        )
+    assert attach.call_args.kwargs["state"] == ["CA", "TX"]
@@ -8,11 +8,17 @@ These tests define the contract for the geography module:
   when those parents are not supplied.
 * ``build_geography_query`` returns the correct Census API ``for`` / ``in``
   parameter strings.
+* ``expand_geography_query`` plans one query per parent for ``"*"`` and
+  list-valued state/county arguments.
 """
 
 import pytest
 
-from pypums.api.geography import GEOGRAPHY_HIERARCHY, build_geography_query
+from pypums.api.geography import (
+    GEOGRAPHY_HIERARCHY,
+    build_geography_query,
+    expand_geography_query,
+)
 
 pytestmark = pytest.mark.phase0
 
@@ -74,3 +80,42 @@ def test_build_geography_query_county_in_state():
     assert "county" in for_clause
     assert in_clause is not None
     assert "state:06" in in_clause
+
+
+def test_expand_single_parent_matches_build():
+    """Scalar arguments plan exactly the query build_geography_query gives."""
+    assert expand_geography_query("county", state="06") == [
+        build_geography_query("county", state="06")
+    ]
+
+
+def test_expand_state_wildcard_skips_island_areas():
+    """state='*' plans one query per state, DC and Puerto Rico included."""
+    queries = expand_geography_query("place", state="*")
+    in_clauses = [in_clause for _, in_clause in queries]
+    assert len(queries) == 52
+    assert "state:11" in in_clauses
+    assert "state:72" in in_clauses
+    assert "state:66" not in in_clauses
+
+
+def test_expand_county_wildcard_plans_each_county():
+    """county='*' plans one query per county in the state."""
+    queries = expand_geography_query("tract", state="DE", county="*")
+    assert queries == [
+        ("tract:*", "state:10 county:001"),
+        ("tract:*", "state:10 county:003"),
+        ("tract:*", "state:10 county:005"),
+    ]
+
+
+def test_expand_deduplicates_parents():
+    """Repeated states, or a county for a geography not nested in counties,
+    collapse into a single query."""
+    assert len(expand_geography_query("county", state=["CA", "06"])) == 1
+    assert len(expand_geography_query("place", state="CA", county="*")) == 1
+
+
+def test_expand_counties_require_state():
+    with pytest.raises(ValueError, match="requires a state"):
+        expand_geography_query("tract", county="*")
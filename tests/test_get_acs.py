@@ -182,3 +182,22 @@ class TestGetAcsSummaryVar:
             )
         assert "summary_est" in df.columns
         assert "summary_moe" in df.columns
+
+    def test_summary_var_with_table(self, fake_api_key):
+        rows = [
+            ["NAME", "B19001_001E", "B19001_001M", "B01001_001E", "B01001_001M"]
+            + ["state"],
+            ["California", "13550586", "30000", "39029342", "1200", "06"],
+        ]
+        with patch("pypums.acs._call_census_api", return_value=rows) as api:
+            df = get_acs(
+                geography="state",
+                table="B19001",
+                summary_var="B01001_001",
+                state="CA",
+                key=fake_api_key,
+            )
+        params = api.call_args.args[1]
+        assert params["get"] == "NAME,group(B19001),B01001_001E,B01001_001M"
+        assert df["summary_est"].tolist() == [39029342]
+        assert "summary_moe" in df.columns
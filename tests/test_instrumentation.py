@@ -0,0 +1,149 @@
+"""Tests for instrumentation hooks and the metrics registry.
+
+Phase 0 — Foundation.
+
+Every request, cache lookup and ``get_*`` stage emits an event that
+registered hooks receive and that updates the process-wide metrics
+registry, which can be dumped as JSON or Prometheus text.
+"""
+
+import json
+from functools import partial
+
+import httpx
+import pandas as pd
+import pytest
+
+from pypums import get_acs, instrumentation
+from pypums.cache import CensusCache
+from pypums.instrumentation import MetricsRegistry, metrics
+
+pytestmark = pytest.mark.phase0
+
+BODY = (
+    b'[["NAME","B01001_001E","B01001_001M","state","county"],\n'
+    b'["Los Angeles County, California","10014009","0","06","037"],\n'
+    b'["Orange County, California","3186989","0","06","059"]]'
+)
+
+
+@pytest.fixture()
+def census(install_transport):
+    install_transport(lambda request: httpx.Response(200, content=BODY))
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture()
+def events():
+    """Record every event fired while the test runs."""
+    seen = []
+
+    def hook(event, **fields):
+        seen.append((event, fields))
+
+    hooks = {event: partial(hook, event) for event in instrumentation.EVENTS}
+    for event, hook in hooks.items():
+        instrumentation.add_hook(event, hook)
+    yield seen
+    for event, hook in hooks.items():
+        instrumentation.remove_hook(event, hook)
+
+
+def _counter(snapshot, name, **labels):
+    labels = {k: str(v) for k, v in labels.items()}
+    for series in snapshot["counters"].get(name, []):
+        if series["labels"] == labels:
+            return series["value"]
+    return 0
+
+
+def test_get_acs_reports_every_stage(census, fake_api_key):
+    with instrumentation.timings() as spent:
+        get_acs("county", "B01001_001", state="CA", key=fake_api_key)
+    expected = {"fetch", "decode", "frame", "transform", "geoid", "numeric"}
+    assert expected | {"reshape", "total"} <= set(spent)
+    assert all(seconds >= 0 for seconds in spent.values())
+    assert spent["total"] >= spent["fetch"]
+
+
+def test_request_events_redact_the_key(census, events, fake_api_key):
+    get_acs("county", "B01001_001", state="CA", key=fake_api_key)
+    (request,) = [fields for event, fields in events if event == "on_request"]
+    (response,) = [fields for event, fields in events if event == "on_response"]
+    assert "key" not in request["params"]
+    assert request["params"]["for"] == "county:*"
+    assert response["status"] == 200
+    assert response["bytes"] == len(BODY)
+
+
+def test_metrics_count_requests_rows_and_queries(census, fake_api_key):
+    get_acs("county", "B01001_001", state="CA", key=fake_api_key)
+    snapshot = metrics.snapshot()
+    assert _counter(snapshot, "api_responses_total", status=200) == 1
+    assert _counter(snapshot, "api_response_bytes_total") == len(BODY)
+    assert _counter(snapshot, "rows_total", stage="decode") == 2
+    assert _counter(snapshot, "queries_total", query="get_acs") == 1
+    (latency,) = snapshot["histograms"]["api_request_seconds"]
+    assert latency["count"] == 1
+    assert latency["buckets"]["+Inf"] == 1
+
+
+def test_cache_hit_and_miss_events(cache_dir, events):
+    metrics.reset()
+    cache = CensusCache(cache_dir)
+    assert cache.get("k") is None
+    cache.set("k", pd.DataFrame({"a": [1]}))
+    assert cache.get("k") is not None
+    seen = [(e, f.get("reason")) for e, f in events if e.startswith("on_cache")]
+    assert seen == [("on_cache_miss", "missing"), ("on_cache_hit", None)]
+    snapshot = metrics.snapshot()
+    assert _counter(snapshot, "cache_lookups_total", result="hit") == 1
+    assert _counter(snapshot, "cache_bytes_written_total") > 0
+
+
+def test_snapshot_includes_client_gauges(census):
+    gauges = metrics.snapshot()["gauges"]
+    assert {"retries", "rate_limit", "single_flight"} <= set(gauges)
+    assert json.loads(metrics.to_json())["gauges"]["rate_limit"]["rate"] == 10.0
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for seconds in (0.002, 0.02, 0.2, 60):
+        registry.observe("latency", seconds, host="api")
+    (series,) = registry.snapshot()["histograms"]["latency"]
+    assert series["labels"] == {"host": "api"}
+    assert series["buckets"]["0.005"] == 1
+    assert series["buckets"]["0.25"] == 3
+    assert series["buckets"]["30.0"] == 3
+    assert series["buckets"]["+Inf"] == series["count"] == 4
+
+
+def test_prometheus_text():
+    registry = MetricsRegistry()
+    registry.increment("requests_total", status=200)
+    registry.observe("latency_seconds", 0.5)
+    registry.add_collector("limiter", lambda: {"rate": 2.5, "mode": "auto"})
+    text = registry.to_prometheus()
+    assert "# TYPE pypums_requests_total counter" in text
+    assert 'pypums_requests_total{status="200"} 1' in text
+    assert 'pypums_latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "pypums_latency_seconds_count 1" in text
+    assert "pypums_limiter_rate 2.5" in text
+    assert "mode" not in text
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    registry.enabled = False
+    registry.increment("requests_total")
+    registry.observe("latency_seconds", 0.1)
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {} and snapshot["histograms"] == {}
+
+
+def test_unknown_event():
+    with pytest.raises(ValueError, match="event must be one of"):
+        instrumentation.add_hook("on_everything", print)
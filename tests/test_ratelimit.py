@@ -0,0 +1,131 @@
+"""Tests for the client-side rate limiter.
+
+Phase 0 — Foundation.
+
+The limiter caps request rate (token bucket) and requests in flight, is
+shared by threads and asyncio tasks, and adapts with AIMD: throttling
+responses halve the limits, healthy responses restore them gradually.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from pypums.api import client
+from pypums.api.ratelimit import RateLimiter
+
+pytestmark = pytest.mark.phase0
+
+
+def test_token_bucket_spaces_requests():
+    limiter = RateLimiter(rate=20, burst=2, max_concurrency=None, adaptive=False)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+        limiter.release(0.01, 200)
+    # Two burst tokens, then four more at 20/s.
+    assert time.monotonic() - start >= 0.18
+
+
+def test_max_concurrency_is_enforced_across_threads():
+    limiter = RateLimiter(rate=None, max_concurrency=2, adaptive=False)
+    peak = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal peak
+        limiter.acquire()
+        with lock:
+            peak = max(peak, limiter.stats()["in_flight"])
+        time.sleep(0.02)
+        limiter.release(0.02, 200)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_throttle_halves_rate_and_concurrency_once_per_burst():
+    limiter = RateLimiter(rate=10, max_concurrency=8)
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(0.01, 429)
+    stats = limiter.stats()
+    assert stats["rate"] == 5
+    assert stats["concurrency_limit"] == 4
+    assert stats["throttled"] == 3
+    assert stats["decreases"] == 1
+
+
+def test_healthy_responses_restore_limits():
+    limiter = RateLimiter(rate=1000, max_concurrency=8)
+    limiter.acquire()
+    limiter.release(0.01, 503)
+    assert limiter.stats()["rate"] == 500
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(0.01, 200)
+    stats = limiter.stats()
+    assert stats["rate"] == 1000
+    assert stats["concurrency_limit"] == 8
+
+
+def test_latency_spike_counts_as_congestion():
+    limiter = RateLimiter(rate=None, max_concurrency=8)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(0.01, 200)
+    limiter.acquire()
+    limiter.release(1.0, 200)
+    assert limiter.stats()["concurrency_limit"] == 4
+
+
+def test_non_adaptive_limiter_ignores_feedback():
+    limiter = RateLimiter(rate=10, max_concurrency=8, adaptive=False)
+    limiter.acquire()
+    limiter.release(0.01, 429)
+    assert limiter.stats()["rate"] == 10
+
+
+def test_async_tasks_share_the_cap():
+    limiter = RateLimiter(rate=None, max_concurrency=3, adaptive=False)
+    peak = 0
+
+    async def task():
+        nonlocal peak
+        await limiter.acquire_async()
+        peak = max(peak, limiter.stats()["in_flight"])
+        await asyncio.sleep(0.01)
+        limiter.release(0.01, 200)
+
+    async def main():
+        await asyncio.gather(*(task() for _ in range(10)))
+
+    asyncio.run(main())
+    assert peak == 3
+
+
+def test_invalid_settings_raise():
+    with pytest.raises(ValueError, match="rate"):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError, match="max_concurrency"):
+        RateLimiter(max_concurrency=0)
+
+
+def test_client_reports_throttling_to_limiter(install_transport):
+    install_transport(lambda request: httpx.Response(429))
+    client.configure_retries(max_attempts=1)
+    limiter = client.configure_rate_limit(rate=100, max_concurrency=4)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.call_census_api("https://api.census.gov/data/2023/acs/acs5", {})
+    stats = limiter.stats()
+    assert stats["throttled"] == 1
+    assert stats["concurrency_limit"] == 2
+    assert stats["in_flight"] == 0
@@ -0,0 +1,138 @@
+"""Tests for canonical request normalization.
+
+Phase 0 — Foundation.
+
+Equivalent ``get_*`` calls — states spelled as names, abbreviations or
+FIPS codes, geographies in any case, variables in any order or repeated —
+normalize to one :class:`CensusRequest`, so they share a cache entry and
+send identical API requests.
+"""
+
+import httpx
+import pandas as pd
+import pytest
+
+from pypums import acs, get_acs, get_pums
+from pypums.api.request import CensusRequest, normalize_filters, normalize_states
+from pypums.cache import CensusCache
+
+pytestmark = pytest.mark.phase0
+
+BODY = (
+    b'[["NAME","B01001_001E","B01001_001M","B19013_001E","B19013_001M",'
+    b'"state","county"],\n'
+    b'["Los Angeles County, California","10014009","0","83411","512","06","037"],\n'
+    b'["Orange County, California","3186989","0","109361","982","06","059"]]'
+)
+
+
+@pytest.fixture()
+def census(install_transport, tmp_path, monkeypatch):
+    """Serve one ACS response and record every request's parameters."""
+    requests = []
+
+    def handler(request):
+        requests.append(dict(request.url.params))
+        return httpx.Response(200, content=BODY)
+
+    install_transport(handler)
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    return requests
+
+
+def test_equivalent_calls_build_one_request():
+    spellings = [
+        {"geography": "County", "state": "CA", "variables": ["B2", "B1"]},
+        {"geography": "county", "state": "california", "variables": ["B1", "B2"]},
+        {
+            "geography": "COUNTY ",
+            "state": ["06", "ca"],
+            "variables": ["B1", "B2", "B1"],
+        },
+    ]
+    requests = {CensusRequest.create("acs", 2023, **kw) for kw in spellings}
+    assert len(requests) == 1
+    (request,) = requests
+    assert request.state == "06"
+    assert request.variables == ("B1", "B2")
+
+
+def test_options_and_filters_are_part_of_the_key():
+    base = CensusRequest.create("pums", 2023, state="CA", variables_filter={"SEX": 2})
+    same = CensusRequest.create("pums", 2023, state="06", variables_filter={"SEX": [2]})
+    other = CensusRequest.create("pums", 2023, state="CA", variables_filter={"SEX": 1})
+    assert base.cache_key == same.cache_key != other.cache_key
+    assert base.params["variables_filter"] == {"SEX": ["2"]}
+
+
+def test_normalizers():
+    assert normalize_states(["TX", "ca", "California"]) == ("06", "48")
+    assert normalize_states("*") == "*"
+    assert normalize_filters({"AGEP": [65, 18], "SEX": "2"}) == {
+        "AGEP": ["18", "65"],
+        "SEX": ["2"],
+    }
+    with pytest.raises(ValueError, match="Could not resolve state"):
+        normalize_states("Atlantis")
+
+
+def test_equivalent_get_acs_calls_share_a_cache_entry(census, tmp_path, fake_api_key):
+    variables = ["B01001_001", "B19013_001"]
+    first = get_acs("county", variables, state="CA", cache_table=True, key=fake_api_key)
+    second = get_acs(
+        "County",
+        variables + variables[::-1],
+        state="california",
+        cache_table=True,
+        key=fake_api_key,
+    )
+    assert len(census) == 1
+    assert census[0]["get"] == "NAME,B01001_001E,B01001_001M,B19013_001E,B19013_001M"
+    assert census[0]["in"] == "state:06"
+    assert len(CensusCache(tmp_path).find("acs", geography="county", state="06")) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_caller_variable_order_is_kept(census, fake_api_key):
+    variables = ["B19013_001", "B01001_001"]
+    wide = get_acs(
+        "county",
+        variables,
+        state="CA",
+        output="wide",
+        cache_table=True,
+        key=fake_api_key,
+    )
+    assert list(wide.columns[2:4]) == ["B19013_001E", "B01001_001E"]
+    tidy = get_acs("county", variables, state="CA", cache_table=True, key=fake_api_key)
+    assert list(pd.unique(tidy["variable"])) == variables
+    assert len(census) == 1
+
+
+def test_state_lists_are_requested_in_fips_order(install_transport, fake_api_key):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params["for"])
+        return httpx.Response(
+            200, content=b'[["SERIALNO","SPORDER","PWGTP","ST"],["1","1","10","06"]]'
+        )
+
+    install_transport(handler)
+    get_pums("AGEP", state=["TX", "CA", "ca"], key=fake_api_key)
+    assert seen == ["state:06", "state:48"]
+
+
+def test_show_call_prints_the_canonical_request(
+    install_transport, fake_api_key, capsys
+):
+    install_transport(
+        lambda request: httpx.Response(
+            200, content=b'[["SERIALNO","SPORDER","PWGTP","ST"],["1","1","10","06"]]'
+        )
+    )
+    get_pums(["SEX", "AGEP"], state="california", show_call=True, key=fake_api_key)
+    assert (
+        "Census request: pums 2023 state=06 variables=AGEP,SEX"
+        in capsys.readouterr().out
+    )
@@ -0,0 +1,186 @@
+"""Tests for retries and the circuit breaker.
+
+Phase 0 — Foundation.
+
+Transient failures (5xx, 429, dropped connections) are retried with
+jittered exponential backoff within a deadline, ``Retry-After`` is
+honored, and a circuit breaker fails fast while the API is down.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from pypums.api import client
+from pypums.api.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+pytestmark = pytest.mark.phase0
+
+URL = "https://api.census.gov/data/2023/acs/acs5"
+ROWS = [["NAME", "state"], ["California", "06"]]
+
+
+def _flaky(failures: list[httpx.Response | Exception]):
+    """Handler that returns/raises each queued failure, then succeeds."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return httpx.Response(200, json=ROWS)
+
+    return handler, calls
+
+
+@pytest.fixture()
+def fast_retries(install_transport):
+    client.configure_retries(backoff_base=0.001, backoff_max=0.01)
+    return install_transport
+
+
+def test_retries_transient_server_errors(fast_retries):
+    handler, calls = _flaky([httpx.Response(503), httpx.Response(502)])
+    fast_retries(handler)
+    assert client.call_census_api(URL, {}) == ROWS
+    assert len(calls) == 3
+    stats = client.retry_stats()["retries"]
+    assert stats["retries"] == 2
+    assert stats["attempts"] == 3
+
+
+def test_retries_connection_errors(fast_retries):
+    handler, calls = _flaky([httpx.ConnectError("reset")])
+    fast_retries(handler)
+    assert client.call_census_api(URL, {}) == ROWS
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried(fast_retries):
+    handler, calls = _flaky([httpx.Response(400)])
+    fast_retries(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.call_census_api(URL, {})
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_attempts(fast_retries):
+    handler, calls = _flaky([httpx.Response(500)] * 10)
+    fast_retries(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.call_census_api(URL, {})
+    assert len(calls) == 4
+    assert client.retry_stats()["retries"]["exhausted"] == 1
+
+
+def test_deadline_budget_stops_retries():
+    policy = RetryPolicy(backoff_base=10, backoff_max=10, deadline=1)
+    exc = httpx.HTTPStatusError(
+        "boom",
+        request=httpx.Request("GET", URL),
+        response=httpx.Response(503, headers={"Retry-After": "5"}),
+    )
+    assert policy.next_delay(1, exc, elapsed=0.0) is None
+
+
+def test_retry_after_header_sets_minimum_wait():
+    policy = RetryPolicy(backoff_base=0.001)
+    exc = httpx.HTTPStatusError(
+        "slow down",
+        request=httpx.Request("GET", URL),
+        response=httpx.Response(429, headers={"Retry-After": "3"}),
+    )
+    assert policy.next_delay(1, exc, elapsed=0.0) == 3.0
+
+
+def test_backoff_is_jittered_and_bounded():
+    policy = RetryPolicy(backoff_base=1, backoff_max=4)
+    exc = httpx.ConnectError("reset")
+    delays = {policy.backoff(5, exc) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(0 <= d <= 4 for d in delays)
+
+
+def test_circuit_opens_and_fails_fast(fast_retries):
+    client.configure_retries(max_attempts=1)
+    client.configure_circuit_breaker(failure_threshold=2, reset_timeout=60)
+    handler, calls = _flaky([httpx.Response(500)] * 10)
+    fast_retries(handler)
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.call_census_api(URL, {})
+    with pytest.raises(CircuitOpenError):
+        client.call_census_api(URL, {})
+    assert len(calls) == 2
+    breaker = client.retry_stats()["breakers"]["api.census.gov"]
+    assert breaker["state"] == "open"
+    assert breaker["rejected"] == 1
+
+
+def test_half_open_probe_closes_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    breaker.before_call()  # probe allowed once the timeout passes
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_probe_that_raises_frees_the_breaker(fast_retries, monkeypatch):
+    client.configure_retries(max_attempts=1)
+    client.configure_circuit_breaker(failure_threshold=2, reset_timeout=0.05)
+    handler, calls = _flaky([httpx.Response(500)] * 2)
+    fast_retries(handler)
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.call_census_api(URL, {})
+    time.sleep(0.1)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("hook failed")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(client, "_emit_request", broken)
+        with pytest.raises(RuntimeError, match="hook failed"):
+            client.call_census_api(URL, {})
+    assert client.call_census_api(URL, {}) == ROWS
+    assert client.retry_stats()["breakers"]["api.census.gov"]["state"] == "closed"
+
+
+def test_cancelled_async_probe_frees_the_breaker(fast_retries, monkeypatch):
+    client.configure_circuit_breaker(failure_threshold=1, reset_timeout=0)
+    fast_retries(lambda request: httpx.Response(200, json=ROWS))
+    breaker = client._breaker_for(URL)
+    breaker.record_failure()
+
+    async def hang(url, params=None):
+        await asyncio.Event().wait()
+
+    async def cancel_probe():
+        task = asyncio.ensure_future(client.call_census_api_async(URL, {}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with monkeypatch.context() as patched:
+        patched.setattr(client, "_get_async", hang)
+        asyncio.run(cancel_probe())
+    assert breaker.state == "half-open"
+    assert client.call_census_api(URL, {}) == ROWS
+    assert breaker.state == "closed"
+
+
+def test_async_requests_are_retried(fast_retries):
+    handler, calls = _flaky([httpx.Response(504)])
+    fast_retries(handler)
+    rows = asyncio.run(client.call_census_api_async(URL, {}))
+    assert rows == ROWS
+    assert len(calls) == 2
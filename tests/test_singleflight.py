@@ -0,0 +1,148 @@
+"""Tests for coalescing identical in-flight Census API requests.
+
+Phase 0 — Foundation.
+
+Concurrent identical requests must cost one upstream call: every caller
+gets the leader's parsed result (or its exception), and once the call is
+done the next request goes upstream again.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from pypums.api import client
+from pypums.api.singleflight import SingleFlight
+
+pytestmark = pytest.mark.phase0
+
+URL = "https://api.census.gov/data/2023/acs/acs5"
+ROWS = [["NAME", "state"], ["California", "06"]]
+
+
+def _wait_for_shared(flight: SingleFlight, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while flight.stats()["shared"] < count:
+        assert time.monotonic() < deadline, "callers never joined the flight"
+        time.sleep(0.005)
+
+
+def _blocking_handler(release: threading.Event, status: int = 200):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        release.wait(5)
+        return httpx.Response(status, json=ROWS)
+
+    return handler, calls
+
+
+@pytest.fixture()
+def flight(monkeypatch):
+    flight = SingleFlight()
+    monkeypatch.setattr(client, "_single_flight", flight)
+    return flight
+
+
+def test_concurrent_identical_requests_share_one_call(install_transport, flight):
+    release = threading.Event()
+    handler, calls = _blocking_handler(release)
+    install_transport(handler)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(client.call_census_api, URL, {"get": "NAME", "for": "state:*"})
+            for _ in range(8)
+        ]
+        _wait_for_shared(flight, 7)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r == ROWS for r in results)
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 8, "shared": 7}
+
+
+def test_parameter_order_does_not_split_flight():
+    assert client._request_key(URL, {"get": "NAME", "for": "state:*"}) == (
+        client._request_key(URL, {"for": "state:*", "get": "NAME"})
+    )
+    assert client._request_key(URL, {"get": "NAME"}) != client._request_key(
+        URL, {"get": "NAME,B01001_001E"}
+    )
+
+
+def test_errors_are_shared(install_transport, flight):
+    client.configure_retries(max_attempts=1)
+    release = threading.Event()
+    handler, calls = _blocking_handler(release, status=400)
+    install_transport(handler)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(client.call_census_api, URL, {}) for _ in range(4)]
+        _wait_for_shared(flight, 3)
+        release.set()
+        for future in futures:
+            with pytest.raises(httpx.HTTPStatusError):
+                future.result()
+    assert len(calls) == 1
+
+
+def test_sequential_requests_are_not_cached(install_transport, flight):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=ROWS)
+
+    install_transport(handler)
+    client.call_census_api(URL, {})
+    client.call_census_api(URL, {})
+    assert len(calls) == 2
+    assert flight.stats()["shared"] == 0
+
+
+def test_async_requests_share_one_call(install_transport, flight):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=ROWS)
+
+    install_transport(handler)
+
+    async def main():
+        results = await asyncio.gather(
+            *(client.call_census_api_async(URL, {"get": "NAME"}) for _ in range(5))
+        )
+        await client.aclose_client()
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r == ROWS for r in results)
+    assert flight.stats() == {"calls": 5, "shared": 4}
+
+
+def test_cancelled_waiter_does_not_cancel_flight():
+    flight = SingleFlight()
+
+    async def main():
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do_async("k", slow))
+        second = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
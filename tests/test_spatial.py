@@ -7,20 +7,31 @@ These tests are skipped if ``geopandas`` is not installed.  They verify:
 * ``geometry=True`` in ``get_acs()`` returns a GeoDataFrame.
 * The returned GeoDataFrame has a valid CRS (EPSG:4269 / NAD83).
 * ``as_dot_density()`` converts polygon geometries to point geometries.
+* Normalized shapes are cached on disk and in memory.
 """
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 gpd = pytest.importorskip("geopandas", reason="geopandas required for spatial tests")
 
-from pypums import get_acs  # noqa: E402
-from pypums.spatial import as_dot_density  # noqa: E402
+from pypums import get_acs, spatial  # noqa: E402
+from pypums.spatial import as_dot_density, attach_geometry  # noqa: E402
 
 pytestmark = [pytest.mark.phase2, pytest.mark.spatial]
 
 
+@pytest.fixture(autouse=True)
+def shape_cache(tmp_path, monkeypatch):
+    """A private shape cache so tests never share shapes."""
+    from collections import OrderedDict
+
+    monkeypatch.setattr(spatial, "_SHAPE_CACHE_DIR", tmp_path / "shapes")
+    monkeypatch.setattr(spatial, "_shape_memo", OrderedDict())
+    return tmp_path / "shapes"
+
+
 @pytest.fixture()
 def mock_acs_with_geometry(acs_api_response_tidy):
     """Mock both the Census API call and the TIGER/Line shapefile fetch."""
@@ -100,3 +111,65 @@ class TestAsDotDensity:
         assert len(result) == 10
         # All geometries should be points
         assert all(result.geometry.geom_type == "Point")
+
+
+class TestShapeCache:
+    @pytest.fixture()
+    def shapes(self):
+        from shapely.geometry import box
+
+        # Projected, with pygris' vintage-specific GEOID column name.
+        return gpd.GeoDataFrame(
+            {
+                "GEOID20": ["06037", "06059"],
+                "NAMELSAD": ["Los Angeles County", "Orange County"],
+                "geometry": [box(0, 0, 1000, 1000), box(1000, 0, 2000, 1000)],
+            },
+            crs="EPSG:3310",
+        )
+
+    @pytest.fixture()
+    def data(self):
+        import pandas as pd
+
+        return pd.DataFrame({"GEOID": ["06059", "06037"], "estimate": [3, 10]})
+
+    def test_repeated_calls_read_shapes_once(self, shapes, data):
+        download = MagicMock(return_value=shapes)
+        with patch("pypums.spatial._pygris_func", return_value=download):
+            first = attach_geometry(data, "county", state="CA", year=2022)
+            second = attach_geometry(data, "County", state="06", year=2022)
+        assert download.call_count == 1
+        assert first.crs.to_epsg() == 4269
+        assert list(second.columns) == ["GEOID", "geometry", "estimate"]
+        assert first.geometry.geom_equals(second.geometry).all()
+
+    def test_shapes_are_read_back_from_geoparquet(self, shapes, data, shape_cache):
+        download = MagicMock(return_value=shapes)
+        with patch("pypums.spatial._pygris_func", return_value=download):
+            first = attach_geometry(data, "county", state="CA", year=2022)
+            spatial._shape_memo.clear()
+            assert list(shape_cache.glob("*.parquet"))
+            second = attach_geometry(data, "county", state="CA", year=2022)
+        assert download.call_count == 1
+        assert second.crs.to_epsg() == 4269
+        assert second.geometry.geom_equals_exact(first.geometry, 1e-9).all()
+        assert gpd.read_parquet(next(shape_cache.glob("*.parquet"))).crs == first.crs
+
+    def test_cache_off_always_downloads(self, shapes, data):
+        download = MagicMock(return_value=shapes)
+        with patch("pypums.spatial._pygris_func", return_value=download):
+            attach_geometry(data, "county", state="CA", cache=False)
+            attach_geometry(data, "county", state="CA", cache=False)
+        assert download.call_count == 2
+
+    def test_cache_key_ignores_unused_arguments(self):
+        assert spatial._shape_cache_key(
+            "tract", "California", 2022, "5m"
+        ) == spatial._shape_cache_key("Tract", "06", 2022, "500k")
+        assert spatial._shape_cache_key(
+            "zcta", "CA", 2020, "500k"
+        ) == spatial._shape_cache_key("zcta", None, 2020, "500k")
+        assert spatial._shape_cache_key(
+            "county", "CA", 2022, "5m"
+        ) != spatial._shape_cache_key("county", "CA", 2022, "500k")
@@ -0,0 +1,114 @@
+"""Tests for the local stub Census API server.
+
+Phase 0 — Foundation.
+
+The stub answers the endpoints pypums uses with Census-shaped synthetic
+data (or recorded cassettes), so every ``get_*`` function can run end to
+end against it with no network, including under injected latency and
+errors.
+"""
+
+import json
+
+import pytest
+
+from pypums import get_acs, get_estimates, get_flows, get_pums
+from pypums.api import client
+from pypums.api.stub import StubCensusServer
+from pypums.variables import load_variables
+
+pytestmark = pytest.mark.phase0
+
+
+@pytest.fixture()
+def stub(install_transport):
+    """Start a stub server and point the shared client at it."""
+    with StubCensusServer(rows_per_geography=4, pums_records=30) as server:
+        client.configure_client(api_base=server.url)
+        yield server
+
+
+def _rows(status_headers_body):
+    status, _, body = status_headers_body
+    assert status == 200
+    return json.loads(body)
+
+
+def test_response_shape_matches_census_layout():
+    stub = StubCensusServer()
+    status, headers, body = stub.respond(
+        "/data/2023/acs/acs5",
+        {"get": "NAME,B01001_001E", "for": "county:*", "in": "state:10"},
+    )
+    rows = json.loads(body)
+    assert rows[0] == ["NAME", "B01001_001E", "state", "county"]
+    assert [r[3] for r in rows[1:]] == ["001", "003", "005"]
+    # One compact row per line, like the real API.
+    assert body.count(b"\n") == len(rows) - 1
+    assert b", " not in body.split(b"\n")[0]
+
+
+def test_responses_are_deterministic():
+    params = {"get": "NAME,B01001_001E", "for": "state:*"}
+    first = StubCensusServer().respond("/data/2023/acs/acs5", params)
+    second = StubCensusServer().respond("/data/2023/acs/acs5", params)
+    assert first == second
+
+
+def test_wildcard_predicates_expand_rows():
+    rows = _rows(
+        StubCensusServer().respond(
+            "/data/2023/pep/population",
+            {"get": "NAME,POP", "for": "state:06", "DATE_CODE": "*"},
+        )
+    )
+    assert rows[0] == ["NAME", "POP", "DATE_CODE", "state"]
+    assert len(rows) == 4
+
+
+def test_missing_for_clause_is_rejected():
+    status, _, _ = StubCensusServer().respond("/data/2023/acs/acs5", {"get": "NAME"})
+    assert status == 400
+
+
+def test_get_functions_run_against_stub(stub, fake_api_key):
+    acs = get_acs("tract", "B01001_001", state="DE", county="*", key=fake_api_key)
+    assert acs["GEOID"].str.len().eq(11).all()
+    assert acs["GEOID"].nunique() == 12
+
+    pums = get_pums(["AGEP"], state="CA", rep_weights="person", key=fake_api_key)
+    assert len(pums) == 30
+    assert pums["AGEP"].dtype == "int64"
+
+    pep = get_estimates("state", variables="POP_2023", key=fake_api_key)
+    assert pep["GEOID"].nunique() == 52
+
+    flows = get_flows("county", state="DE", key=fake_api_key)
+    assert not flows.empty
+
+    assert "B01001_001E" in set(load_variables(2023, "acs5")["name"])
+
+
+def test_injected_errors_are_retried(install_transport, fake_api_key):
+    client.configure_retries(backoff_base=0.001)
+    with StubCensusServer(error_rate=0.3, seed=1) as server:
+        client.configure_client(api_base=server.url)
+        df = get_acs("county", "B01001_001", state=["CA", "TX", "NY"], key=fake_api_key)
+    stats = server.stats()
+    assert stats["errors"] > 0
+    assert stats["requests"] == 3 + stats["errors"]
+    assert df["GEOID"].str[:2].nunique() == 3
+
+
+def test_stub_serves_recorded_cassette(install_transport, tmp_path, fake_api_key):
+    with StubCensusServer() as server:
+        client.configure_client(api_base=server.url)
+        client.configure_cassette(tmp_path, mode="record")
+        recorded = get_acs("state", "B01001_001", key=fake_api_key)
+    client.configure_cassette(None)
+
+    with StubCensusServer(cassette=tmp_path, rows_per_geography=1) as server:
+        client.configure_client(api_base=server.url)
+        replayed = get_acs("state", "B01001_001", key=fake_api_key)
+    assert server.stats()["replayed"] == 1
+    assert replayed.equals(recorded)
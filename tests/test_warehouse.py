@@ -0,0 +1,150 @@
+"""Tests for the partitioned Parquet warehouse.
+
+Phase 0 — Foundation.
+
+Fetched responses are merged into a hive-partitioned dataset
+(dataset/year/geography/state) and read back with partition pruning and
+filter pushdown.
+"""
+
+import httpx
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+from pypums import warehouse
+
+pytestmark = pytest.mark.phase0
+
+
+def _counties(values, variable="B01001_001E"):
+    return pd.DataFrame(
+        {
+            "NAME": ["Los Angeles County", "Orange County", "Harris County"],
+            variable: values,
+            "state": ["06", "06", "48"],
+            "county": ["037", "059", "201"],
+        }
+    )
+
+
+def _write(root, df, year=2023):
+    return warehouse.write(
+        df, "acs/acs5", year, "county", keys=["state", "county"], root=root
+    )
+
+
+def test_write_partitions_by_state(tmp_path):
+    assert _write(tmp_path, _counties([10, 3, 4])) == 2
+    part = (
+        tmp_path
+        / "dataset=acs%2Facs5"
+        / "year=2023"
+        / "geography=county"
+        / "state=06"
+        / "part-0.parquet"
+    )
+    assert part.exists()
+    df = warehouse.query("acs/acs5", state="CA", root=tmp_path)
+    assert sorted(df["county"]) == ["037", "059"]
+    assert set(df["state"]) == {"06"}
+    assert set(df["year"]) == {2023}
+
+
+def test_new_variables_merge_into_existing_rows(tmp_path):
+    _write(tmp_path, _counties([10, 3, 4]))
+    _write(tmp_path, _counties([70, 90, 60], variable="B19013_001E"))
+    _write(tmp_path, _counties([11, 3, 4]))
+    df = warehouse.query(root=tmp_path).sort_values("county")
+    assert len(df) == 3
+    assert df["B01001_001E"].tolist() == [11, 3, 4]
+    assert df["B19013_001E"].tolist() == [70, 90, 60]
+
+
+def test_query_across_years_with_pushdown(tmp_path):
+    _write(tmp_path, _counties([10, 3, 4]), year=2022)
+    _write(tmp_path, _counties([12, 2, 5]), year=2023)
+    df = warehouse.query(
+        year=[2022, 2023],
+        geography="County",
+        columns=["year", "county", "B01001_001E"],
+        filter=ds.field("B01001_001E") > 4,
+        root=tmp_path,
+    )
+    assert sorted(zip(df["year"], df["county"], strict=True)) == [
+        (2022, "037"),
+        (2023, "037"),
+        (2023, "201"),
+    ]
+    assert warehouse.query("dec/pl", root=tmp_path).empty
+
+
+def test_columns_missing_from_some_partitions_are_null(tmp_path):
+    _write(tmp_path, _counties([10, 3, 4]))
+    texas = _counties([50, 50, 60], variable="B19013_001E").iloc[[2]]
+    _write(tmp_path, texas)
+    df = warehouse.query(root=tmp_path).set_index("county")
+    assert df.loc["201", "B19013_001E"] == 60
+    assert df["B19013_001E"].isna().sum() == 2
+
+
+def test_get_acs_writes_to_the_warehouse(tmp_path, install_transport, fake_api_key):
+    from pypums import get_acs
+
+    body = (
+        b'[["NAME","B01001_001E","B01001_001M","state"],\n'
+        b'["California","39029342","1200","06"]]'
+    )
+    install_transport(lambda request: httpx.Response(200, content=body))
+    warehouse.configure_warehouse(root=tmp_path)
+    try:
+        get_acs("state", "B01001_001", state="CA", key=fake_api_key)
+    finally:
+        warehouse.configure_warehouse(enabled=False)
+    df = warehouse.query("acs/acs5", year=2023, geography="state", root=tmp_path)
+    assert df["B01001_001E"].tolist() == [39029342]
+    assert df["state"].tolist() == ["06"]
+
+
+def test_breakdowns_are_stored_next_to_totals(
+    tmp_path, install_transport, fake_api_key
+):
+    from pypums import get_estimates
+
+    def handler(request):
+        if "AGEGROUP" in request.url.params:
+            body = (
+                b'[["NAME","POP_2022","AGEGROUP","state"],\n'
+                b'["California","2000000","1","06"],\n'
+                b'["California","2100000","2","06"]]'
+            )
+        else:
+            body = b'[["NAME","POP_2022","state"],\n["California","39029342","06"]]'
+        return httpx.Response(200, content=body)
+
+    install_transport(handler)
+    warehouse.configure_warehouse(root=tmp_path)
+    try:
+        get_estimates("state", variables="POP_2022", state="CA", key=fake_api_key)
+        get_estimates(
+            "state",
+            variables="POP_2022",
+            breakdown="AGEGROUP",
+            state="CA",
+            key=fake_api_key,
+        )
+        get_estimates("state", variables="POP_2022", state="CA", key=fake_api_key)
+    finally:
+        warehouse.configure_warehouse(enabled=False)
+    df = warehouse.query("pep/population", root=tmp_path)
+    rows = sorted(zip(df["AGEGROUP"].fillna(0), df["POP_2022"], strict=True))
+    assert rows == [(0, 39029342), (1, 2000000), (2, 2100000)]
+
+
+def test_unmatched_rows_are_not_merged(tmp_path):
+    _write(tmp_path, _counties([10, 3, 4]))
+    duplicated = pd.concat([_counties([1, 1, 1])] * 2)
+    with pytest.raises(ValueError, match="can't be matched"):
+        _write(tmp_path, duplicated)
+    df = warehouse.query(root=tmp_path).sort_values("county")
+    assert df["B01001_001E"].tolist() == [10, 3, 4]
@@ -0,0 +1,154 @@
+"""Tests for cache warming from a manifest.
+
+Phase 0 — Foundation.
+
+Manifest entries are normalized, deduplicated and merged into as few
+``get_*`` calls as possible, then run with caching on.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from pypums import acs
+from pypums.warm import load_manifest, normalize_spec, plan_warming, warm_cache
+
+pytestmark = pytest.mark.phase0
+
+
+def _acs(state, variables, **extra):
+    return normalize_spec(
+        {
+            "function": "get_acs",
+            "geography": "county",
+            "state": state,
+            "variables": variables,
+            **extra,
+        }
+    )
+
+
+def test_normalize_spec_fills_defaults():
+    spec = normalize_spec({"function": "get_acs", "geography": "state"}, {"year": 2022})
+    assert spec.arguments["year"] == 2022
+    assert spec.arguments["survey"] == "acs5"
+    assert "cache_table" not in spec.arguments
+
+
+def test_normalize_spec_rejects_bad_entries():
+    with pytest.raises(ValueError, match="function must be one of"):
+        normalize_spec({"function": "get_everything"})
+    with pytest.raises(ValueError, match="Invalid get_acs entry"):
+        normalize_spec({"function": "get_acs", "geography": "state", "colour": 1})
+
+
+def test_plan_merges_variables_then_states():
+    planned = plan_warming(
+        [
+            _acs("CA", "B01003_001"),
+            _acs("CA", "B19013_001"),
+            _acs("Texas", ["B19013_001", "B01003_001"]),
+            _acs("06", "B01003_001"),
+        ]
+    )
+    assert len(planned) == 1
+    assert planned[0].arguments["state"] == ["06", "48"]
+    assert planned[0].arguments["variables"] == ["B01003_001", "B19013_001"]
+
+
+def test_plan_keeps_incompatible_calls_apart():
+    planned = plan_warming(
+        [
+            _acs("CA", "B01003_001", year=2022),
+            _acs("CA", "B01003_001", year=2023),
+            _acs("CA", "B01003_001", county="037"),
+            _acs("TX", "B01003_001", county="201"),
+        ]
+    )
+    assert len(planned) == 4
+
+
+def test_load_json_manifest(tmp_path):
+    path = tmp_path / "warm.json"
+    path.write_text(
+        json.dumps(
+            {
+                "defaults": {"year": 2022},
+                "requests": [
+                    {
+                        "function": "get_acs",
+                        "geography": "state",
+                        "variables": "B01003_001",
+                    },
+                    {"function": "get_pums", "variables": ["AGEP"], "state": "CA"},
+                ],
+            }
+        )
+    )
+    specs = load_manifest(path)
+    assert [spec.function for spec in specs] == ["get_acs", "get_pums"]
+    assert {spec.arguments["year"] for spec in specs} == {2022}
+
+    path.write_text(json.dumps({"requests": ["get_acs"]}))
+    with pytest.raises(ValueError, match="must be a mapping"):
+        load_manifest(path)
+
+
+def test_warm_cache_fills_the_cache(
+    tmp_path, monkeypatch, install_transport, fake_api_key
+):
+    body = (
+        b'[["NAME","B01003_001E","B01003_001M","B19013_001E","B19013_001M","state"],\n'
+        b'["California","39029342","0","96334","300","06"]]'
+    )
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=body)
+
+    install_transport(handler)
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    specs = [
+        normalize_spec(
+            {
+                "function": "get_acs",
+                "geography": "state",
+                "state": "CA",
+                "variables": variable,
+            }
+        )
+        for variable in ("B01003_001", "B19013_001")
+    ]
+    progress = []
+    result = warm_cache(
+        specs, key=fake_api_key, progress=lambda *args: progress.append(args)
+    )
+    assert result["specs"] == 2
+    assert result["calls"] == result["succeeded"] == 1
+    assert result["failed"] == []
+    assert result["bytes"] == len(body)
+    assert [done for done, *_ in progress] == [1]
+    assert len(calls) == 1
+
+    result = warm_cache(specs, key=fake_api_key)
+    assert result["succeeded"] == 1
+    assert len(calls) == 1
+    warm_cache(specs, key=fake_api_key, refresh=True)
+    assert len(calls) == 2
+
+
+def test_warm_cache_reports_failures(
+    tmp_path, monkeypatch, install_transport, fake_api_key
+):
+    monkeypatch.setattr(acs, "_DEFAULT_CACHE_DIR", tmp_path)
+    install_transport(lambda request: httpx.Response(400, content=b"error: bad"))
+    spec = normalize_spec(
+        {"function": "get_acs", "geography": "state", "variables": "B01003_001"}
+    )
+    result = warm_cache([spec], key=fake_api_key)
+    assert result["succeeded"] == 0
+    ((failed, error),) = result["failed"]
+    assert failed == spec
+    assert isinstance(error, Exception)